@@ -0,0 +1,231 @@
+"""Compare ``sciprog.scraping.Extractor`` with the Lab 04 BeautifulSoup code.
+
+Each baseline below is the parsing loop of a student scraper with the same
+selectors and lookups, wrapped in a function that returns the records; the
+fetching, printing, cut-offs and filters around the loop are left out, as
+listed in the comment above each baseline. Each runs against the matching
+fixture from ``benchmarks/fixtures`` and must return the same records as the
+extractor before anything is timed::
+
+    python benchmarks/bench_extract.py            # bs4 with html.parser
+    python benchmarks/bench_extract.py --lxml     # bs4 with lxml, if installed
+"""
+
+import argparse
+import re
+import sys
+import timeit
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+# Run as a script, only benchmarks/ is on sys.path; sciprog needs the root.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from sciprog.scraping import Extractor, Field, Rule  # noqa: E402
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+
+
+# ----------------------------------------------------------------------
+# Baselines
+
+
+def steam_bs4(html, parser):
+    # students/04/ajurjevic_scraper/scraper.py: parse_games, without the
+    # ``[:5]`` cut-off and the printout.
+    soup = BeautifulSoup(html, parser)
+    games = []
+    for row in soup.select("a.search_result_row"):
+        title = row.select_one(".title")
+        released = row.select_one(".search_released")
+        review = row.select_one(".search_review_summary")
+        price = row.select_one(".discount_final_price")
+        games.append(
+            {
+                "title": title.get_text(strip=True) if title else "N/A",
+                "release_date": released.get_text(strip=True) if released else "N/A",
+                "review": review.get("data-tooltip-html", "N/A") if review else "N/A",
+                "price": price.get_text(strip=True) if price else "N/A",
+            }
+        )
+    return games
+
+
+def njuskalo_bs4(html, parser):
+    # students/04/exercise/smachiedo/scraper.py: scrape_njuskalo, with the
+    # same container, title, price and description lookups; left out are the
+    # "iphone 17" title filter, de-duplication and top-5 cut-off, the
+    # condition lookup, the placeholder strings for missing values and the
+    # njuskalo.hr prefix on relative links.
+    soup = BeautifulSoup(html, parser)
+    ads = []
+    ad_containers = (
+        soup.find_all("article")
+        or soup.find_all("li", class_=lambda x: x and "entity" in str(x).lower())
+        or soup.find_all("div", class_=lambda x: x and "ad" in str(x).lower())
+        or soup.find_all("div", class_=lambda x: x and "list-item" in str(x).lower())
+    )
+    for container in ad_containers:
+        title_elem = (
+            container.find(
+                ["h3", "h2", "h4", "a"],
+                class_=lambda x: x and "title" in str(x).lower(),
+            )
+            or container.find("a", attrs={"data-title": True})
+            or container.find(["h3", "h2", "h4"])
+        )
+        if not title_elem:
+            continue
+        title = title_elem.get_text().strip()
+
+        price_elem = (
+            container.find("span", class_=lambda x: x and "price" in str(x).lower())
+            or container.find(
+                "strong", class_=lambda x: x and "price" in str(x).lower()
+            )
+            or container.find(string=re.compile(r"€|\s*EUR|kn", re.IGNORECASE))
+        )
+        price_text = None
+        if price_elem:
+            if isinstance(price_elem, str):
+                price_text = price_elem.strip()
+            else:
+                price_text = price_elem.get_text().strip()
+
+        description_elem = container.find(
+            "p",
+            class_=lambda x: x
+            and any(k in str(x).lower() for k in ["desc", "summary", "excerpt"]),
+        ) or container.find(
+            "div", class_=lambda x: x and "description" in str(x).lower()
+        )
+        description = None
+        if description_elem:
+            description = description_elem.get_text().strip()[:200]
+
+        link_elem = container.find("a", href=True)
+        ads.append(
+            {
+                "title": title,
+                "price": price_text,
+                "description": description,
+                "link": link_elem.get("href", "") if link_elem else None,
+            }
+        )
+    return ads
+
+
+def fbref_bs4(html, parser):
+    # students/04/exercise/jmestrovic/scraper.py: FBrefScraper.extract_match_data,
+    # stats tables only (no scorebox or events), collected as records instead
+    # of being joined into one text block, and without the debug file.
+    soup = BeautifulSoup(html, parser)
+    tables = []
+    for i, table in enumerate(soup.find_all("table", {"class": "stats_table"})):
+        headers = []
+        thead = table.find("thead")
+        if thead:
+            headers = [th.get_text(strip=True) for th in thead.find_all("th")]
+        rows = []
+        tbody = table.find("tbody")
+        if tbody:
+            for row in tbody.find_all("tr"):
+                cells = [c.get_text(strip=True) for c in row.find_all(["td", "th"])]
+                if cells:
+                    rows.append({"cells": cells})
+        tables.append(
+            {"id": table.get("id", f"table_{i}"), "headers": headers, "rows": rows}
+        )
+    return tables
+
+
+# ----------------------------------------------------------------------
+# Extractor equivalents
+
+STEAM = Extractor(
+    Rule(
+        "games",
+        "a.search_result_row",
+        {
+            "title": Field(".title", default="N/A"),
+            "release_date": Field(".search_released", default="N/A"),
+            "review": Field(
+                ".search_review_summary", attr="data-tooltip-html", default="N/A"
+            ),
+            "price": Field(".discount_final_price", default="N/A"),
+        },
+    )
+)
+
+NJUSKALO = Extractor(
+    Rule(
+        "ads",
+        "article",
+        {
+            "title": Field("[class*=title]"),
+            "price": Field("span[class*=price], strong[class*=price]"),
+            "description": Field("p[class*=desc]"),
+            "link": Field("a[href]", attr="href"),
+        },
+    )
+)
+
+FBREF = Extractor(
+    Rule(
+        "tables",
+        "table.stats_table",
+        {"id": Field(":scope", attr="id"), "headers": Field("thead th", many=True)},
+        children=[Rule("rows", "tbody tr", {"cells": Field("td, th", many=True)})],
+    )
+)
+
+
+def _squash(records):
+    """bs4 ``strip=True`` drops inner spaces next to tags; compare without them."""
+    if isinstance(records, dict):
+        return {k: _squash(v) for k, v in records.items()}
+    if isinstance(records, list):
+        return [_squash(v) for v in records]
+    if isinstance(records, str):
+        return re.sub(r"\s+", "", records)
+    return records
+
+
+CASES = [
+    ("steam", "steam.html", steam_bs4, lambda html: STEAM.first(html)),
+    ("njuskalo", "njuskalo.html", njuskalo_bs4, lambda html: NJUSKALO.first(html)),
+    ("fbref", "fbref.html", fbref_bs4, lambda html: FBREF.first(html)),
+]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lxml", action="store_true", help="give bs4 the lxml parser")
+    parser.add_argument("-n", "--number", type=int, default=5)
+    args = parser.parse_args(argv)
+    bs4_parser = "lxml" if args.lxml else "html.parser"
+
+    print(
+        f"{'fixture':<10} {'records':>8} {'bs4 ms':>9} {'extract ms':>11} {'speedup':>8}"
+    )
+    for name, filename, baseline, extractor in CASES:
+        html = (FIXTURES / filename).read_text(encoding="utf-8")
+        expected = baseline(html, bs4_parser)
+        actual = extractor(html)
+        if _squash(expected) != _squash(actual):
+            sys.exit(f"{name}: extractor output differs from the bs4 baseline")
+        slow = min(
+            timeit.repeat(
+                lambda: baseline(html, bs4_parser), number=1, repeat=args.number
+            )
+        )
+        fast = min(timeit.repeat(lambda: extractor(html), number=1, repeat=args.number))
+        print(
+            f"{name:<10} {len(actual):>8} {slow * 1e3:>9.1f} {fast * 1e3:>11.1f}"
+            f" {slow / fast:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Offline scraper benchmarks: parse time, fetch throughput, end-to-end latency.
+
+Every page comes from ``benchmarks/fixtures`` through ``StubSteelServer``,
+which also answers the Gemini calls, so no Steel or Gemini key is needed.
+The stub latencies default to 20 ms per Steel request and 50 ms per Gemini
+answer and can be changed with ``BENCH_STEEL_LATENCY`` / ``BENCH_LLM_LATENCY``
+(seconds)::
+
+    python benchmarks/bench_scrape.py
+    BENCH_LLM_LATENCY=0.5 python benchmarks/bench_scrape.py -k pipeline
+
+See ``harness.py`` for the options and the per-commit comparison.
+"""
+
+import os
+import sys
+from pathlib import Path
+from urllib.parse import urlsplit, urlunsplit
+
+# Run as a script, only benchmarks/ is on sys.path; sciprog needs the root.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from harness import main, parametrize  # noqa: E402
+
+from sciprog.scraping import Crawler, GeminiGateway, SteelClient  # noqa: E402
+from sciprog.scraping.pipeline import scrape_pipeline  # noqa: E402
+from sciprog.scraping.sites import get  # noqa: E402
+from sciprog.scraping.stub import StubSteelServer  # noqa: E402
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures"
+STEEL_LATENCY = float(os.getenv("BENCH_STEEL_LATENCY", "0.02"))
+LLM_LATENCY = float(os.getenv("BENCH_LLM_LATENCY", "0.05"))
+
+URLS = {
+    "steam": "https://store.steampowered.com/search/",
+    "njuskalo": "https://www.njuskalo.hr/search/",
+    "fbref": "https://fbref.com/en/matches/1a2b3c4d/Hajduk-Split-Dinamo-Zagreb",
+    "bbc": "https://www.bbc.com/news",
+    "scst_jobs": "https://www.scst.unist.hr/student/za-studente/ponuda-poslova",
+}
+HTML = {site: (FIXTURES / f"{site}.html").read_text("utf-8") for site in URLS}
+_BY_URL = {url: HTML[site] for site, url in URLS.items()}
+
+
+def _page(url):
+    """Fixture for ``url``, ignoring the query string (``?page=3``...)."""
+    return _BY_URL.get(urlunsplit(urlsplit(url)._replace(query="")))
+
+
+def _urls(n):
+    """``n`` distinct page URLs spread over all sites."""
+    sites = list(URLS)
+    return [f"{URLS[sites[i % len(sites)]]}?page={i}" for i in range(n)]
+
+
+def _stub():
+    return StubSteelServer(_page, latency=STEEL_LATENCY, llm_latency=LLM_LATENCY)
+
+
+def _crawler(stub, workers=8):
+    steel = SteelClient(api_key="bench", base_url=stub.url, rate=0, max_workers=workers)
+    llm = GeminiGateway(api_key="bench", base_url=stub.url, cache=None)
+    return Crawler(steel=steel, llm=llm, max_workers=workers)
+
+
+@parametrize("site", list(URLS))
+def bench_parse(benchmark, site):
+    """Extraction time of one fixture page with the registered site spec."""
+    records = benchmark(get(site).extract, HTML[site])
+    benchmark.extra_info["pages"] = 1
+    benchmark.extra_info["records"] = sum(len(v) for v in records.values())
+
+
+@parametrize("workers", [1, 8])
+def bench_fetch(benchmark, workers):
+    """Pages/s through ``SteelClient.fetch_many`` at a given concurrency."""
+    urls = _urls(40)
+    with _stub() as stub, _crawler(stub, workers) as crawler:
+        pages = benchmark.pedantic(
+            crawler.steel.fetch_many, (urls,), rounds=3, warmup_rounds=1
+        )
+    assert all(getattr(p, "html", None) for p in pages), "stub fetch failed"
+    benchmark.extra_info["pages"] = len(urls)
+
+
+def bench_end_to_end(benchmark):
+    """Latency of one page: fetch, parse and Gemini summary, in sequence."""
+    url = URLS["njuskalo"]
+    with _stub() as stub, _crawler(stub) as crawler:
+
+        def scrape():
+            return crawler.analyze(crawler.crawl(url, max_pages=1))
+
+        benchmark(scrape)
+    benchmark.extra_info["pages"] = 1
+
+
+def bench_pipeline(benchmark):
+    """Pages/s of ``scrape_pipeline`` with Gemini on every page."""
+    urls = _urls(40)
+    with _stub() as stub, _crawler(stub) as crawler:
+        pipeline = scrape_pipeline(crawler, fetch_workers=8, llm_workers=4)
+        results = benchmark.pedantic(
+            pipeline.run_sync, (urls,), rounds=3, warmup_rounds=1
+        )
+    assert len(results) == len(urls), pipeline.errors[:1]
+    benchmark.extra_info["pages"] = len(urls)
+    benchmark.extra_info["stages"] = pipeline.stats()
+
+
+if __name__ == "__main__":
+    sys.exit(main([sys.modules[__name__]]))
@@ -0,0 +1,198 @@
+"""Write the synthetic HTML fixtures used by the benchmarks.
+
+The pages mimic the markup the Lab 04 scrapers target (Steam search results,
+a Njuškalo listing, an FBref match report, the BBC News front page and the
+SCST job board) with deterministic filler data, so benchmarks run offline and
+give the same numbers on every machine::
+
+    python benchmarks/fixtures/make_fixtures.py
+"""
+
+import random
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+
+PAGE = """<!DOCTYPE html>
+<html lang="{lang}"><head><meta charset="utf-8"><title>{title}</title>
+<link rel="stylesheet" href="/static/site.css">
+<script>window.dataLayer = window.dataLayer || [];</script>
+</head><body>
+<header class="site-header"><nav><ul>{nav}</ul></nav></header>
+<main id="content">
+{body}
+</main>
+<footer class="site-footer"><p>&copy; 2025</p></footer>
+</body></html>
+"""
+
+
+def _nav(rng):
+    return "".join(
+        f'<li class="nav-item"><a href="/c/{i}">Kategorija {i}</a></li>'
+        for i in range(rng.randint(8, 14))
+    )
+
+
+def steam(rng, rows=250):
+    items = []
+    for i in range(rows):
+        appid = 100000 + i
+        price = rng.choice([0, 4.99, 9.99, 19.99, 29.99, 59.99])
+        discount = rng.choice(["", "-20%", "-50%"])
+        items.append(
+            f'<a href="https://store.steampowered.com/app/{appid}/" '
+            f'class="search_result_row ds_collapse_flag" data-ds-appid="{appid}">'
+            f'<div class="col search_capsule"><img src="/capsule/{appid}.jpg"></div>'
+            f'<div class="responsive_search_name_combined">'
+            f'<div class="col search_name ellipsis"><span class="title">Game {i} &amp; Co</span>'
+            f'<div><span class="platform_img win"></span></div></div>'
+            f'<div class="col search_released responsive_secondrow">'
+            f"{rng.randint(1, 28)} Mar, {rng.randint(2010, 2025)}</div>"
+            f'<div class="col search_reviewscore responsive_secondrow">'
+            f'<span class="search_review_summary positive" '
+            f'data-tooltip-html="Very Positive&lt;br&gt;{rng.randint(70, 99)}% of '
+            f'{rng.randint(100, 90000)} user reviews are positive."></span></div>'
+            f'<div class="col search_price_discount_combined">'
+            f'<div class="discount_block"><div class="discount_pct">{discount}</div>'
+            f'<div class="discount_prices"><div class="discount_final_price">'
+            f"{price:.2f}€</div></div></div></div></div></a>"
+        )
+    body = f'<div id="search_resultsRows">{"".join(items)}</div>'
+    return PAGE.format(lang="en", title="Steam Search", nav=_nav(rng), body=body)
+
+
+def njuskalo(rng, ads=200):
+    items = []
+    for i in range(ads):
+        price = f"{rng.randint(50, 40000):,}".replace(",", ".")
+        condition = rng.choice(["Novo", "Rabljeno", "Nekorišteno"])
+        items.append(
+            f'<li class="EntityList-item EntityList-item--Regular" data-href="/oglas/{i}">'
+            f'<article class="entity-body cf">'
+            f'<h3 class="entity-title"><a class="link" href="/oglas/{i}" '
+            f'name="{i}">Bicikl model {i}</a></h3>'
+            f'<div class="entity-thumbnail"><img src="/img/{i}.jpg"></div>'
+            f'<div class="entity-description"><p class="entity-description-main">'
+            f"Stanje: {condition}<br>Lokacija: Split, Dalmacija</p></div>"
+            f'<div class="entity-prices"><strong class="price price--hrk">'
+            f"{price} €</strong></div>"
+            f'<div class="entity-pub-date"><time datetime="2025-10-{1 + i % 28:02d}">'
+            f"{1 + i % 28}.10.2025.</time></div></article></li>"
+        )
+    body = (
+        '<section class="EntityList EntityList--Regular">'
+        f'<ul class="EntityList-items">{"".join(items)}</ul></section>'
+        '<nav class="Pagination"><ul>'
+        + "".join(
+            f'<li class="Pagination-item"><a href="?page={p}">{p}</a></li>'
+            for p in range(1, 8)
+        )
+        + "</ul></nav>"
+    )
+    return PAGE.format(lang="hr", title="Njuškalo", nav=_nav(rng), body=body)
+
+
+def fbref(rng, players=16, tables=6):
+    columns = ["Player", "#", "Nation", "Pos", "Age", "Min", "Gls", "Ast", "Sh", "xG"]
+    parts = [
+        '<div class="scorebox"><div><strong><a href="/squads/a">Hajduk Split</a>'
+        '</strong><div class="scores"><div class="score">2</div></div></div>'
+        '<div><strong><a href="/squads/b">Dinamo Zagreb</a></strong>'
+        '<div class="scores"><div class="score">1</div></div></div></div>'
+    ]
+    for t in range(tables):
+        head = "".join(f'<th scope="col">{c}</th>' for c in columns)
+        rows = []
+        for p in range(players):
+            cells = [
+                f'<th scope="row" data-stat="player"><a href="/p/{t}{p}">Igrač {p}</a></th>',
+                f'<td data-stat="shirtnumber">{p + 1}</td>',
+                '<td data-stat="nationality"><span>CRO</span></td>',
+                f'<td data-stat="position">{rng.choice(["FW", "MF", "DF", "GK"])}</td>',
+                f'<td data-stat="age">{rng.randint(18, 35)}</td>',
+                f'<td data-stat="minutes">{rng.randint(1, 90)}</td>',
+                f'<td data-stat="goals">{rng.randint(0, 2)}</td>',
+                f'<td data-stat="assists">{rng.randint(0, 2)}</td>',
+                f'<td data-stat="shots">{rng.randint(0, 6)}</td>',
+                f'<td data-stat="xg">{rng.random() * 1.5:.1f}</td>',
+            ]
+            rows.append(f'<tr>{"".join(cells)}</tr>')
+        parts.append(
+            f'<div class="table_wrapper"><table class="stats_table sortable" '
+            f'id="stats_{t}_summary"><caption>Stats {t}</caption>'
+            f"<thead><tr>{head}</tr></thead><tbody>{''.join(rows)}</tbody>"
+            f"</table></div>"
+        )
+    for e in range(12):
+        parts.append(
+            f'<div class="event" id="e{e}"><div>{rng.randint(1, 90)}&rsquo;</div>'
+            f'<div><a href="/p/e{e}">Igrač {e}</a> &middot; Goal</div></div>'
+        )
+    body = "\n".join(parts)
+    return PAGE.format(lang="en", title="FBref Match", nav=_nav(rng), body=body)
+
+
+def bbc(rng, cards=60):
+    topics = ["World", "UK", "Business", "Technology", "Science", "Sport"]
+    items = []
+    for i in range(cards):
+        topic = rng.choice(topics)
+        items.append(
+            f'<div data-testid="edinburgh-card" class="sc-card">'
+            f'<a href="/news/articles/c{i:04d}x" data-testid="internal-link">'
+            f'<div class="sc-image"><img src="/ichef/{i}.jpg" alt=""></div>'
+            f'<div class="sc-text"><h2 data-testid="card-headline">'
+            f"Story {i}: {topic} leaders meet as talks resume</h2>"
+            f'<p data-testid="card-description">Officials said on '
+            f"{rng.choice(['Monday', 'Tuesday', 'Friday'])} that the "
+            f"{rng.randint(2, 40)}-point plan would be reviewed next week.</p>"
+            f'<span data-testid="card-metadata-tag">{topic}</span>'
+            f'<span data-testid="card-metadata-lastupdated">'
+            f"{rng.randint(1, 23)} hrs ago</span></div></a></div>"
+        )
+    body = (
+        '<div id="cookie-banner" class="cookie-banner"><p>We use cookies to give '
+        "you the best online experience.</p><button>Yes, I agree</button></div>"
+        f'<section data-testid="topic-section">{"".join(items)}</section>'
+    )
+    return PAGE.format(lang="en-GB", title="BBC News", nav=_nav(rng), body=body)
+
+
+def scst_jobs(rng, jobs=80):
+    rows = []
+    for i in range(jobs):
+        pay = rng.choice([5.5, 6.0, 6.5, 7.0, 8.0, 10.0])
+        rows.append(
+            f"<tr><td>"
+            f'<a href="/student/za-studente/ponuda-poslova/posao/{3000 + i}">'
+            f'<span class="posao-naslov">Posao {i}: pomoć u skladištu</span></a>'
+            f'<span class="cijena">{pay:.2f} €/h</span>'
+            f'<div class="intro">Lokacija: Split, {rng.randint(1, 6)} izvršitelja'
+            f" ...</div></td></tr>"
+        )
+    body = (
+        '<div class="breadcrumb"><a href="/">Početna</a> / Ponuda poslova</div>'
+        '<table class="poslovi"><tbody>' + "".join(rows) + "</tbody></table>"
+    )
+    return PAGE.format(lang="hr", title="Ponuda poslova", nav=_nav(rng), body=body)
+
+
+FIXTURES = {
+    "steam.html": steam,
+    "njuskalo.html": njuskalo,
+    "fbref.html": fbref,
+    "bbc.html": bbc,
+    "scst_jobs.html": scst_jobs,
+}
+
+
+def main():
+    for name, build in FIXTURES.items():
+        html = build(random.Random(name))
+        (HERE / name).write_text(html, encoding="utf-8")
+        print(f"{name}: {len(html) / 1024:.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
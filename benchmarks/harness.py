@@ -0,0 +1,245 @@
+"""A small pytest-benchmark-style runner that keeps results per commit.
+
+Suites are modules with ``bench_*`` functions taking a ``benchmark``
+argument, used like the pytest-benchmark fixture::
+
+    @parametrize("site", ["steam", "bbc"])
+    def bench_parse(benchmark, site):
+        records = benchmark(get(site).extract, html)
+        benchmark.extra_info["pages"] = 1
+
+``main`` runs them, prints min/median/stddev (and pages/s when a benchmark
+sets ``extra_info["pages"]``), saves the results under
+``data/temp/benchmarks/<n>_<commit>.json`` and compares the medians with the
+newest saved run of another commit, so slowdowns show up commit by commit::
+
+    python benchmarks/bench_scrape.py                 # run, save, compare
+    python benchmarks/bench_scrape.py -k parse --fail-on-regression
+"""
+
+import argparse
+import datetime as dt
+import json
+import platform
+import statistics
+import subprocess
+import time
+
+from sciprog import REPO_ROOT
+
+RESULTS = REPO_ROOT / "data" / "temp" / "benchmarks"
+
+
+def parametrize(name, values):
+    """Run the decorated benchmark once per value, passed as ``name``."""
+
+    def wrap(func):
+        func.params = (name, list(values))
+        return func
+
+    return wrap
+
+
+class Benchmark:
+    def __init__(self, name, rounds=5, warmup=1):
+        """
+        Args:
+            name: benchmark id, e.g. ``bench_parse[steam]``
+            rounds: timed calls of ``benchmark(func)``
+            warmup: untimed calls before them
+        """
+        self.name = name
+        self.rounds = rounds
+        self.warmup = warmup
+        self.times = []
+        self.extra_info = {}
+
+    def __call__(self, func, *args, **kwargs):
+        return self.pedantic(
+            func, args, kwargs, rounds=self.rounds, warmup_rounds=self.warmup
+        )
+
+    def pedantic(
+        self,
+        target,
+        args=(),
+        kwargs=None,
+        setup=None,
+        rounds=1,
+        iterations=1,
+        warmup_rounds=0,
+    ):
+        """Time ``target`` exactly ``rounds`` x ``iterations`` times.
+
+        ``setup`` runs untimed before each round and may return new
+        ``(args, kwargs)``.
+        """
+        kwargs = kwargs or {}
+        result = None
+        for _ in range(warmup_rounds):
+            target(*args, **kwargs)
+        for _ in range(rounds):
+            if setup is not None:
+                prepared = setup()
+                if prepared is not None:
+                    args, kwargs = prepared
+            start = time.perf_counter()
+            for _ in range(iterations):
+                result = target(*args, **kwargs)
+            self.times.append((time.perf_counter() - start) / iterations)
+        return result
+
+    def stats(self) -> dict:
+        times = self.times or [0.0]
+        median = statistics.median(times)
+        stats = {
+            "name": self.name,
+            "rounds": len(self.times),
+            "min": min(times),
+            "median": median,
+            "mean": statistics.fmean(times),
+            "stddev": statistics.stdev(times) if len(times) > 1 else 0.0,
+            "max": max(times),
+            "extra_info": self.extra_info,
+        }
+        pages = self.extra_info.get("pages")
+        if pages and median:
+            stats["pages_per_s"] = pages / median
+        return stats
+
+
+def collect(modules, keyword=None) -> list:
+    """``(name, func, kwargs)`` for every ``bench_*`` function and parameter."""
+    found = []
+    for module in modules:
+        for attr, func in vars(module).items():
+            if not attr.startswith("bench_") or not callable(func):
+                continue
+            if hasattr(func, "params"):
+                name, values = func.params
+                cases = [(f"{attr}[{v}]", {name: v}) for v in values]
+            else:
+                cases = [(attr, {})]
+            for case, kwargs in cases:
+                if keyword is None or keyword in case:
+                    found.append((case, func, kwargs))
+    return found
+
+
+def run(benches, rounds=5, warmup=1) -> list[dict]:
+    results = []
+    for name, func, kwargs in benches:
+        benchmark = Benchmark(name, rounds, warmup)
+        func(benchmark, **kwargs)
+        results.append(benchmark.stats())
+    return results
+
+
+def _git(*args) -> str:
+    try:
+        out = subprocess.run(
+            ["git", *args], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+    return out.stdout.strip()
+
+
+def commit_id() -> str:
+    """Short HEAD hash, with ``-dirty`` when tracked files have changes."""
+    commit = _git("rev-parse", "--short", "HEAD") or "unknown"
+    if _git("status", "--porcelain", "--untracked-files=no"):
+        commit += "-dirty"
+    return commit
+
+
+def save(results, directory=RESULTS):
+    directory.mkdir(parents=True, exist_ok=True)
+    number = len(list(directory.glob("*.json"))) + 1
+    commit = commit_id()
+    path = directory / f"{number:04d}_{commit}.json"
+    data = {
+        "commit": commit,
+        "datetime": dt.datetime.now(dt.timezone.utc).isoformat(),
+        "machine": {"python": platform.python_version(), "node": platform.node()},
+        "benchmarks": results,
+    }
+    path.write_text(json.dumps(data, indent=1), encoding="utf-8")
+    return path
+
+
+def previous(directory=RESULTS, commit=None):
+    """The newest saved run whose commit differs from ``commit``."""
+    for path in sorted(directory.glob("*.json"), reverse=True):
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if data["commit"] != commit:
+            return data
+    return None
+
+
+def compare(results, baseline, threshold=0.10) -> list[dict]:
+    """Median change per benchmark present in both runs."""
+    old = {b["name"]: b for b in baseline["benchmarks"]}
+    rows = []
+    for bench in results:
+        before = old.get(bench["name"])
+        if before is None or not before["median"]:
+            continue
+        change = bench["median"] / before["median"] - 1
+        rows.append(
+            {
+                "name": bench["name"],
+                "before": before["median"],
+                "after": bench["median"],
+                "change": change,
+                "regressed": change > threshold,
+            }
+        )
+    return rows
+
+
+def report(results) -> str:
+    lines = [
+        f"{'benchmark':<32} {'min ms':>9} {'median ms':>10} {'stddev':>8}"
+        f" {'pages/s':>9}"
+    ]
+    for r in results:
+        rate = f"{r['pages_per_s']:>9.1f}" if "pages_per_s" in r else f"{'':>9}"
+        lines.append(
+            f"{r['name']:<32} {r['min'] * 1e3:>9.2f} {r['median'] * 1e3:>10.2f}"
+            f" {r['stddev'] * 1e3:>8.2f} {rate}"
+        )
+    return "\n".join(lines)
+
+
+def main(modules, argv=None):
+    parser = argparse.ArgumentParser(description="Run benchmark suites.")
+    parser.add_argument("-k", dest="keyword", help="only names containing this")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--no-save", action="store_true")
+    parser.add_argument(
+        "--threshold", type=float, default=0.10, help="median slowdown that fails"
+    )
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args(argv)
+
+    results = run(collect(modules, args.keyword), args.rounds, args.warmup)
+    print(report(results))
+
+    baseline = previous(commit=commit_id())
+    if not args.no_save:
+        print(f"saved {save(results).relative_to(REPO_ROOT)}")
+    if baseline is None:
+        return 0
+    rows = compare(results, baseline, args.threshold)
+    print(f"\nvs. {baseline['commit']} ({baseline['datetime'][:19]})")
+    for row in rows:
+        flag = "  REGRESSION" if row["regressed"] else ""
+        print(
+            f"{row['name']:<32} {row['before'] * 1e3:>9.2f} -> "
+            f"{row['after'] * 1e3:>9.2f} ms {row['change']:>+7.1%}{flag}"
+        )
+    if args.fail_on_regression and any(row["regressed"] for row in rows):
+        return 1
+    return 0
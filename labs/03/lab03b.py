@@ -8,14 +8,18 @@ app = marimo.App(width="medium")
 def _():
     # sales_prediction.py
 
-    import pandas as pd
-    import numpy as np
-    import matplotlib.pyplot as plt
-    import seaborn as sns
-
-    from sklearn.model_selection import train_test_split
-    from sklearn.linear_model import LinearRegression
-    from sklearn import metrics
+    # Heavy packages are imported by the first cell that uses them;
+    # SCIPROG_HEADLESS=1 skips matplotlib/seaborn entirely.
+    from sciprog.lazy import lazy_from, lazy_import
+
+    pd = lazy_import("pandas")
+    np = lazy_import("numpy")
+    plt = lazy_import("matplotlib.pyplot")
+    sns = lazy_import("seaborn")
+
+    train_test_split = lazy_from("sklearn.model_selection", "train_test_split")
+    LinearRegression = lazy_from("sklearn.linear_model", "LinearRegression")
+    metrics = lazy_import("sklearn.metrics")
     return LinearRegression, metrics, pd, plt, sns, train_test_split
 
 
@@ -104,11 +108,13 @@ def _(plt, sns, y_pred, y_test):
 
 @app.function
 def analyze_and_compare_models(data, y_test, y_pred):
-    import matplotlib.pyplot as plt
-    import seaborn as sns
-    from sklearn.model_selection import train_test_split
-    from sklearn.linear_model import LinearRegression
-    from sklearn import metrics
+    from sciprog.lazy import lazy_from, lazy_import
+
+    plt = lazy_import("matplotlib.pyplot")
+    sns = lazy_import("seaborn")
+    train_test_split = lazy_from("sklearn.model_selection", "train_test_split")
+    LinearRegression = lazy_from("sklearn.linear_model", "LinearRegression")
+    metrics = lazy_import("sklearn.metrics")
 
     # --- Analiza podataka ---
     print("🔹 Nedostajuće vrijednosti po stupcima:")
@@ -0,0 +1,5 @@
+"""Shared helpers for the Scientific Programming course labs and exercises."""
+
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
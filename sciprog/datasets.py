@@ -0,0 +1,243 @@
+"""Named course datasets with a memory-mapped columnar cache.
+
+Notebooks refer to datasets by name instead of hard-coded paths such as
+``/workspaces/2025-sci-prog/labs/03/marketing.csv``::
+
+    from sciprog import datasets
+
+    data = datasets.load("marketing")          # pandas DataFrame
+    cols = datasets.load_arrays("marketing")   # dict of read-only np.memmap
+    datasets.path("marketing")                 # Path to the original CSV
+
+The first load parses the CSV once and writes one ``.npy`` file per column
+under ``data/temp/cache/<name>/``. Later loads memory-map those files, so
+numeric columns are neither parsed nor copied. A cache entry is rebuilt when
+the source file's size or content hash changes; a changed mtime alone only
+triggers a re-hash (``git checkout`` touches mtimes without changing data).
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+from sciprog import REPO_ROOT
+
+CACHE_DIR = Path(
+    os.environ.get("SCIPROG_CACHE_DIR", REPO_ROOT / "data" / "temp" / "cache")
+)
+MANIFEST = "manifest.json"
+CACHE_VERSION = 1
+
+
+@dataclass
+class Dataset:
+    name: str
+    path: Path
+    read_csv_kwargs: dict = field(default_factory=dict)
+    description: str = ""
+
+
+_REGISTRY: dict[str, Dataset] = {}
+
+
+def register(name, path, description="", **read_csv_kwargs) -> Dataset:
+    """Add (or replace) a dataset. Relative paths are resolved from the repo root."""
+    path = Path(path)
+    if not path.is_absolute():
+        path = REPO_ROOT / path
+    dataset = Dataset(name, path, read_csv_kwargs, description)
+    _REGISTRY[name] = dataset
+    return dataset
+
+
+def names() -> list[str]:
+    return sorted(_REGISTRY)
+
+
+def get(name) -> Dataset:
+    try:
+        return _REGISTRY[name]
+    except KeyError:
+        raise KeyError(
+            f"Unknown dataset {name!r}. Available: {', '.join(names())}"
+        ) from None
+
+
+def path(name) -> Path:
+    return get(name).path
+
+
+def _register_defaults():
+    register("salaries", "labs/01/Salaries.csv", "Professor salaries (Lab 01)")
+    register("members", "labs/02/members.csv", "Lab 02 survey", encoding="utf-8-sig")
+    register(
+        "ucenik", "labs/02/ucenik.csv", "Lab 02 pupils", sep=";", encoding="cp1250"
+    )
+    register(
+        "zdravstveno",
+        "labs/02/zdravstveno.csv",
+        "Lab 02 health insurance",
+        sep=";",
+        encoding="utf-8-sig",
+    )
+    register("salary_data", "labs/03/Salary_Data.csv", "Salary vs. experience")
+    register("co2", "labs/03/data.csv", "Car CO2 emissions (lab03a)")
+    register("marketing", "labs/03/marketing.csv", "TV/Radio/Newspaper vs. Sales")
+    for csv in sorted(
+        (REPO_ROOT / "students" / "03" / "data").glob("[0-9][0-9]_*.csv")
+    ):
+        register(csv.stem, csv, "students/03 regression problem")
+
+
+_register_defaults()
+
+
+# ----------------------------------------------------------------------
+# Cache
+
+
+def _file_hash(path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cache_dir(name) -> Path:
+    return CACHE_DIR / name
+
+
+def _read_manifest(directory):
+    try:
+        return json.loads((directory / MANIFEST).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _is_fresh(dataset, manifest) -> bool:
+    if manifest is None or manifest.get("version") != CACHE_VERSION:
+        return False
+    if manifest.get("read_csv_kwargs") != dataset.read_csv_kwargs:
+        return False
+    stat = dataset.path.stat()
+    if stat.st_size != manifest["size"]:
+        return False
+    if stat.st_mtime_ns == manifest["mtime_ns"]:
+        return True
+    if _file_hash(dataset.path) != manifest["sha256"]:
+        return False
+    # Same content, new mtime: remember it so the next check skips hashing.
+    manifest["mtime_ns"] = stat.st_mtime_ns
+    _write_manifest(cache_dir(dataset.name), manifest)
+    return True
+
+
+def _write_manifest(directory, manifest):
+    tmp = directory / (MANIFEST + ".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    os.replace(tmp, directory / MANIFEST)
+
+
+def _to_array(series):
+    """Convert a pandas column to an array ``np.load`` can memory-map."""
+    if series.dtype.kind in "biufcmM":
+        return series.to_numpy(), None
+    if series.dtype.kind == "O" or str(series.dtype) in ("string", "str"):
+        values = series.fillna("").astype(str).to_numpy(dtype=str)
+        return values, "str"
+    if str(series.dtype) == "category":
+        return series.astype(str).to_numpy(dtype=str), "str"
+    return series.to_numpy(dtype=float), None
+
+
+def build(name, force=False) -> Path:
+    """Write the column cache for ``name`` if it is missing or stale."""
+    import pandas as pd
+
+    dataset = get(name)
+    directory = cache_dir(name)
+    if not force and _is_fresh(dataset, _read_manifest(directory)):
+        return directory
+
+    frame = pd.read_csv(dataset.path, **dataset.read_csv_kwargs)
+    directory.mkdir(parents=True, exist_ok=True)
+    columns = []
+    for i, column in enumerate(frame.columns):
+        values, kind = _to_array(frame[column])
+        filename = f"{i:03d}.npy"
+        np.save(directory / filename, values, allow_pickle=False)
+        columns.append(
+            {
+                "name": str(column),
+                "file": filename,
+                "dtype": values.dtype.str,
+                "kind": kind,
+            }
+        )
+
+    stat = dataset.path.stat()
+    _write_manifest(
+        directory,
+        {
+            "version": CACHE_VERSION,
+            "source": str(dataset.path),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "sha256": _file_hash(dataset.path),
+            "read_csv_kwargs": dataset.read_csv_kwargs,
+            "rows": len(frame),
+            "columns": columns,
+        },
+    )
+    return directory
+
+
+def load_arrays(name, columns=None) -> dict:
+    """Return ``{column: np.memmap}`` for ``name`` without parsing any text."""
+    directory = build(name)
+    manifest = _read_manifest(directory)
+    wanted = None if columns is None else set(columns)
+    arrays = {}
+    for column in manifest["columns"]:
+        if wanted is not None and column["name"] not in wanted:
+            continue
+        arrays[column["name"]] = np.load(directory / column["file"], mmap_mode="r")
+    if wanted is not None and wanted - set(arrays):
+        missing = ", ".join(sorted(wanted - set(arrays)))
+        raise KeyError(f"{name!r} has no column(s): {missing}")
+    return arrays
+
+
+def load(name, columns=None):
+    """Load ``name`` as a DataFrame backed by the memory-mapped columns.
+
+    Numeric columns share memory with the cache files (read-only); text
+    columns are converted to Python strings.
+    """
+    import pandas as pd
+
+    arrays = load_arrays(name, columns)
+    frame = pd.DataFrame(
+        {
+            key: values.astype(object) if values.dtype.kind == "U" else values
+            for key, values in arrays.items()
+        },
+        copy=False,
+    )
+    if columns is not None:
+        frame = frame[list(columns)]
+    return frame
+
+
+def clear(name=None):
+    """Delete the cache for one dataset, or for all of them."""
+    import shutil
+
+    targets = [cache_dir(name)] if name else [CACHE_DIR]
+    for target in targets:
+        shutil.rmtree(target, ignore_errors=True)
@@ -0,0 +1,247 @@
+"""Deferred imports for the marimo lab apps.
+
+The first cell of most apps imports pandas, sklearn, matplotlib and seaborn
+before any data is shown. ``lazy_import`` returns a placeholder module that
+performs the real import the first time an attribute is used, so each heavy
+package is loaded by the cell that actually needs it::
+
+    @app.cell
+    def _():
+        from sciprog.lazy import lazy_import, lazy_from
+
+        pd = lazy_import("pandas")
+        plt = lazy_import("matplotlib.pyplot")
+        LinearRegression = lazy_from("sklearn.linear_model", "LinearRegression")
+        return LinearRegression, pd, plt
+
+With ``SCIPROG_HEADLESS=1`` in the environment, plotting modules
+(matplotlib, seaborn, mpl_toolkits, plotly) are replaced by a stub that
+swallows every call, so ``marimo run`` or ``python app.py`` never imports
+them at all.
+
+Import-time report for one or more apps::
+
+    python -m sciprog.lazy labs/03/lab03b.py --headless
+"""
+
+import importlib
+import os
+import re
+import subprocess
+import sys
+import time
+import types
+from pathlib import Path
+
+from sciprog import REPO_ROOT
+
+PLOTTING_PACKAGES = ("matplotlib", "seaborn", "mpl_toolkits", "plotly")
+
+_TIMINGS: dict[str, float] = {}
+
+
+def headless() -> bool:
+    return os.environ.get("SCIPROG_HEADLESS", "").lower() not in ("", "0", "false")
+
+
+def _is_plotting(name) -> bool:
+    return name.split(".")[0] in PLOTTING_PACKAGES
+
+
+class _NullPlot:
+    """Stand-in for plotting modules in headless mode: every call is a no-op."""
+
+    def __init__(self, name):
+        self._name = name
+
+    def __getattr__(self, attr):
+        if attr == "subplots":
+            return self._subplots
+        return self
+
+    def __call__(self, *args, **kwargs):
+        return self
+
+    def __getitem__(self, key):
+        return self
+
+    def __iter__(self):
+        return iter(())
+
+    def _subplots(self, nrows=1, ncols=1, *args, squeeze=True, **kwargs):
+        """``(figure, axes)`` shaped like matplotlib's, so any
+        ``fig, (ax1, ax2, ax3) = plt.subplots(1, 3)`` unpacks."""
+        import numpy as np
+
+        axes = np.empty((nrows, ncols), dtype=object)
+        for index in np.ndindex(axes.shape):
+            axes[index] = self
+        if squeeze:
+            axes = axes.item() if axes.size == 1 else axes.squeeze()
+        return self, axes
+
+    def __bool__(self):
+        return False
+
+    def __repr__(self):
+        return f"<headless {self._name}>"
+
+    def _mime_(self):
+        return "text/plain", ""
+
+
+class LazyModule(types.ModuleType):
+    """Module placeholder that imports ``name`` on first attribute access."""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__["_lazy_target"] = None
+
+    def _load(self):
+        module = self.__dict__["_lazy_target"]
+        if module is None:
+            name = self.__name__
+            start = time.perf_counter()
+            module = importlib.import_module(name)
+            _TIMINGS.setdefault(name, time.perf_counter() - start)
+            self.__dict__["_lazy_target"] = module
+        return module
+
+    @property
+    def loaded(self) -> bool:
+        return self.__dict__["_lazy_target"] is not None
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+class LazyAttribute:
+    """Callable placeholder for ``from module import name``."""
+
+    def __init__(self, module, name):
+        self._module = module
+        self._name = name
+        self._target = None
+
+    def _load(self):
+        if self._target is None:
+            self._target = getattr(self._module, self._name)
+        return self._target
+
+    def __call__(self, *args, **kwargs):
+        return self._load()(*args, **kwargs)
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        return f"<lazy {self._module.__name__}.{self._name}>"
+
+
+def lazy_import(name):
+    """Return ``name`` as a module that is imported on first use.
+
+    Headless plotting modules are stubbed even if something already imported
+    them; otherwise an imported module is returned as is.
+    """
+    if headless() and _is_plotting(name):
+        return _NullPlot(name)
+    if name in sys.modules:
+        return sys.modules[name]
+    return LazyModule(name)
+
+
+def lazy_from(module, name):
+    """Lazy equivalent of ``from module import name``."""
+    target = lazy_import(module)
+    if isinstance(target, _NullPlot):
+        return _NullPlot(f"{module}.{name}")
+    if isinstance(target, LazyModule):
+        return LazyAttribute(target, name)
+    return getattr(target, name)
+
+
+def timings() -> dict[str, float]:
+    """Seconds spent importing each lazily loaded module in this process."""
+    return dict(_TIMINGS)
+
+
+# ----------------------------------------------------------------------
+# Import-time report for whole apps
+
+_IMPORTTIME = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)")
+
+
+def parse_importtime(stderr) -> dict[str, float]:
+    """Cumulative import seconds per top-level package from ``-X importtime``."""
+    totals: dict[str, float] = {}
+    for line in stderr.splitlines():
+        match = _IMPORTTIME.match(line)
+        if not match or len(match.group(3)) != 1:
+            continue
+        package = match.group(4).split(".")[0]
+        totals[package] = totals.get(package, 0.0) + int(match.group(2)) / 1e6
+    return totals
+
+
+def profile_app(path, headless_mode=False, timeout=600) -> dict:
+    """Run one app in a fresh interpreter and report its import costs."""
+    path = Path(path).resolve()
+    env = dict(os.environ, MPLBACKEND="Agg")
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [str(REPO_ROOT), env.get("PYTHONPATH")])
+    )
+    if headless_mode:
+        env["SCIPROG_HEADLESS"] = "1"
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", str(path)],
+        cwd=path.parent,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+    )
+    wall = time.perf_counter() - start
+    imports = parse_importtime(proc.stderr)
+    return {
+        "app": str(path),
+        "returncode": proc.returncode,
+        "wall": wall,
+        "import_total": sum(imports.values()),
+        "imports": dict(sorted(imports.items(), key=lambda kv: -kv[1])),
+    }
+
+
+def format_report(report, top=10) -> str:
+    lines = [
+        f"{report['app']}",
+        f"  wall {report['wall']:.2f}s, imports {report['import_total']:.2f}s"
+        + ("" if report["returncode"] == 0 else f" (exit {report['returncode']})"),
+    ]
+    for package, seconds in list(report["imports"].items())[:top]:
+        lines.append(f"  {seconds:8.3f}s  {package}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Import-time report for marimo apps")
+    parser.add_argument("apps", nargs="+", type=Path)
+    parser.add_argument("--headless", action="store_true", help="skip plotting")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+    for app in args.apps:
+        print(format_report(profile_app(app, args.headless), args.top))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""Headless batch rendering of the regression report plots.
+
+Each exercise script builds a new figure per dataset and calls ``plt.show()``.
+Here every plot is drawn with the Agg backend on a figure that is created once
+per worker process and cleared between datasets (``FigurePool``), and the 30
+problem fits are spread over a process pool::
+
+    python -m sciprog.plotting --out data/temp/plots          # 30 PNGs + panels
+    python -m sciprog.plotting --pdf data/temp/report.pdf     # one multi-page PDF
+
+A PDF is one file, so its pages are drawn in a single process (still on one
+reused figure); PNG output is rendered in parallel.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+from sciprog import REPO_ROOT
+
+DEFAULT_OUT = REPO_ROOT / "data" / "temp" / "plots"
+
+
+def _use_agg():
+    import matplotlib
+
+    matplotlib.use("Agg", force=True)
+
+
+class FigurePool:
+    """Reuse one figure per layout instead of creating a new one per plot."""
+
+    def __init__(self):
+        self._figures = {}
+
+    def get(self, nrows=1, ncols=1, figsize=(8, 5)):
+        import matplotlib.pyplot as plt
+
+        key = (nrows, ncols, tuple(figsize))
+        if key not in self._figures:
+            fig, axes = plt.subplots(nrows, ncols, figsize=figsize, squeeze=False)
+            self._figures[key] = (fig, axes)
+        fig, axes = self._figures[key]
+        for ax in axes.flat:
+            ax.cla()
+        return fig, axes
+
+    def close(self):
+        import matplotlib.pyplot as plt
+
+        for fig, _ in self._figures.values():
+            plt.close(fig)
+        self._figures.clear()
+
+
+_POOL = None
+
+
+def figure_pool() -> FigurePool:
+    """The figure pool of the current process."""
+    global _POOL
+    if _POOL is None:
+        _use_agg()
+        _POOL = FigurePool()
+    return _POOL
+
+
+# ----------------------------------------------------------------------
+# Problem fit plots
+
+
+def draw_fit(ax, x, y, slope, intercept, x_name, y_name, title="", r2=None):
+    ax.scatter(x, y, alpha=0.7, label="data")
+    pad = 0.05 * (x.max() - x.min() or 1.0)
+    xline = np.array([x.min() - pad, x.max() + pad])
+    label = "fit" if r2 is None else f"fit (R² = {r2:.3f})"
+    ax.plot(xline, intercept + slope * xline, color="C1", linewidth=2, label=label)
+    ax.set_xlabel(x_name)
+    ax.set_ylabel(y_name)
+    ax.set_title(title)
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+
+
+def draw_bias_variance(ax, sweep, title=None):
+    """CV error, bias², variance and training error of a ``DegreeSweep``."""
+    d = sweep.degrees
+    ax.plot(d, sweep.cv_mse, "o-", color="C3", linewidth=2, label="CV MSE")
+    ax.plot(d, sweep.bias2, "s--", color="C0", label="bias²")
+    ax.plot(d, sweep.variance, "^--", color="C2", label="variance")
+    ax.plot(d, sweep.train_mse, ":", color="0.4", label="train MSE")
+    ax.axvline(sweep.best_degree, color="0.6", linewidth=1)
+    ax.set_yscale("log")
+    ax.set_xticks(d)
+    ax.set_xlabel("degree")
+    ax.set_ylabel("MSE")
+    ax.set_title(sweep.name if title is None else title)
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+
+
+def _render_fit_pngs(jobs):
+    fig_pool = figure_pool()
+    written = []
+    for job in jobs:
+        fig, axes = fig_pool.get()
+        draw_fit(axes[0, 0], **job["plot"])
+        fig.tight_layout()
+        fig.savefig(job["path"], dpi=100)
+        written.append(job["path"])
+    return written
+
+
+def _fit_jobs(out_dir=None):
+    from sciprog.regression import fit_many, load_padded, parse_problems
+
+    problems = parse_problems()
+    X, Y, mask = load_padded(problems)
+    fit = fit_many(X, Y, mask, names=[p.name for p in problems])
+    jobs = []
+    for i, p in enumerate(problems):
+        jobs.append(
+            {
+                "path": (
+                    None if out_dir is None else str(Path(out_dir) / f"{p.name}.png")
+                ),
+                "plot": {
+                    "x": X[i, mask[i]],
+                    "y": Y[i, mask[i]],
+                    "slope": fit.slope[i],
+                    "intercept": fit.intercept[i],
+                    "x_name": p.x_name,
+                    "y_name": p.y_name,
+                    "title": f"{p.number}. {p.title}",
+                    "r2": fit.r2[i],
+                },
+            }
+        )
+    return jobs
+
+
+def render_problem_fits(out_dir=DEFAULT_OUT, n_jobs=None) -> list[str]:
+    """Write ``NN_name.png`` for every ``students/03`` problem."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    jobs = _fit_jobs(out_dir)
+    n_jobs = min(n_jobs or os.cpu_count() or 1, len(jobs))
+    if n_jobs <= 1:
+        return _render_fit_pngs(jobs)
+    chunks = [jobs[i::n_jobs] for i in range(n_jobs)]
+    with ProcessPoolExecutor(max_workers=n_jobs, initializer=_use_agg) as pool:
+        return [path for part in pool.map(_render_fit_pngs, chunks) for path in part]
+
+
+# ----------------------------------------------------------------------
+# lab03b panels (matplotlib only, seaborn's PairGrid cannot reuse a figure)
+
+
+def draw_pairplot(fig, axes, data):
+    columns = list(data.columns)
+    for i, row in enumerate(columns):
+        for j, col in enumerate(columns):
+            ax = axes[i, j]
+            if i == j:
+                ax.hist(data[col].dropna(), bins=20, color="C0", alpha=0.7)
+            else:
+                ax.scatter(data[col], data[row], s=6, alpha=0.6)
+            if i == len(columns) - 1:
+                ax.set_xlabel(col)
+            if j == 0:
+                ax.set_ylabel(row)
+    fig.suptitle("Pairplot")
+
+
+def draw_heatmap(fig, ax, data):
+    corr = data.corr(numeric_only=True)
+    image = ax.imshow(corr.to_numpy(), cmap="coolwarm", vmin=-1, vmax=1)
+    ax.set_xticks(range(len(corr)), corr.columns, rotation=45)
+    ax.set_yticks(range(len(corr)), corr.index)
+    for (i, j), value in np.ndenumerate(corr.to_numpy()):
+        ax.text(j, i, f"{value:.2f}", ha="center", va="center")
+    ax.set_title("Korelacijska matrica")
+    if not hasattr(fig, "_sciprog_colorbar"):
+        fig._sciprog_colorbar = fig.colorbar(image, ax=ax)
+
+
+def draw_boxplots(axes, data):
+    for ax, col in zip(axes.flat, data.columns):
+        ax.boxplot(
+            data[col].dropna(), patch_artist=True, boxprops={"facecolor": "lightblue"}
+        )
+        ax.set_title(col)
+
+
+def draw_profile_boxplots(axes, profile):
+    """``draw_boxplots`` from a ``profiling.Profile`` (whiskers from the digest)."""
+    for ax, stats in zip(axes.flat, profile.boxplot_stats()):
+        ax.bxp([stats], patch_artist=True, boxprops={"facecolor": "lightblue"})
+        ax.set_title(stats["label"])
+
+
+def _panel_pages(data):
+    """Yield ``(name, fig)`` for the lab03b pairplot, heatmap and boxplots."""
+    pool = figure_pool()
+    numeric = data.select_dtypes("number")
+    k = len(numeric.columns)
+
+    fig, axes = pool.get(k, k, figsize=(2.5 * k, 2.5 * k))
+    draw_pairplot(fig, axes, numeric)
+    fig.tight_layout()
+    yield "pairplot", fig
+
+    fig, axes = pool.get(figsize=(6, 5))
+    draw_heatmap(fig, axes[0, 0], numeric)
+    fig.tight_layout()
+    yield "heatmap", fig
+
+    fig, axes = pool.get(1, k, figsize=(3 * k, 4))
+    draw_boxplots(axes, numeric)
+    fig.tight_layout()
+    yield "boxplots", fig
+
+
+def render_panels(data, out_dir=DEFAULT_OUT) -> list[str]:
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    written = []
+    for name, fig in _panel_pages(data):
+        path = out_dir / f"{name}.png"
+        fig.savefig(path, dpi=100)
+        written.append(str(path))
+    return written
+
+
+def render_pdf(path, data=None) -> str:
+    """Write every problem fit (and the lab03b panels) to one multi-page PDF."""
+    from matplotlib.backends.backend_pdf import PdfPages
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pool = figure_pool()
+    with PdfPages(path) as pdf:
+        for job in _fit_jobs():
+            fig, axes = pool.get()
+            draw_fit(axes[0, 0], **job["plot"])
+            fig.tight_layout()
+            pdf.savefig(fig)
+        if data is not None:
+            for _, fig in _panel_pages(data):
+                pdf.savefig(fig)
+    return str(path)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Render the regression report plots")
+    parser.add_argument("--out", type=Path, default=DEFAULT_OUT, help="PNG directory")
+    parser.add_argument("--pdf", type=Path, help="write one multi-page PDF instead")
+    parser.add_argument("--jobs", type=int, default=None)
+    parser.add_argument("--no-panels", action="store_true", help="skip lab03b panels")
+    args = parser.parse_args(argv)
+
+    data = None
+    if not args.no_panels:
+        from sciprog import datasets
+
+        data = datasets.load("marketing")
+
+    if args.pdf:
+        print(render_pdf(args.pdf, data))
+        return
+    written = render_problem_fits(args.out, args.jobs)
+    if data is not None:
+        written += render_panels(data, args.out)
+    print(f"Wrote {len(written)} plots to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,567 @@
+"""One-pass data profile: moments, correlations, quantiles, distinct counts, duplicates.
+
+The exercise 2 apps (``students/03/exercise2/nvidovic.py``, ``mkatavic.py``,
+``lkrvavica.py``) and ``analyze_and_compare_models`` in ``labs/03/lab03b.py``
+call ``describe()``, ``isna().sum()``, ``duplicated()``, ``corr()`` and a
+boxplot per column, each a separate scan of a fully loaded DataFrame.
+``profile_csv`` reads the file in chunks and updates every statistic from the
+same chunk, so memory depends on the number of columns, not on the rows:
+
+- mean, variance, skewness and kurtosis merged per chunk (Welford/Pébay);
+- pairwise-complete covariances merged the same way (Chan et al.), giving
+  ``corr()`` without keeping the data;
+- a merging t-digest per numeric column for quantiles and boxplot whiskers;
+- a HyperLogLog sketch per column for distinct counts;
+- 64-bit row hashes for ``duplicated().sum()``, exact up to ``max_tracked``
+  distinct rows and estimated from a HyperLogLog of the row hashes beyond.
+
+Counts, means, extremes, missing values and correlations are exact;
+quantiles come from the digest (exact while a column has fewer values than
+the digest has centroids) and distinct counts are HyperLogLog estimates
+(about 1% error)::
+
+    from sciprog.profiling import profile_csv
+
+    profile = profile_csv("marketing")      # dataset name or path
+    profile.describe()                      # like data.describe(), plus more
+    profile.missing(), profile.duplicates
+    profile.corr()
+    ax.bxp(profile.boxplot_stats())         # plotting.draw_profile_boxplots
+
+A ``Profile`` renders itself as HTML, so a marimo cell can simply return it.
+"""
+
+import math
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+DEFAULT_CHUNKSIZE = 100_000
+
+
+# ----------------------------------------------------------------------
+# Sketches
+
+
+class TDigest:
+    """Merging t-digest (Dunning & Ertl) with the arcsine ``k1`` scale.
+
+    Each update sorts the new values together with the current centroids and
+    merges neighbours whose ``k``-index is the same, so the tails keep small
+    centroids (accurate whiskers) and the centre is summarized coarsely.
+    """
+
+    def __init__(self, compression=200):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = math.inf
+        self.max = -math.inf
+
+    @property
+    def count(self) -> float:
+        return float(self.weights.sum())
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float).ravel()
+        values = values[~np.isnan(values)]
+        if not len(values):
+            return
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self._compress(
+            np.concatenate([self.means, values]),
+            np.concatenate([self.weights, np.ones(len(values))]),
+        )
+
+    def merge(self, other: "TDigest"):
+        if not len(other.means):
+            return
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress(
+            np.concatenate([self.means, other.means]),
+            np.concatenate([self.weights, other.weights]),
+        )
+
+    def _compress(self, means, weights):
+        order = np.argsort(means)
+        means, weights = means[order], weights[order]
+        total = weights.sum()
+        q = (np.cumsum(weights) - weights / 2) / total
+        k = np.floor(self.compression / (2 * np.pi) * np.arcsin(2 * q - 1))
+        starts = np.flatnonzero(np.r_[True, k[1:] != k[:-1]])
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / self.weights
+
+    def _knots(self):
+        """Cumulative weight at each centroid centre, with the extremes added."""
+        centre = np.cumsum(self.weights) - self.weights / 2
+        positions = np.r_[0.0, centre, self.count]
+        values = np.r_[self.min, self.means, self.max]
+        return positions, values
+
+    def quantile(self, q):
+        """Approximate quantile(s); equals ``np.quantile`` on unmerged data."""
+        q = np.asarray(q, dtype=float)
+        if not len(self.means):
+            return np.full(q.shape, np.nan)[()]
+        positions, values = self._knots()
+        # Position q*(n-1) in 0-based sorted order sits at q*(n-1) + 1/2 in
+        # cumulative weight, where singleton centroid i is centred.
+        target = q * (self.count - 1) + 0.5
+        return np.interp(target, positions, values)[()]
+
+    def cdf(self, x):
+        """Approximate fraction of values ``<= x``."""
+        x = np.asarray(x, dtype=float)
+        if not len(self.means):
+            return np.full(x.shape, np.nan)[()]
+        positions, values = self._knots()
+        return (np.interp(x, values, positions) / self.count)[()]
+
+
+class HyperLogLog:
+    """HyperLogLog distinct counter over 64-bit hashes (``2**precision`` registers)."""
+
+    def __init__(self, precision=14):
+        if not 11 <= precision <= 18:
+            raise ValueError("precision must be between 11 and 18")
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add_hashes(self, hashes):
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        if not len(hashes):
+            return
+        p = self.precision
+        index = (hashes >> np.uint64(64 - p)).astype(np.intp)
+        rest = hashes & np.uint64((1 << (64 - p)) - 1)
+        # Leading zeros of the remaining 64 - p bits, plus one. With p >= 11
+        # they fit a float64 mantissa, so frexp's exponent is the bit length.
+        _, bits = np.frexp(rest.astype(float))
+        rank = (64 - p + 1 - bits).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other: "HyperLogLog"):
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def count(self) -> float:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(int)))
+        empty = int((self.registers == 0).sum())
+        if estimate <= 2.5 * m and empty:
+            return m * math.log(m / empty)  # linear counting for small sets
+        return float(estimate)
+
+
+class _HashSet:
+    """Sorted uint64 runs merged like an LSM tree; membership by binary search."""
+
+    def __init__(self):
+        self.runs = []
+        self.size = 0
+
+    def contains(self, hashes):
+        found = np.zeros(len(hashes), dtype=bool)
+        for run in self.runs:
+            i = np.searchsorted(run, hashes)
+            i[i == len(run)] = 0
+            found |= run[i] == hashes
+        return found
+
+    def add_sorted(self, hashes):
+        self.size += len(hashes)
+        self.runs.append(hashes)
+        # Keep run sizes geometric so there are O(log n) runs to search.
+        while len(self.runs) > 1 and len(self.runs[-2]) <= 2 * len(self.runs[-1]):
+            last = self.runs.pop()
+            self.runs[-1] = np.sort(np.concatenate([self.runs[-1], last]))
+
+
+# ----------------------------------------------------------------------
+# Profile
+
+
+@dataclass
+class ColumnProfile:
+    name: str
+    dtype: str
+    count: int
+    missing: int
+    distinct: float
+    mean: float = np.nan
+    std: float = np.nan
+    min: float = np.nan
+    max: float = np.nan
+    skew: float = np.nan
+    kurtosis: float = np.nan
+    digest: TDigest = field(repr=False, default=None)
+
+    @property
+    def numeric(self) -> bool:
+        return self.digest is not None
+
+    def quantile(self, q):
+        return self.digest.quantile(q) if self.numeric else np.nan
+
+    def boxplot_stats(self, whis=1.5) -> dict:
+        """Whiskers and box in ``Axes.bxp`` format (no individual fliers)."""
+        q1, med, q3 = self.digest.quantile([0.25, 0.5, 0.75])
+        iqr = q3 - q1
+        lo_fence, hi_fence = q1 - whis * iqr, q3 + whis * iqr
+        lo_cut, hi_cut = self.digest.cdf([lo_fence, hi_fence])
+        below = lo_cut if lo_fence > self.min else 0.0
+        above = 1.0 - hi_cut if hi_fence < self.max else 0.0
+        # The whisker ends at the most extreme value inside the fence: the
+        # true extreme when nothing lies beyond it, else the digest's estimate.
+        whislo = self.digest.quantile(below) if below else self.min
+        whishi = self.digest.quantile(hi_cut) if above else self.max
+        return {
+            "label": self.name,
+            "mean": self.mean,
+            "med": med,
+            "q1": q1,
+            "q3": q3,
+            "whislo": float(whislo),
+            "whishi": float(whishi),
+            "fliers": [],
+            "outliers": round(self.count * (below + above)),
+        }
+
+
+@dataclass
+class Profile:
+    rows: int
+    columns: list
+    duplicates: float
+    duplicates_exact: bool = True
+    corr_names: list = field(default_factory=list)
+    corr_matrix: np.ndarray = field(repr=False, default=None)
+
+    def __getitem__(self, name) -> ColumnProfile:
+        return next(c for c in self.columns if c.name == name)
+
+    @property
+    def numeric(self) -> list:
+        return [c for c in self.columns if c.numeric]
+
+    def describe(self, percentiles=(0.25, 0.5, 0.75), numeric_only=True):
+        """``DataFrame.describe()`` layout (statistics x columns), plus
+        ``missing``, ``distinct``, ``skew`` and ``kurtosis`` rows."""
+        import pandas as pd
+
+        columns = self.numeric if numeric_only else self.columns
+        labels = [f"{p * 100:g}%" for p in percentiles]
+        table = {}
+        for c in columns:
+            qs = c.quantile(list(percentiles)) if c.numeric else [np.nan] * len(labels)
+            table[c.name] = [c.count, c.mean, c.std, c.min, *qs, c.max]
+            table[c.name] += [c.missing, c.distinct, c.skew, c.kurtosis]
+        index = ["count", "mean", "std", "min", *labels, "max"]
+        index += ["missing", "distinct", "skew", "kurtosis"]
+        return pd.DataFrame(table, index=index)
+
+    def missing(self):
+        """``isna().sum()``."""
+        import pandas as pd
+
+        return pd.Series(
+            {c.name: c.missing for c in self.columns}, name="missing", dtype=int
+        )
+
+    def corr(self):
+        """Pearson correlations over pairwise-complete rows, like ``DataFrame.corr``."""
+        import pandas as pd
+
+        return pd.DataFrame(
+            self.corr_matrix, index=self.corr_names, columns=self.corr_names
+        )
+
+    def boxplot_stats(self, whis=1.5) -> list[dict]:
+        return [c.boxplot_stats(whis) for c in self.numeric if c.count]
+
+    def _repr_html_(self):
+        duplicates = (
+            f"{self.duplicates:,}"
+            if self.duplicates_exact
+            else f"~{self.duplicates:,.0f}"
+        )
+        return (
+            f"<p><b>{self.rows:,}</b> rows, <b>{len(self.columns)}</b> columns, "
+            f"<b>{duplicates}</b> duplicate rows</p>"
+            + self.describe(numeric_only=False).to_html(float_format="{:.4g}".format)
+            + "<p>Correlation</p>"
+            + self.corr().to_html(float_format="{:.2f}".format)
+        )
+
+
+# ----------------------------------------------------------------------
+# Accumulator
+
+
+class Profiler:
+    def __init__(self, compression=200, precision=14, max_tracked=10_000_000):
+        """
+        Args:
+            compression: t-digest size; about ``compression / 2`` centroids
+            precision: HyperLogLog registers are ``2**precision`` (0.8% error
+                at 14)
+            max_tracked: distinct row hashes kept for exact duplicate
+                counting (8 bytes each); beyond it the count is estimated
+        """
+        self.compression = compression
+        self.precision = precision
+        self.max_tracked = max_tracked
+        self.rows = 0
+        self.names = None
+        self.numeric = None
+
+    def _start(self, chunk):
+        self.names = [str(c) for c in chunk.columns]
+        kinds = [chunk[c].dtype.kind for c in chunk.columns]
+        self.numeric = [i for i, kind in enumerate(kinds) if kind in "iuf"]
+        self.dtypes = [str(chunk[c].dtype) for c in chunk.columns]
+        p, k = len(self.numeric), len(self.names)
+        # Per-column moments of the numeric columns.
+        self.n = np.zeros(p)
+        self.mean = np.zeros(p)
+        self.m2 = np.zeros(p)
+        self.m3 = np.zeros(p)
+        self.m4 = np.zeros(p)
+        self.min = np.full(p, np.inf)
+        self.max = np.full(p, -np.inf)
+        # Pairwise-complete co-moments: N[i, j] rows where both are present,
+        # M[i, j] the mean of column i over those rows, V[i, j] its sum of
+        # squared deviations, C[i, j] the sum of cross deviations.
+        self.pair_n = np.zeros((p, p))
+        self.pair_mean = np.zeros((p, p))
+        self.pair_m2 = np.zeros((p, p))
+        self.pair_c = np.zeros((p, p))
+        self.missing = np.zeros(k, dtype=np.int64)
+        self.digests = [TDigest(self.compression) for _ in range(p)]
+        self.sketches = [HyperLogLog(self.precision) for _ in range(k)]
+        self.row_sketch = HyperLogLog(self.precision)
+        self.seen = _HashSet()
+        self.duplicates = 0
+        self.exact = True
+
+    def update(self, chunk) -> "Profiler":
+        """Add the rows of a DataFrame chunk (same columns as the first one)."""
+        import pandas as pd
+
+        if self.names is None:
+            self._start(chunk)
+        if len(chunk) == 0:
+            return self
+        self.rows += len(chunk)
+        self.missing += chunk.isna().to_numpy().sum(axis=0)
+
+        # A column that is numeric in the first chunk may not parse in a later
+        # one; unparseable values count as missing for the statistics.
+        X = np.column_stack(
+            [
+                pd.to_numeric(chunk.iloc[:, i], errors="coerce").to_numpy(float)
+                for i in self.numeric
+            ]
+            or [np.empty((len(chunk), 0))]
+        )
+        self._moments(X)
+        self._comoments(X)
+        for j, digest in enumerate(self.digests):
+            digest.update(X[:, j])
+
+        # Hash numeric columns as float64 so int and float chunks agree.
+        normalized = chunk.copy()
+        for j, i in enumerate(self.numeric):
+            normalized.isetitem(i, X[:, j])
+        for i, sketch in enumerate(self.sketches):
+            column = normalized.iloc[:, i].dropna()
+            sketch.add_hashes(pd.util.hash_pandas_object(column, index=False))
+        self._rows(pd.util.hash_pandas_object(normalized, index=False).to_numpy())
+        return self
+
+    def _moments(self, X):
+        present = ~np.isnan(X)
+        nb = present.sum(axis=0).astype(float)
+        if not nb.any():
+            return
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean_b = np.where(nb > 0, np.nansum(X, axis=0) / nb, 0.0)
+            d = np.where(present, X - mean_b, 0.0)
+            d2 = d * d
+            m2b, m3b, m4b = d2.sum(0), (d2 * d).sum(0), (d2 * d2).sum(0)
+            # fmin/fmax skip NaNs; all-missing columns keep +-inf.
+            self.min = np.fmin(self.min, np.fmin.reduce(X, axis=0))
+            self.max = np.fmax(self.max, np.fmax.reduce(X, axis=0))
+
+            na, n = self.n, self.n + nb
+            delta = mean_b - self.mean
+            safe = np.where(n > 0, n, 1.0)
+            # Pébay (2008): combine the central moments of two partitions.
+            m4 = (
+                self.m4
+                + m4b
+                + delta**4 * na * nb * (na**2 - na * nb + nb**2) / safe**3
+                + 6 * delta**2 * (na**2 * m2b + nb**2 * self.m2) / safe**2
+                + 4 * delta * (na * m3b - nb * self.m3) / safe
+            )
+            m3 = (
+                self.m3
+                + m3b
+                + delta**3 * na * nb * (na - nb) / safe**2
+                + 3 * delta * (na * m2b - nb * self.m2) / safe
+            )
+            m2 = self.m2 + m2b + delta**2 * na * nb / safe
+        self.mean = self.mean + delta * nb / safe
+        self.m2, self.m3, self.m4, self.n = m2, m3, m4, n
+
+    def _comoments(self, X):
+        present = ~np.isnan(X)
+        M = present.astype(float)
+        # Shift by the running means (already updated with this chunk) so the
+        # sums below stay small.
+        shift = self.mean
+        X0 = np.where(present, X - shift, 0.0)
+        nb = M.T @ M  # rows where both i and j are present
+        S = X0.T @ M  # sum of column i over those rows
+        Q = (X0**2).T @ M
+        P = X0.T @ X0
+        safe_b = np.where(nb > 0, nb, 1.0)
+        mean_b = S / safe_b
+        m2_b = Q - S * mean_b
+        c_b = P - S * mean_b.T
+
+        na, n = self.pair_n, self.pair_n + nb
+        safe = np.where(n > 0, n, 1.0)
+        delta = (mean_b + shift[:, None]) - self.pair_mean
+        weight = na * nb / safe
+        self.pair_c += c_b + weight * delta * delta.T
+        self.pair_m2 += m2_b + weight * delta**2
+        self.pair_mean += delta * nb / safe
+        self.pair_n = n
+
+    def _rows(self, hashes):
+        self.row_sketch.add_hashes(hashes)
+        unique = np.unique(hashes)
+        self.duplicates += len(hashes) - len(unique)
+        if not self.exact:
+            return
+        seen = self.seen.contains(unique)
+        self.duplicates += int(seen.sum())
+        self.seen.add_sorted(unique[~seen])
+        if self.seen.size > self.max_tracked:
+            self.exact = False
+            self.seen = _HashSet()
+
+    def profile(self) -> Profile:
+        if self.names is None:
+            return Profile(rows=0, columns=[], duplicates=0)
+        n = self.n
+        with np.errstate(invalid="ignore", divide="ignore"):
+            std = np.sqrt(self.m2 / (n - 1))
+            # Bias-adjusted skewness and excess kurtosis, as pandas reports them.
+            g1 = np.sqrt(n) * self.m3 / self.m2**1.5
+            skew = g1 * np.sqrt(n * (n - 1)) / (n - 2)
+            g2 = n * self.m4 / self.m2**2 - 3
+            kurt = ((n + 1) * g2 + 6) * (n - 1) / ((n - 2) * (n - 3))
+            corr = self.pair_c / np.sqrt(self.pair_m2 * self.pair_m2.T)
+        skew[n < 3] = np.nan
+        kurt[n < 4] = np.nan
+
+        position = {i: j for j, i in enumerate(self.numeric)}
+        columns = []
+        for i, name in enumerate(self.names):
+            count = self.rows - int(self.missing[i])
+            column = ColumnProfile(
+                name=name,
+                dtype=self.dtypes[i],
+                count=count,
+                missing=int(self.missing[i]),
+                distinct=min(round(self.sketches[i].count()), count),
+            )
+            j = position.get(i)
+            if j is not None and n[j] > 0:
+                column.count = int(n[j])
+                column.mean = float(self.mean[j])
+                column.std = float(std[j])
+                column.min = float(self.min[j])
+                column.max = float(self.max[j])
+                column.skew = float(skew[j])
+                column.kurtosis = float(kurt[j])
+                column.digest = self.digests[j]
+            elif j is not None:
+                column.digest = self.digests[j]
+            columns.append(column)
+
+        if self.exact:
+            duplicates = self.duplicates
+        else:
+            duplicates = max(0, self.rows - round(self.row_sketch.count()))
+        return Profile(
+            rows=self.rows,
+            columns=columns,
+            duplicates=duplicates,
+            duplicates_exact=self.exact,
+            corr_names=[self.names[i] for i in self.numeric],
+            corr_matrix=corr,
+        )
+
+
+def profile_frame(data, chunksize=DEFAULT_CHUNKSIZE, **kwargs) -> Profile:
+    """Profile an in-memory DataFrame ``chunksize`` rows at a time."""
+    profiler = Profiler(**kwargs)
+    for start in range(0, max(len(data), 1), chunksize):
+        profiler.update(data.iloc[start : start + chunksize])
+    return profiler.profile()
+
+
+def profile_csv(
+    source, chunksize=DEFAULT_CHUNKSIZE, usecols=None, profiler=None, **read_csv_kwargs
+) -> Profile:
+    """Profile a CSV without loading it.
+
+    Args:
+        source: path, or a name registered in ``sciprog.datasets`` (its
+            ``read_csv`` options are used)
+        chunksize: rows parsed and profiled at a time
+        usecols: restrict the profile to these columns
+        profiler: a configured ``Profiler`` (compression, precision,
+            max_tracked)
+    """
+    import pandas as pd
+
+    from sciprog import datasets
+
+    if not Path(source).exists() and source in datasets.names():
+        dataset = datasets.get(source)
+        source = dataset.path
+        read_csv_kwargs = {**dataset.read_csv_kwargs, **read_csv_kwargs}
+    profiler = profiler or Profiler()
+    with pd.read_csv(
+        source, chunksize=chunksize, usecols=usecols, **read_csv_kwargs
+    ) as reader:
+        for chunk in reader:
+            profiler.update(chunk)
+    return profiler.profile()
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Profile a CSV in one pass")
+    parser.add_argument("source", help="CSV path or sciprog.datasets name")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    args = parser.parse_args(argv)
+
+    profile = profile_csv(args.source, chunksize=args.chunksize)
+    approx = "" if profile.duplicates_exact else "~"
+    print(f"{profile.rows} rows, {approx}{profile.duplicates} duplicates")
+    print(profile.describe(numeric_only=False).to_string())
+    print(profile.corr().round(3).to_string())
+
+
+if __name__ == "__main__":
+    main()
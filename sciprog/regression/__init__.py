@@ -0,0 +1,47 @@
+"""Vectorized regression tools for the Lab 03 datasets."""
+
+from .batch import (
+    BatchFit,
+    Problem,
+    fit_many,
+    fit_problems,
+    load_padded,
+    parse_problems,
+)
+from .bootstrap import BootstrapResult, bootstrap_coefficients, bootstrap_ols
+from .path import RegPath, fit_path, regularization_path
+from .selection import (
+    Leaderboard,
+    compare_models,
+    enumerate_candidates,
+    expand_features,
+)
+from .serving import LinearModel, PredictionServer
+from .streaming import StreamingOLS
+from .sweep import DegreeSweep, SweepReport, sweep_degrees, sweep_problems
+
+__all__ = [
+    "BatchFit",
+    "BootstrapResult",
+    "DegreeSweep",
+    "Leaderboard",
+    "LinearModel",
+    "PredictionServer",
+    "Problem",
+    "RegPath",
+    "StreamingOLS",
+    "SweepReport",
+    "bootstrap_coefficients",
+    "bootstrap_ols",
+    "compare_models",
+    "enumerate_candidates",
+    "expand_features",
+    "fit_many",
+    "fit_path",
+    "fit_problems",
+    "load_padded",
+    "parse_problems",
+    "regularization_path",
+    "sweep_degrees",
+    "sweep_problems",
+]
@@ -0,0 +1,168 @@
+"""Fit every single-feature problem from ``students/03`` in one vectorized pass.
+
+All datasets are loaded into one zero-padded ``(k, n_max)`` array together with
+a boolean mask, so the closed-form OLS sums for every problem are computed at
+once instead of building one ``LinearRegression`` per CSV.
+
+Example::
+
+    from sciprog.regression import fit_problems
+
+    fit = fit_problems()
+    print(fit.to_frame())
+"""
+
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from sciprog import REPO_ROOT
+
+PROBLEMS_MD = REPO_ROOT / "students" / "03" / "problems.md"
+
+_PROBLEM_LINE = re.compile(r"^\s*(\d+)\.\s+(.*?)\s*\[[^\]]*\]\(([^)]+\.csv)\)")
+
+
+@dataclass
+class Problem:
+    number: int
+    title: str
+    path: Path
+    x_name: str = ""
+    y_name: str = ""
+
+    @property
+    def name(self) -> str:
+        return self.path.stem
+
+
+@dataclass
+class BatchFit:
+    """Per-dataset results, every field is an array of length ``k``."""
+
+    names: list
+    n: np.ndarray
+    slope: np.ndarray
+    intercept: np.ndarray
+    r2: np.ndarray
+    rmse: np.ndarray
+    mae: np.ndarray
+
+    def __len__(self):
+        return len(self.names)
+
+    def to_frame(self):
+        import pandas as pd
+
+        return pd.DataFrame(
+            {
+                "n": self.n,
+                "slope": self.slope,
+                "intercept": self.intercept,
+                "r2": self.r2,
+                "rmse": self.rmse,
+                "mae": self.mae,
+            },
+            index=pd.Index(self.names, name="dataset"),
+        )
+
+
+def parse_problems(md_path=PROBLEMS_MD) -> list[Problem]:
+    """Read the numbered ``NN_*.csv`` links from ``problems.md``."""
+    md_path = Path(md_path)
+    problems = []
+    for line in md_path.read_text(encoding="utf-8").splitlines():
+        match = _PROBLEM_LINE.match(line)
+        if not match:
+            continue
+        number, title, link = match.groups()
+        problems.append(
+            Problem(
+                number=int(number),
+                title=title.strip("* "),
+                path=(md_path.parent / link).resolve(),
+            )
+        )
+    return problems
+
+
+def _read_xy(problem: Problem) -> tuple[np.ndarray, np.ndarray]:
+    with open(problem.path, encoding="utf-8") as f:
+        header = f.readline().strip().split(",")
+        data = np.loadtxt(f, delimiter=",", ndmin=2)
+    problem.x_name, problem.y_name = header[0], header[1]
+    # Same cleaning the exercise scripts do with ``data.dropna()``.
+    data = data[~np.isnan(data[:, :2]).any(axis=1)]
+    return data[:, 0], data[:, 1]
+
+
+def load_padded(problems):
+    """Stack all problems into padded ``X``, ``Y`` and ``mask`` arrays.
+
+    Rows are zero-padded up to the longest dataset; ``mask`` is ``True`` for
+    real observations.
+    """
+    columns = [_read_xy(p) for p in problems]
+    n_max = max((len(x) for x, _ in columns), default=0)
+    X = np.zeros((len(columns), n_max))
+    Y = np.zeros((len(columns), n_max))
+    mask = np.zeros((len(columns), n_max), dtype=bool)
+    for i, (x, y) in enumerate(columns):
+        X[i, : len(x)] = x
+        Y[i, : len(y)] = y
+        mask[i, : len(x)] = True
+    return X, Y, mask
+
+
+def fit_many(X, Y, mask=None, names=None) -> BatchFit:
+    """Solve ``y = intercept + slope * x`` for every row of ``X``/``Y``.
+
+    Uses centered sums (``Sxy / Sxx``) so large raw values such as house prices
+    do not lose precision. Datasets with constant ``x`` get a ``nan`` slope.
+    """
+    X = np.asarray(X, dtype=float)
+    Y = np.asarray(Y, dtype=float)
+    if mask is None:
+        mask = np.ones(X.shape, dtype=bool)
+    w = mask.astype(float)
+
+    n = w.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        x_mean = (X * w).sum(axis=1) / n
+        y_mean = (Y * w).sum(axis=1) / n
+        dx = (X - x_mean[:, None]) * w
+        dy = (Y - y_mean[:, None]) * w
+
+        sxx = np.einsum("ij,ij->i", dx, dx)
+        sxy = np.einsum("ij,ij->i", dx, dy)
+        syy = np.einsum("ij,ij->i", dy, dy)
+
+        slope = sxy / sxx
+        intercept = y_mean - slope * x_mean
+
+        residuals = (dy - slope[:, None] * dx) * w
+        sse = np.einsum("ij,ij->i", residuals, residuals)
+        r2 = 1.0 - sse / syy
+        rmse = np.sqrt(sse / n)
+        mae = np.abs(residuals).sum(axis=1) / n
+
+    if names is None:
+        names = [str(i) for i in range(len(n))]
+    return BatchFit(
+        names=list(names),
+        n=n.astype(int),
+        slope=slope,
+        intercept=intercept,
+        r2=r2,
+        rmse=rmse,
+        mae=mae,
+    )
+
+
+def fit_problems(md_path=PROBLEMS_MD) -> BatchFit:
+    """Load every problem listed in ``problems.md`` and fit them all at once."""
+    problems = parse_problems(md_path)
+    X, Y, mask = load_padded(problems)
+    return fit_many(X, Y, mask, names=[p.name for p in problems])
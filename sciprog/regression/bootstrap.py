@@ -0,0 +1,186 @@
+"""Case-resampling bootstrap of OLS coefficients, thousands of refits at once.
+
+``labs/03/lab03a.py`` prints ``sm.OLS(y, X).fit().summary()`` and the
+exercise scripts print point estimates only. ``bootstrap_coefficients``
+refits the model on ``B`` resamples of the rows and reports standard errors
+and confidence intervals from the spread of the refitted coefficients.
+
+No replicate touches the raw rows again: the resample indices of a shard are
+drawn as one ``(b, n)`` integer matrix and turned into per-row counts ``W``,
+so every replicate's Gram matrix and ``Xᵀy`` come out of two matrix products
+(``W @ [x_i x_iᵀ]`` and ``W @ [x_i y_i]``) followed by one batched solve.
+Shards run in worker processes, each with its own ``SeedSequence`` child
+stream; the shard layout depends only on ``B``, so results are the same for
+any ``n_jobs``::
+
+    import pandas as pd
+    from sciprog.regression import bootstrap_coefficients
+
+    data = pd.read_csv("labs/03/marketing.csv")
+    boot = bootstrap_coefficients(data, "Sales", B=10_000, seed=1)
+    boot.to_frame(level=0.95)
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+import numpy as np
+
+
+@dataclass
+class BootstrapResult:
+    names: list
+    estimate: np.ndarray
+    replicates: np.ndarray = field(repr=False)
+    seed: int = 0
+
+    @property
+    def B(self) -> int:
+        return len(self.replicates)
+
+    @property
+    def std_error(self) -> np.ndarray:
+        return self.replicates.std(axis=0, ddof=1)
+
+    def ci(self, level=0.95, method="percentile"):
+        """``(low, high)`` arrays; ``method`` is percentile, basic or normal."""
+        alpha = (1.0 - level) / 2
+        if method == "normal":
+            from scipy.stats import norm
+
+            z = norm.ppf(1.0 - alpha)
+            return (
+                self.estimate - z * self.std_error,
+                self.estimate + z * self.std_error,
+            )
+        low, high = np.quantile(self.replicates, [alpha, 1.0 - alpha], axis=0)
+        if method == "percentile":
+            return low, high
+        if method == "basic":
+            return 2 * self.estimate - high, 2 * self.estimate - low
+        raise ValueError(f"unknown interval method {method!r}")
+
+    def to_frame(self, level=0.95, method="percentile"):
+        import pandas as pd
+
+        low, high = self.ci(level, method)
+        pct = f"{level:.0%}"
+        return pd.DataFrame(
+            {
+                "coef": self.estimate,
+                "std_err": self.std_error,
+                f"ci_low_{pct}": low,
+                f"ci_high_{pct}": high,
+            },
+            index=pd.Index(self.names, name="term"),
+        )
+
+
+def _row_products(A, y):
+    """Per-row ``vec(a aᵀ)`` and ``a y``, so a weighted sum over rows is a Gram."""
+    outer = np.einsum("np,nq->npq", A, A).reshape(len(A), -1)
+    return outer, A * y[:, None]
+
+
+def _solve(G, c):
+    try:
+        return np.linalg.solve(G, c[..., None])[..., 0]
+    except np.linalg.LinAlgError:
+        # A resample with too few distinct rows; take the minimum-norm fit.
+        return (np.linalg.pinv(G) @ c[..., None])[..., 0]
+
+
+def _replicates(A, y, seed_seq, size):
+    """Coefficients of ``size`` resamples drawn from ``seed_seq``."""
+    n, p = A.shape
+    rng = np.random.default_rng(seed_seq)
+    idx = rng.integers(0, n, size=(size, n))
+    offsets = np.arange(size)[:, None] * n
+    counts = np.bincount((idx + offsets).ravel(), minlength=size * n)
+    W = counts.reshape(size, n).astype(float)
+    outer, xy = _row_products(A, y)
+    G = (W @ outer).reshape(size, p, p)
+    return _solve(G, W @ xy)
+
+
+def _shards(B, n, max_cells):
+    size = max(1, min(B, max_cells // max(n, 1)))
+    return [size] * (B // size) + ([B % size] if B % size else [])
+
+
+_SHARED = {}
+
+
+def _init_worker(A, y):
+    _SHARED["A"] = A
+    _SHARED["y"] = y
+
+
+def _run_shard(job):
+    seed_seq, size = job
+    return _replicates(_SHARED["A"], _SHARED["y"], seed_seq, size)
+
+
+def bootstrap_ols(
+    X, y, names=None, B=10_000, seed=0, intercept=True, n_jobs=None, max_cells=1 << 22
+) -> BootstrapResult:
+    """Bootstrap the OLS coefficients of ``y ~ X``.
+
+    Args:
+        X: ``(n, p)`` features (a 1-D array is one feature)
+        names: feature names, ``const`` is prepended with ``intercept``
+        B: number of replicates
+        seed: root of the ``SeedSequence`` the shard streams are spawned from
+        n_jobs: worker processes; ``1`` runs in the calling process, ``None``
+            uses ``os.cpu_count()``
+        max_cells: size of one shard's index matrix (replicates x rows)
+    """
+    X = np.asarray(X, dtype=float)
+    if X.ndim == 1:
+        X = X[:, None]
+    y = np.asarray(y, dtype=float)
+    names = list(names) if names is not None else [f"x{i}" for i in range(X.shape[1])]
+    if intercept:
+        X = np.column_stack([np.ones(len(X)), X])
+        names = ["const"] + names
+    # Solve on unit-scale columns so the Gram matrices stay well conditioned.
+    scale = np.abs(X).max(axis=0)
+    scale[scale == 0] = 1.0
+    A = X / scale
+
+    estimate = np.linalg.lstsq(A, y, rcond=None)[0]
+    sizes = _shards(B, len(A), max_cells)
+    jobs = list(zip(np.random.SeedSequence(seed).spawn(len(sizes)), sizes))
+
+    n_jobs = n_jobs or os.cpu_count() or 1
+    if n_jobs == 1 or len(jobs) < 2:
+        parts = [_replicates(A, y, s, size) for s, size in jobs]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=min(n_jobs, len(jobs)),
+            initializer=_init_worker,
+            initargs=(A, y),
+        ) as pool:
+            parts = list(pool.map(_run_shard, jobs))
+    replicates = np.concatenate(parts) if parts else np.empty((0, len(names)))
+    return BootstrapResult(
+        names=names,
+        estimate=estimate / scale,
+        replicates=replicates / scale,
+        seed=seed,
+    )
+
+
+def bootstrap_coefficients(data, target, features=None, **kwargs) -> BootstrapResult:
+    """``bootstrap_ols`` on DataFrame columns (rows with NaNs dropped)."""
+    if features is None:
+        features = [c for c in data.columns if c != target]
+    features = list(features)
+    clean = data[features + [target]].dropna()
+    return bootstrap_ols(
+        clean[features].to_numpy(dtype=float),
+        clean[target].to_numpy(dtype=float),
+        names=features,
+        **kwargs,
+    )
@@ -0,0 +1,380 @@
+"""Ridge, Lasso and ElasticNet regularization paths with built-in CV.
+
+``students/03/exercise2/nvidovic.py`` imports ``linear_model`` and
+``StandardScaler`` and compares a few hand-picked models; choosing ``alpha``
+that way means one ``GridSearchCV`` refit per (alpha, fold). Here a whole path
+is one call, with the same objective as ``make_pipeline(StandardScaler(),
+Ridge/Lasso/ElasticNet(alpha))`` (features standardized once on all rows):
+
+- Ridge: every alpha comes from one SVD of the centered design,
+  ``coef(a) = V diag(s / (s² + a)) Uᵀy``; the CV folds use one batched
+  eigendecomposition of their training Grams.
+- Lasso/ElasticNet: coordinate descent on the Gram matrix, alphas from
+  largest (all coefficients zero) to smallest, each warm-started from the
+  previous solution. Strong rules drop features that cannot enter at the next
+  alpha, sweeps cycle over the non-zero coefficients only, and a KKT check
+  over all features re-admits any wrongly dropped ones. Once the support
+  and signs look settled, one small solve on the support gives the exact
+  solution, so correlated polynomial terms do not need thousands of passes.
+
+The CV folds and the full-data fit are solved together: training Grams are
+``total - test`` (``selection.fold_grams``), every coordinate update is
+applied to all folds at once, and the test error of each (fold, alpha) is read
+off the test Gram without touching the rows::
+
+    import pandas as pd
+    from sciprog.regression import regularization_path
+
+    data = pd.read_csv("labs/03/marketing.csv")
+    path = regularization_path(data, "Sales", model="lasso", degree=2)
+    path.alpha, path.alpha_1se
+    path.to_frame()                     # coefficients and CV error per alpha
+    path.linear_model()                 # serving.LinearModel at the best alpha
+"""
+
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from .selection import expand_features, fold_grams, kfold_indices
+
+MODELS = {"ridge": 0.0, "lasso": 1.0, "elasticnet": 0.5}
+
+
+@dataclass
+class RegPath:
+    """A fitted path; arrays are aligned with ``alphas`` (largest first)."""
+
+    model: str
+    names: list
+    alphas: np.ndarray
+    coef: np.ndarray  # (n_alphas, n_features), original units
+    intercept: np.ndarray
+    l1_ratio: float = 0.0
+    target: str = ""
+    cv_mse: np.ndarray = field(repr=False, default=None)
+    cv_se: np.ndarray = field(repr=False, default=None)
+    n_sweeps: int = 0
+
+    @property
+    def best_index(self) -> int:
+        if self.cv_mse is None:
+            raise ValueError("path was fitted without cross-validation (k=None)")
+        return int(np.argmin(self.cv_mse))
+
+    @property
+    def alpha(self) -> float:
+        """Alpha with the lowest CV error."""
+        return float(self.alphas[self.best_index])
+
+    @property
+    def alpha_1se(self) -> float:
+        """Largest alpha whose CV error is within one standard error of the best."""
+        i = self.best_index
+        ok = self.cv_mse <= self.cv_mse[i] + self.cv_se[i]
+        return float(self.alphas[np.flatnonzero(ok)[0]])
+
+    def _index(self, alpha):
+        if alpha is None:
+            return self.best_index
+        return int(np.argmin(np.abs(np.log(self.alphas) - np.log(alpha))))
+
+    def predict(self, X, alpha=None):
+        """Predictions at the grid alpha nearest to ``alpha`` (default: best)."""
+        i = self._index(alpha)
+        return np.asarray(X, dtype=float) @ self.coef[i] + self.intercept[i]
+
+    def linear_model(self, alpha=None):
+        from .serving import LinearModel
+
+        i = self._index(alpha)
+        return LinearModel(
+            list(self.names), self.coef[i], float(self.intercept[i]), self.target
+        )
+
+    def to_frame(self):
+        import pandas as pd
+
+        frame = pd.DataFrame(self.coef, columns=self.names)
+        frame.insert(0, "intercept", self.intercept)
+        frame["nonzero"] = (self.coef != 0).sum(axis=1)
+        if self.cv_mse is not None:
+            frame["cv_mse"] = self.cv_mse
+            frame["cv_se"] = self.cv_se
+        frame.index = pd.Index(self.alphas, name="alpha")
+        return frame
+
+
+# ----------------------------------------------------------------------
+# Solvers (standardized features, centered per problem)
+
+
+def _centered(grams):
+    """Centered ``ZᵀZ``, ``Zᵀy``, means and row counts from ``[1 Z y]`` Grams."""
+    n = grams[:, 0, 0]
+    s = grams[:, 0, 1:]
+    mean = s / n[:, None]
+    C = grams[:, 1:, 1:] - s[:, :, None] * mean[:, None, :]
+    return C[:, :-1, :-1], C[:, :-1, -1], mean[:, :-1], mean[:, -1], n
+
+
+def _ridge_svd(Z, y, alphas):
+    """Ridge coefficients of every alpha from one SVD of the centered ``Z``."""
+    U, s, Vt = np.linalg.svd(Z - Z.mean(axis=0), full_matrices=False)
+    Uty = U.T @ (y - y.mean())
+    shrink = s / (s**2 + alphas[:, None])  # (n_alphas, rank)
+    return (shrink * Uty) @ Vt
+
+
+def _ridge_eigh(G, c, alphas):
+    """Ridge coefficients ``(problems, n_alphas, p)`` from Gram eigendecompositions."""
+    lam, V = np.linalg.eigh(G)
+    Vtc = np.einsum("mpk,mp->mk", V, c)
+    scaled = Vtc[:, None, :] / (lam[:, None, :] + alphas[None, :, None])
+    return np.einsum("mpk,mak->map", V, scaled)
+
+
+class _CoordinateDescent:
+    """ElasticNet coordinate descent on several Gram problems in lockstep.
+
+    ``G``/``c`` are per-row (``XᵀX / n``, ``Xᵀy / n``) of centered data, one
+    problem per CV fold plus the full data. The working arrays are
+    feature-major, ``(p, problems)``, so a coordinate update touches
+    contiguous rows; ``grad`` is ``c - G beta`` and is kept current.
+    """
+
+    def __init__(self, G, c):
+        self.G, self.c = G, c
+        self.cross = np.ascontiguousarray(G.transpose(1, 2, 0))  # G[:, :, j].T
+        self.diag = np.ascontiguousarray(np.diagonal(G, axis1=1, axis2=2).T)
+        self.grad = c.T.copy()
+        self.beta = np.zeros(self.grad.shape)
+        self.passes = 0
+
+    def sweep(self, cols, l1, inverse) -> float:
+        """One pass over ``cols``; returns the largest coefficient change."""
+        cross, diag, grad, beta = self.cross, self.diag, self.grad, self.beta
+        largest = 0.0
+        for j in cols:
+            old = beta[j]
+            rho = grad[j] + diag[j] * old
+            new = (np.maximum(rho - l1, 0.0) + np.minimum(rho + l1, 0.0)) * inverse[j]
+            delta = new - old
+            if delta.any():
+                grad -= cross[j] * delta
+                beta[j] = new
+                largest = max(largest, float(np.abs(delta).max()))
+        self.passes += 1
+        return largest
+
+    def polish(self, l1, l2) -> bool:
+        """Jump to the exact solution of the current support and signs.
+
+        On the support ``A`` the optimum solves ``(G_AA + l2 I) b = c_A -
+        l1 sign(b_A)``; the jump is kept for the problems where it keeps
+        the signs and satisfies the KKT conditions, which makes it optimal.
+        Coordinate descent crawls along correlated features (``TV`` and
+        ``TV^2``), so this usually ends the search many passes early.
+        Returns True when every problem is solved.
+        """
+        active = (self.beta != 0).T  # (problems, p)
+        sign = np.sign(self.beta.T)
+        outer = active[:, :, None] & active[:, None, :]
+        eye = np.eye(active.shape[1], dtype=bool)
+        M = np.where(outer, self.G + l2 * eye, eye.astype(float))
+        b = np.linalg.solve(M, ((self.c - l1 * sign) * active)[..., None])[..., 0]
+        grad = self.c - np.einsum("mpq,mq->mp", self.G, b)
+        ok = np.where(active, np.sign(b) == sign, np.abs(grad) <= l1 * (1 + 1e-9))
+        ok = ok.all(axis=1)
+        self.beta[:, ok] = b[ok].T
+        self.grad[:, ok] = grad[ok].T
+        return bool(ok.all())
+
+    def descend(self, cols, l1, l2, tol, max_iter):
+        """Converge on ``cols``, cycling on the active set in between full passes."""
+        # A feature constant in a problem has a zero (up to rounding) column
+        # in its G; its coefficient stays at zero.
+        scale = self.diag + l2
+        inverse = np.divide(1.0, scale, out=np.zeros_like(scale), where=scale > 1e-12)
+        start = self.passes
+        while self.passes - start < max_iter:
+            change = self.sweep(cols, l1, inverse)
+            if self.polish(l1, l2) or _converged(change, self.beta, tol):
+                return
+            active = [j for j in cols if self.beta[j].any()]
+            while self.passes - start < max_iter:
+                change = self.sweep(active, l1, inverse)
+                if _converged(change, self.beta, tol):
+                    break
+                if self.polish(l1, l2):
+                    return
+
+    def path(self, alphas, l1_ratio, tol, max_iter):
+        """Coefficients ``(problems, n_alphas, p)``, each alpha warm-started."""
+        out = np.empty((self.beta.shape[1], len(alphas), self.beta.shape[0]))
+        previous = np.abs(self.c).max() / l1_ratio
+        for a, alpha in enumerate(alphas):
+            l1, l2 = alpha * l1_ratio, alpha * (1 - l1_ratio)
+            # Sequential strong rule: |grad_j| < l1_ratio (2 alpha - previous)
+            # at the previous solution means j stays zero (almost always).
+            keep = (np.abs(self.grad) >= l1_ratio * (2 * alpha - previous)).any(1)
+            keep |= self.beta.any(axis=1)
+            while True:
+                self.descend(np.flatnonzero(keep), l1, l2, tol, max_iter)
+                # KKT: a zero coefficient needs |grad_j| <= l1.
+                violated = ~keep & (np.abs(self.grad) > l1 * (1 + 1e-9)).any(1)
+                if not violated.any():
+                    break
+                keep |= violated
+            out[:, a] = self.beta.T
+            previous = alpha
+        return out
+
+
+def _converged(change, beta, tol) -> bool:
+    return change <= tol * max(float(np.abs(beta).max()), 1e-12)
+
+
+# ----------------------------------------------------------------------
+# Entry points
+
+
+def _alpha_grid(model, Z, y, l1_ratio, n_alphas, eps):
+    if model == "ridge":
+        s = np.linalg.svd(Z - Z.mean(axis=0), compute_uv=False)
+        top = s[0] ** 2 if len(s) else 1.0
+        return top * np.geomspace(10.0, 1e-6, n_alphas)
+    # The smallest alpha at which every coefficient is zero.
+    yc = y - y.mean()
+    top = np.abs((Z - Z.mean(axis=0)).T @ yc).max() / (len(y) * l1_ratio)
+    return np.geomspace(top, top * eps, n_alphas)
+
+
+def fit_path(
+    X,
+    y,
+    model="lasso",
+    l1_ratio=None,
+    alphas=None,
+    n_alphas=100,
+    eps=1e-3,
+    names=None,
+    target="",
+    k=5,
+    repeats=1,
+    seed=42,
+    tol=1e-4,
+    max_iter=10_000,
+) -> RegPath:
+    """Regularization path of ``y ~ X`` with k-fold CV error per alpha.
+
+    The objectives are scikit-learn's on standardized features: Ridge
+    minimizes ``||y - Xb||² + alpha ||b||²``, Lasso/ElasticNet
+    ``||y - Xb||² / 2n + alpha (l1_ratio |b|₁ + (1 - l1_ratio) ||b||² / 2)``.
+
+    Args:
+        X: ``(n, p)`` features (a 1-D array is one feature)
+        model: ``ridge``, ``lasso`` or ``elasticnet``
+        l1_ratio: ElasticNet mixing (default 0.5; 1 for lasso)
+        alphas: explicit grid, sorted largest first; default ``n_alphas``
+            values from the all-zero alpha down by a factor ``eps`` (lasso),
+            or relative to the top squared singular value (ridge)
+        k, repeats: repeated k-fold CV; ``k=None`` skips it
+        tol: coordinate descent stops when no coefficient moves by more
+            than ``tol`` times the largest one. The exact active-set solve
+            usually ends it sooner and then the coefficients are
+            scikit-learn's to rounding; when it does not, they are only as
+            close as ``tol`` allows (ill-conditioned designs, small alphas)
+        max_iter: coordinate-descent passes per alpha
+    """
+    if model not in MODELS:
+        raise ValueError(f"model must be one of {', '.join(MODELS)}, not {model!r}")
+    l1_ratio = MODELS[model] if l1_ratio is None or model != "elasticnet" else l1_ratio
+    if model == "elasticnet" and not 0 < l1_ratio <= 1:
+        raise ValueError("l1_ratio must be in (0, 1]; use model='ridge' for 0")
+    X = np.asarray(X, dtype=float)
+    if X.ndim == 1:
+        X = X[:, None]
+    y = np.asarray(y, dtype=float)
+    names = list(names) if names is not None else [f"x{i}" for i in range(X.shape[1])]
+
+    mean, std = X.mean(axis=0), X.std(axis=0)
+    # Exactly zero for constant columns: their mean can be off by rounding.
+    constant = np.ptp(X, axis=0) == 0
+    std = np.where(constant, 1.0, std)
+    Z = np.where(constant, 0.0, (X - mean) / std)
+    if alphas is None:
+        alphas = _alpha_grid(model, Z, y, l1_ratio, n_alphas, eps)
+    alphas = np.sort(np.asarray(alphas, dtype=float))[::-1]
+
+    A = np.column_stack([np.ones(len(y)), Z, y])
+    total = A.T @ A
+    folds = list(kfold_indices(len(y), k, repeats, seed)) if k else []
+    if folds:
+        train, test = fold_grams(Z, y, folds)
+    else:
+        train = test = np.empty((0,) + total.shape)
+    grams = np.concatenate([train, total[None]])  # the last problem is all rows
+    G, c, zbar, ybar, n = _centered(grams)
+
+    passes = 0
+    if model == "ridge":
+        beta = _ridge_eigh(G[:-1], c[:-1], alphas)
+        full = _ridge_svd(Z, y, alphas)
+    else:
+        # Per-row Grams put every fold on the same alpha scale.
+        G, c = G / n[:, None, None], c / n[:, None]
+        solver = _CoordinateDescent(G, c)
+        beta = solver.path(alphas, l1_ratio, tol, max_iter)
+        passes = solver.passes
+        full, beta = beta[-1], beta[:-1]
+
+    cv_mse = cv_se = None
+    if folds:
+        # sse = wᵀ H w with w = [b0, b, -1] and H the test Gram of [1 Z y].
+        b0 = ybar[:-1, None] - np.einsum("fap,fp->fa", beta, zbar[:-1])
+        w = np.concatenate([b0[..., None], beta, -np.ones(b0.shape + (1,))], axis=-1)
+        sse = np.einsum("fai,fij,faj->fa", w, test, w)
+        mse = np.maximum(sse, 0.0) / test[:, 0, 0][:, None]
+        cv_mse = mse.mean(axis=0)
+        cv_se = mse.std(axis=0, ddof=min(1, len(folds) - 1)) / np.sqrt(len(folds))
+
+    coef = full / std
+    intercept = ybar[-1] - coef @ mean
+    return RegPath(
+        model=model,
+        names=names,
+        alphas=alphas,
+        coef=coef,
+        intercept=intercept,
+        l1_ratio=l1_ratio,
+        target=target,
+        cv_mse=cv_mse,
+        cv_se=cv_se,
+        n_sweeps=passes,
+    )
+
+
+def regularization_path(
+    data, target, features=None, model="lasso", degree=1, **kwargs
+) -> RegPath:
+    """``fit_path`` on DataFrame columns (rows with NaNs dropped).
+
+    ``degree`` > 1 adds every polynomial and interaction term of the features
+    (``selection.expand_features``), as ``PolynomialFeatures`` would.
+    """
+    if features is None:
+        features = [c for c in data.columns if c != target]
+    features = list(features)
+    clean = data[features + [target]].dropna()
+    X, names, _ = expand_features(
+        clean[features].to_numpy(dtype=float), features, degree
+    )
+    return fit_path(
+        X,
+        clean[target].to_numpy(dtype=float),
+        model=model,
+        names=names,
+        target=target,
+        **kwargs,
+    )
@@ -0,0 +1,252 @@
+"""Cross-validated comparison of every feature subset on one dataset.
+
+``compare_models`` replaces the "full model vs. TV only on one 80/20 split"
+comparison in ``labs/03/lab03b.py``. It builds one design matrix holding every
+base feature and its polynomial terms (the ``PolynomialFeatures`` columns used
+in ``students/03/exercise2/mjovanovic.py``), then computes the Gram matrix
+``[1 Z y]ᵀ[1 Z y]`` once per fold. Training Grams are ``total - test``, so each
+candidate model is just a small solve on a sub-block of shared matrices
+instead of a refit on the raw rows.
+
+Example::
+
+    import pandas as pd
+    from sciprog.regression import compare_models
+
+    data = pd.read_csv("labs/03/marketing.csv")
+    board = compare_models(data, "Sales", degrees=(1, 2), k=5, repeats=3)
+    board.to_frame().head(10)
+"""
+
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+import numpy as np
+
+
+@dataclass
+class Candidate:
+    features: tuple
+    degree: int
+    columns: tuple
+
+    @property
+    def name(self) -> str:
+        label = " + ".join(self.features)
+        return label if self.degree == 1 else f"poly{self.degree}({label})"
+
+
+@dataclass
+class CVScore:
+    candidate: Candidate
+    rmse: float
+    rmse_std: float
+    r2: float
+    r2_std: float
+    n_params: int
+
+
+@dataclass
+class Leaderboard:
+    scores: list = field(default_factory=list)
+    k: int = 5
+    repeats: int = 1
+
+    def __iter__(self):
+        return iter(self.scores)
+
+    def __len__(self):
+        return len(self.scores)
+
+    def __getitem__(self, i):
+        return self.scores[i]
+
+    @property
+    def best(self) -> CVScore:
+        return self.scores[0]
+
+    def to_frame(self):
+        import pandas as pd
+
+        return pd.DataFrame(
+            [
+                {
+                    "model": s.candidate.name,
+                    "degree": s.candidate.degree,
+                    "n_params": s.n_params,
+                    "cv_rmse": s.rmse,
+                    "cv_rmse_std": s.rmse_std,
+                    "cv_r2": s.r2,
+                    "cv_r2_std": s.r2_std,
+                }
+                for s in self.scores
+            ],
+            index=pd.RangeIndex(1, len(self.scores) + 1, name="rank"),
+        )
+
+
+def _monomials(n_features, degree):
+    """Index tuples of every monomial of total degree 1..degree."""
+    terms = []
+    for d in range(1, degree + 1):
+        terms.extend(itertools.combinations_with_replacement(range(n_features), d))
+    return terms
+
+
+def _term_name(term, names):
+    parts = []
+    for i in sorted(set(term)):
+        power = term.count(i)
+        parts.append(names[i] if power == 1 else f"{names[i]}^{power}")
+    return "*".join(parts)
+
+
+def expand_features(X, names, degree):
+    """Return ``(Z, column_names, terms)`` with all monomials up to ``degree``."""
+    X = np.asarray(X, dtype=float)
+    terms = _monomials(X.shape[1], degree)
+    Z = np.empty((len(X), len(terms)))
+    for j, term in enumerate(terms):
+        Z[:, j] = np.prod(X[:, list(term)], axis=1)
+    return Z, [_term_name(t, names) for t in terms], terms
+
+
+def enumerate_candidates(names, degrees=(1,), max_features=None):
+    """Every non-empty feature subset crossed with every polynomial degree."""
+    max_degree = max(degrees)
+    terms = _monomials(len(names), max_degree)
+    index = {t: j for j, t in enumerate(terms)}
+    max_features = max_features or len(names)
+    candidates = []
+    for size in range(1, max_features + 1):
+        for subset in itertools.combinations(range(len(names)), size):
+            for degree in sorted(degrees):
+                columns = []
+                for d in range(1, degree + 1):
+                    for combo in itertools.combinations_with_replacement(subset, d):
+                        columns.append(index[combo])
+                candidates.append(
+                    Candidate(
+                        features=tuple(names[i] for i in subset),
+                        degree=degree,
+                        columns=tuple(columns),
+                    )
+                )
+    return candidates
+
+
+def kfold_indices(n, k=5, repeats=1, seed=42):
+    """Yield ``test`` index arrays for ``repeats`` shuffled k-fold splits."""
+    rng = np.random.default_rng(seed)
+    for _ in range(repeats):
+        order = rng.permutation(n)
+        yield from np.array_split(order, k)
+
+
+def _gram(A):
+    return A.T @ A
+
+
+def fold_grams(Z, y, folds):
+    """Train and test Gram matrices of ``[1 Z y]`` for every fold.
+
+    Returns two arrays of shape ``(n_folds, p + 2, p + 2)``.
+    """
+    A = np.column_stack([np.ones(len(Z)), Z, y])
+    total = _gram(A)
+    test = np.stack([_gram(A[idx]) for idx in folds])
+    return total[None, :, :] - test, test
+
+
+def _score_candidate(columns, train, test):
+    """CV RMSE and R² per fold for one column subset, from Grams alone."""
+    cols = np.r_[0, np.asarray(columns) + 1]
+    yi = train.shape[1] - 1
+    rmse = np.empty(len(train))
+    r2 = np.empty(len(train))
+    for f in range(len(train)):
+        G, H = train[f], test[f]
+        beta = np.linalg.lstsq(G[np.ix_(cols, cols)], G[cols, yi], rcond=None)[0]
+        n_test = H[0, 0]
+        # ||y - Xb||² = yᵀy - 2bᵀXᵀy + bᵀXᵀXb, all read off the test Gram.
+        sse = H[yi, yi] - 2.0 * beta @ H[cols, yi] + beta @ H[np.ix_(cols, cols)] @ beta
+        sst = H[yi, yi] - H[0, yi] ** 2 / n_test
+        rmse[f] = np.sqrt(max(sse, 0.0) / n_test)
+        r2[f] = 1.0 - sse / sst
+    return rmse, r2
+
+
+_SHARED = {}
+
+
+def _init_worker(train, test):
+    _SHARED["train"] = train
+    _SHARED["test"] = test
+
+
+def _score_chunk(chunk):
+    return [_score_candidate(c, _SHARED["train"], _SHARED["test"]) for c in chunk]
+
+
+def compare_models(
+    data,
+    target,
+    features=None,
+    degrees=(1,),
+    k=5,
+    repeats=1,
+    seed=42,
+    max_features=None,
+    n_jobs=None,
+):
+    """Rank every feature subset (and polynomial variant) by repeated k-fold CV.
+
+    ``n_jobs`` worker processes share the per-fold Gram matrices; ``n_jobs=1``
+    runs in the calling process, ``None`` uses ``os.cpu_count()``.
+    """
+    if features is None:
+        features = [c for c in data.columns if c != target]
+    features = list(features)
+    clean = data[features + [target]].dropna()
+    X = clean[features].to_numpy(dtype=float)
+    y = clean[target].to_numpy(dtype=float)
+
+    Z, _, _ = expand_features(X, features, max(degrees))
+    # Scaling columns does not change predictions, but keeps the Gram matrices
+    # well conditioned once squared terms are added.
+    std = Z.std(axis=0)
+    Z = (Z - Z.mean(axis=0)) / np.where(std > 0, std, 1.0)
+
+    folds = list(kfold_indices(len(y), k=k, repeats=repeats, seed=seed))
+    train, test = fold_grams(Z, y, folds)
+    candidates = enumerate_candidates(features, degrees, max_features)
+    columns = [c.columns for c in candidates]
+
+    n_jobs = n_jobs or os.cpu_count() or 1
+    if n_jobs == 1 or len(candidates) < 2 * n_jobs:
+        results = [_score_candidate(c, train, test) for c in columns]
+    else:
+        chunks = [columns[i::n_jobs] for i in range(n_jobs)]
+        with ProcessPoolExecutor(
+            max_workers=n_jobs, initializer=_init_worker, initargs=(train, test)
+        ) as pool:
+            parts = list(pool.map(_score_chunk, chunks))
+        results = [None] * len(columns)
+        for i, part in enumerate(parts):
+            results[i::n_jobs] = part
+
+    scores = [
+        CVScore(
+            candidate=c,
+            rmse=float(rmse.mean()),
+            rmse_std=float(rmse.std()),
+            r2=float(r2.mean()),
+            r2_std=float(r2.std()),
+            n_params=len(c.columns) + 1,
+        )
+        for c, (rmse, r2) in zip(candidates, results)
+    ]
+    scores.sort(key=lambda s: (s.rmse, s.n_params))
+    return Leaderboard(scores=scores, k=k, repeats=repeats)
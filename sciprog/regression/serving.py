@@ -0,0 +1,480 @@
+"""Compact linear-model artifacts and a micro-batching prediction endpoint.
+
+``predict_sales`` in ``students/03/exercise2/sjadrijev.py`` builds a one-row
+``DataFrame`` and calls ``model.predict`` for every query, and keeps the model
+with ``joblib.dump``. ``LinearModel`` is the fitted model as data: the feature
+schema (names, order, training range) and the coefficient vector, saved as a
+small JSON file with no pickled estimator. Scoring a batch is one matmul and
+a single row is a plain dot product::
+
+    from sciprog.regression.serving import LinearModel
+
+    model = LinearModel.fit(pd.read_csv("labs/03/marketing.csv"), "Sales")
+    model.save("data/temp/sales.json")
+
+    model = LinearModel.load("data/temp/sales.json")
+    model.predict_one(120.0, 25.0, 10.0)
+    model.predict(np.array([[120.0, 25.0, 10.0], [44.5, 39.3, 45.1]]))
+
+``PredictionServer`` serves a model over HTTP (stdlib, no dependencies) and
+``asgi_app`` gives the same endpoints to any ASGI server (``uvicorn``).
+Both queue incoming rows in a ``MicroBatcher``, which scores whatever arrived
+within ``max_wait`` seconds in one matmul::
+
+    python -m sciprog.regression.serving data/temp/sales.json --port 8000
+    curl -d '{"rows": [{"TV": 120, "Radio": 25, "Newspaper": 10}]}' \\
+        localhost:8000/predict
+"""
+
+import argparse
+import asyncio
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeout
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from operator import mul
+from pathlib import Path
+
+import numpy as np
+
+FORMAT = "sciprog.linear/1"
+
+
+@dataclass
+class LinearModel:
+    features: list
+    coef: np.ndarray
+    intercept: float = 0.0
+    target: str = ""
+    ranges: dict = field(default_factory=dict)  # feature -> (min, max) in training
+
+    def __post_init__(self):
+        self.coef = np.asarray(self.coef, dtype=float)
+        if self.coef.shape != (len(self.features),):
+            raise ValueError(
+                f"{len(self.features)} features but coef has shape {self.coef.shape}"
+            )
+        self._coef_list = self.coef.tolist()
+
+    # ------------------------------------------------------------------
+    # Building and persistence
+
+    @classmethod
+    def fit(cls, data, target, features=None) -> "LinearModel":
+        """Ordinary least squares on DataFrame columns (rows with NaNs dropped)."""
+        if features is None:
+            features = [c for c in data.columns if c != target]
+        features = list(features)
+        clean = data[features + [target]].dropna()
+        X = clean[features].to_numpy(dtype=float)
+        A = np.column_stack([np.ones(len(X)), X])
+        beta = np.linalg.lstsq(A, clean[target].to_numpy(dtype=float), rcond=None)[0]
+        ranges = {
+            f: (float(X[:, j].min()), float(X[:, j].max()))
+            for j, f in enumerate(features)
+        }
+        return cls(features, beta[1:], float(beta[0]), target, ranges)
+
+    @classmethod
+    def from_estimator(cls, estimator, features=None, target="") -> "LinearModel":
+        """Copy ``coef_``/``intercept_`` out of a fitted scikit-learn model."""
+        if features is None:
+            features = list(getattr(estimator, "feature_names_in_", []))
+        coef = np.ravel(estimator.coef_)
+        if not features:
+            features = [f"x{i}" for i in range(len(coef))]
+        return cls(
+            list(features), coef, float(np.ravel(estimator.intercept_)[0]), target
+        )
+
+    def to_dict(self) -> dict:
+        features = []
+        for name, c in zip(self.features, self._coef_list):
+            entry = {"name": name, "coef": c}
+            if name in self.ranges:
+                entry["min"], entry["max"] = self.ranges[name]
+            features.append(entry)
+        return {
+            "format": FORMAT,
+            "target": self.target,
+            "intercept": self.intercept,
+            "features": features,
+        }
+
+    @classmethod
+    def from_dict(cls, data) -> "LinearModel":
+        if data.get("format") != FORMAT:
+            raise ValueError(f"not a {FORMAT} artifact: {data.get('format')!r}")
+        features = data["features"]
+        return cls(
+            [f["name"] for f in features],
+            [f["coef"] for f in features],
+            data["intercept"],
+            data.get("target", ""),
+            {f["name"]: (f["min"], f["max"]) for f in features if "min" in f},
+        )
+
+    def save(self, path) -> Path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=1), encoding="utf-8")
+        return path
+
+    @classmethod
+    def load(cls, path) -> "LinearModel":
+        return cls.from_dict(json.loads(Path(path).read_text(encoding="utf-8")))
+
+    # ------------------------------------------------------------------
+    # Scoring
+
+    def predict(self, X) -> np.ndarray:
+        """Score an ``(n, n_features)`` array whose columns follow ``features``."""
+        X = np.asarray(X, dtype=float)
+        if X.ndim == 1:
+            X = X[None, :]
+        if X.shape[1] != len(self.features):
+            raise ValueError(
+                f"expected {len(self.features)} columns ({', '.join(self.features)}),"
+                f" got {X.shape[1]}"
+            )
+        return X @ self.coef + self.intercept
+
+    def predict_one(self, *values) -> float:
+        """One row given positionally; no array is built."""
+        if len(values) != len(self._coef_list):
+            raise ValueError(f"expected {len(self._coef_list)} values")
+        return self.intercept + sum(map(mul, self._coef_list, values))
+
+    def rows(self, records) -> np.ndarray:
+        """``(n, n_features)`` array from dicts keyed by feature name."""
+        try:
+            return np.array(
+                [[float(r[f]) for f in self.features] for r in records], dtype=float
+            ).reshape(-1, len(self.features))
+        except KeyError as e:
+            raise ValueError(f"missing feature {e.args[0]!r}") from None
+
+    def out_of_range(self, X) -> np.ndarray:
+        """Boolean mask of rows with a value outside the training range."""
+        X = np.asarray(X, dtype=float)
+        lo = np.array([self.ranges.get(f, (-np.inf, np.inf))[0] for f in self.features])
+        hi = np.array([self.ranges.get(f, (-np.inf, np.inf))[1] for f in self.features])
+        return ((X < lo) | (X > hi)).any(axis=1)
+
+
+class MicroBatcher:
+    """Collect rows from many callers and score them together.
+
+    A background thread waits for the first pending request, keeps taking
+    more for up to ``max_wait`` seconds or ``max_batch`` rows, and answers
+    all of them from one ``model.predict`` call. If that call fails, each
+    request is scored on its own so one bad request only fails itself.
+    """
+
+    def __init__(self, model, max_batch=1024, max_wait=0.002):
+        """
+        Args:
+            model: anything with ``predict(X) -> array`` (a ``LinearModel``)
+            max_batch: rows per matmul at most
+            max_wait: seconds to wait for more rows once one has arrived
+        """
+        self.model = model
+        features = getattr(model, "features", None)
+        self.width = None if features is None else len(features)
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.batches = 0
+        self.rows = 0
+        self._queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def submit(self, X) -> Future:
+        """Queue an ``(n, n_features)`` array; the future yields ``(n,)``.
+
+        Raises ``ValueError`` for anything else, before it is queued.
+        """
+        if self._closed:
+            raise RuntimeError("batcher is closed")
+        X = np.asarray(X, dtype=float)
+        if X.ndim == 1:
+            X = X[None, :]
+        if X.ndim != 2 or (self.width is not None and X.shape[1] != self.width):
+            raise ValueError(
+                f"expected rows of {self.width} values, got an array of shape"
+                f" {X.shape}"
+            )
+        future = Future()
+        self._queue.put((X, future))
+        return future
+
+    def predict(self, X, timeout=None) -> np.ndarray:
+        """``submit`` and wait; a request still queued after ``timeout``
+        seconds is withdrawn and ``TimeoutError`` raised."""
+        future = self.submit(X)
+        try:
+            return future.result(timeout)
+        except FutureTimeout:
+            future.cancel()
+            raise
+
+    def _take(self):
+        item = self._queue.get()
+        if item is None:
+            return None
+        batch, size = [item], len(item[0])
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._queue.get(timeout=max(0.0, remaining))
+            except queue.Empty:
+                break
+            if item is None:
+                self._queue.put(None)  # stop after answering this batch
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch
+
+    def _predict(self, X):
+        y = np.asarray(self.model.predict(X), dtype=float)
+        if y.shape != (len(X),):
+            raise ValueError(f"model returned shape {y.shape} for {len(X)} rows")
+        self.batches += 1
+        self.rows += len(X)
+        return y
+
+    def _loop(self):
+        while True:
+            batch = self._take()
+            if batch is None:
+                return
+            # Callers that timed out have cancelled their futures.
+            batch = [item for item in batch if item[1].set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            try:
+                y = self._predict(np.concatenate([rows for rows, _ in batch]))
+            except Exception as e:
+                if len(batch) == 1:
+                    batch[0][1].set_exception(e)
+                    continue
+                for rows, future in batch:
+                    try:
+                        future.set_result(self._predict(rows))
+                    except Exception as e:
+                        future.set_exception(e)
+                continue
+            start = 0
+            for rows, future in batch:
+                future.set_result(y[start : start + len(rows)])
+                start += len(rows)
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._thread.join()
+
+
+# ----------------------------------------------------------------------
+# Endpoints
+
+
+def handle(batcher, method, path, body):
+    """Shared request logic: ``(status, json_body)``.
+
+    ``POST /predict`` takes ``{"rows": [{feature: value}, ...]}``,
+    ``{"instances": [[...], ...]}`` (columns in schema order) or one row
+    object, and answers ``{"predictions": [...]}``; a prediction that is not
+    finite (an overflowing input) comes back as ``null``. ``GET /schema``
+    returns the artifact, ``GET /health`` the batching counters.
+    """
+    model = batcher.model
+    if method == "GET" and path == "/schema":
+        return 200, model.to_dict()
+    if method == "GET" and path == "/health":
+        return 200, {"status": "ok", "batches": batcher.batches, "rows": batcher.rows}
+    if path != "/predict":
+        return 404, {"error": f"no route {method} {path}"}
+    if method != "POST":
+        return 405, {"error": "use POST"}
+    try:
+        data = json.loads(body or b"{}")
+        if "instances" in data:
+            X = np.asarray(data["instances"], dtype=float)
+        else:
+            X = model.rows(data["rows"] if "rows" in data else [data])
+        if not np.isfinite(X).all():
+            raise ValueError("inputs must be finite numbers")
+        predictions = batcher.predict(X, timeout=30.0)
+    except (ValueError, TypeError) as e:
+        return 400, {"error": str(e)}
+    except FutureTimeout:
+        return 503, {"error": "prediction timed out"}
+    except RuntimeError as e:
+        return 503, {"error": str(e)}
+    # JSON has no NaN/Infinity; json.dumps would write invalid tokens.
+    values = [v if np.isfinite(v) else None for v in predictions.tolist()]
+    return 200, {"predictions": values}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "SciprogPredict/1.0"
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _dispatch(self, method):
+        length = int(self.headers.get("content-length") or 0)
+        body = self.rfile.read(length) if length else b""
+        status, payload = handle(self.server.batcher, method, self.path, body)
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+
+class PredictionServer:
+    """Threaded HTTP server around a ``MicroBatcher``.
+
+    Args:
+        model: ``LinearModel`` (or a path to its JSON artifact)
+        max_batch, max_wait: ``MicroBatcher`` settings
+        host, port: bind address, port 0 picks a free one
+    """
+
+    def __init__(
+        self, model, max_batch=1024, max_wait=0.002, host="127.0.0.1", port=8000
+    ):
+        if not isinstance(model, LinearModel):
+            model = LinearModel.load(model)
+        self.batcher = MicroBatcher(model, max_batch, max_wait)
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.batcher = self.batcher
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._server.serve_forever, daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def serve_forever(self):
+        self._server.serve_forever()
+
+    def stop(self):
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+        self.batcher.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def asgi_app(model, max_batch=1024, max_wait=0.002):
+    """ASGI application with the same endpoints, e.g. ``uvicorn`` factory."""
+    if not isinstance(model, LinearModel):
+        model = LinearModel.load(model)
+    batcher = MicroBatcher(model, max_batch, max_wait)
+
+    async def app(scope, receive, send):
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    batcher.close()
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body"):
+                break
+        method, path = scope["method"], scope["path"]
+        if method == "POST" and path == "/predict":
+            # Scoring blocks on the batcher; keep the event loop free.
+            loop = asyncio.get_running_loop()
+            status, payload = await loop.run_in_executor(
+                None, handle, batcher, method, path, body
+            )
+        else:
+            status, payload = handle(batcher, method, path, body)
+        data = json.dumps(payload).encode("utf-8")
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(data)).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": data})
+
+    app.batcher = batcher
+    return app
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a LinearModel artifact.")
+    parser.add_argument("model", help="JSON artifact written by LinearModel.save")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--max-batch", type=int, default=1024)
+    parser.add_argument("--max-wait", type=float, default=0.002)
+    args = parser.parse_args(argv)
+    server = PredictionServer(
+        args.model, args.max_batch, args.max_wait, args.host, args.port
+    )
+    print(f"serving {args.model} on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
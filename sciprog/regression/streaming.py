@@ -0,0 +1,163 @@
+"""Constant-memory least squares for CSV files that do not fit in RAM.
+
+``StreamingOLS`` keeps only the running means and the centered co-moment
+matrices (Welford/Chan updates), so memory is ``O(p²)`` no matter how many rows
+are read. Two accumulators fitted on different chunks or files can be merged,
+and the result matches ``sklearn.linear_model.LinearRegression`` on the full
+data.
+
+Drop-in marimo cell replacing ``pd.read_csv`` + ``LinearRegression().fit``::
+
+    @app.cell
+    def _():
+        from sciprog.regression import StreamingOLS
+
+        regr = StreamingOLS.from_csv(
+            "marketing.csv", ["TV", "Radio", "Newspaper"], "Sales"
+        )
+        return (regr,)
+"""
+
+import numpy as np
+
+
+class StreamingOLS:
+    """Incremental ordinary least squares with an intercept."""
+
+    def __init__(self, feature_names=None):
+        self.feature_names_in_ = None if feature_names is None else list(feature_names)
+        self.n_samples_seen_ = 0
+        self._mean_x = None
+        self._mean_y = 0.0
+        self._cxx = None
+        self._cxy = None
+        self._cyy = 0.0
+
+    @property
+    def n_features_in_(self):
+        return None if self._mean_x is None else len(self._mean_x)
+
+    def _init(self, p):
+        self._mean_x = np.zeros(p)
+        self._cxx = np.zeros((p, p))
+        self._cxy = np.zeros(p)
+
+    def _combine(self, n_b, mean_x_b, mean_y_b, cxx_b, cxy_b, cyy_b):
+        if self._mean_x is None:
+            self._init(len(mean_x_b))
+        n_a = self.n_samples_seen_
+        n = n_a + n_b
+        if n_b == 0:
+            return self
+        dx = mean_x_b - self._mean_x
+        dy = mean_y_b - self._mean_y
+        f = n_a * n_b / n
+        self._cxx += cxx_b + f * np.outer(dx, dx)
+        self._cxy += cxy_b + f * dx * dy
+        self._cyy += cyy_b + f * dy * dy
+        self._mean_x += dx * (n_b / n)
+        self._mean_y += dy * (n_b / n)
+        self.n_samples_seen_ = n
+        return self
+
+    def partial_fit(self, X, y):
+        """Fold one chunk of rows into the running sums."""
+        if hasattr(X, "columns") and self.feature_names_in_ is None:
+            self.feature_names_in_ = [str(c) for c in X.columns]
+        X = np.asarray(X, dtype=float)
+        if X.ndim == 1:
+            X = X[:, None]
+        y = np.asarray(y, dtype=float).ravel()
+        if len(X) != len(y):
+            raise ValueError(f"X has {len(X)} rows but y has {len(y)}")
+        if self._mean_x is not None and X.shape[1] != len(self._mean_x):
+            raise ValueError(
+                f"X has {X.shape[1]} features, expected {len(self._mean_x)}"
+            )
+        if len(y) == 0:
+            return self
+        mean_x = X.mean(axis=0)
+        mean_y = y.mean()
+        dx = X - mean_x
+        dy = y - mean_y
+        return self._combine(len(y), mean_x, mean_y, dx.T @ dx, dx.T @ dy, dy @ dy)
+
+    def merge(self, other):
+        """Add the rows seen by ``other`` to this accumulator (in place)."""
+        if other._mean_x is None:
+            return self
+        return self._combine(
+            other.n_samples_seen_,
+            other._mean_x,
+            other._mean_y,
+            other._cxx,
+            other._cxy,
+            other._cyy,
+        )
+
+    def __add__(self, other):
+        merged = StreamingOLS(self.feature_names_in_)
+        merged.merge(self)
+        return merged.merge(other)
+
+    # ------------------------------------------------------------------
+    # Fitted values, sklearn-style
+
+    def _check_fitted(self):
+        if self.n_samples_seen_ == 0:
+            raise ValueError("StreamingOLS has not seen any data yet")
+
+    @property
+    def coef_(self):
+        self._check_fitted()
+        # lstsq gives the minimum-norm solution for collinear columns, same as
+        # sklearn does.
+        return np.linalg.lstsq(self._cxx, self._cxy, rcond=None)[0]
+
+    @property
+    def intercept_(self):
+        return self._mean_y - self._mean_x @ self.coef_
+
+    @property
+    def r2_(self):
+        """Training R² computed from the accumulated sums."""
+        sse = self._cyy - self._cxy @ self.coef_
+        return 1.0 - sse / self._cyy
+
+    @property
+    def rmse_(self):
+        sse = self._cyy - self._cxy @ self.coef_
+        return float(np.sqrt(max(sse, 0.0) / self.n_samples_seen_))
+
+    def predict(self, X):
+        if hasattr(X, "columns"):
+            X = X.to_numpy(dtype=float)
+        X = np.asarray(X, dtype=float)
+        if X.ndim == 1:
+            X = X[:, None]
+        return X @ self.coef_ + self.intercept_
+
+    # ------------------------------------------------------------------
+    # CSV helpers
+
+    @classmethod
+    def from_csv(cls, path, features, target, chunksize=100_000, **read_csv_kwargs):
+        """Fit on ``path`` reading ``chunksize`` rows at a time.
+
+        Rows with missing values in the used columns are dropped, like the lab
+        notebooks do with ``dropna()``.
+        """
+        import pandas as pd
+
+        features = list(features)
+        model = cls(features)
+        reader = pd.read_csv(
+            path,
+            usecols=features + [target],
+            chunksize=chunksize,
+            **read_csv_kwargs,
+        )
+        for chunk in reader:
+            chunk = chunk.dropna()
+            model.partial_fit(chunk[features], chunk[target])
+        return model
@@ -0,0 +1,261 @@
+"""Polynomial degree sweep with bias/variance curves, from one QR per fold.
+
+``students/03/exercise2/mjovanovic.py`` builds ``PolynomialFeatures`` and
+refits from scratch for every degree it tries. Here the design matrix is
+built once for the highest degree: a scaled Vandermonde matrix, or every
+monomial up to that degree for several features (``expand_features``), with
+columns ordered by degree so the design of any lower degree is a leading
+column block. If ``V = QR``, the first ``p`` columns of ``Q`` and the leading
+``p x p`` block of ``R`` are the QR factors of ``V[:, :p]``, so a single
+(batched) QR per training fold gives the fit of every degree with one small
+triangular solve each.
+
+Repeated k-fold CV yields an out-of-fold prediction per point and repeat;
+the CV error of each degree splits exactly into ``bias2`` (squared error of
+the mean prediction, including noise) and ``variance`` (spread of the
+predictions across repeats)::
+
+    from sciprog.regression import sweep_problems
+
+    report = sweep_problems(degrees=range(1, 11))
+    report.best()                       # best degree per dataset
+    report.to_frame().loc["12_stopping_distance"]
+"""
+
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from .batch import PROBLEMS_MD, load_padded, parse_problems
+from .selection import expand_features, kfold_indices
+
+
+@dataclass
+class DegreeSweep:
+    """Per-degree results for one dataset; arrays are aligned with ``degrees``."""
+
+    name: str
+    n: int
+    degrees: np.ndarray
+    train_mse: np.ndarray
+    cv_mse: np.ndarray
+    bias2: np.ndarray
+    variance: np.ndarray
+    coef: list = field(repr=False, default_factory=list)
+    center: np.ndarray = field(repr=False, default=None)
+    scale: np.ndarray = field(repr=False, default=None)
+
+    @property
+    def best_degree(self) -> int:
+        return int(self.degrees[np.nanargmin(self.cv_mse)])
+
+    def predict(self, X, degree=None):
+        """Predictions of the full-data fit of ``degree`` (default: best)."""
+        degree = self.best_degree if degree is None else degree
+        i = int(np.flatnonzero(self.degrees == degree)[0])
+        coef = self.coef[i]
+        V = _design(_as_2d(X), self.center, self.scale, int(self.degrees.max()))
+        return V[:, : len(coef)] @ coef
+
+    def to_frame(self):
+        import pandas as pd
+
+        return pd.DataFrame(
+            {
+                "train_mse": self.train_mse,
+                "cv_mse": self.cv_mse,
+                "bias2": self.bias2,
+                "variance": self.variance,
+            },
+            index=pd.Index(self.degrees, name="degree"),
+        )
+
+
+@dataclass
+class SweepReport:
+    sweeps: list = field(default_factory=list)
+    k: int = 5
+    repeats: int = 10
+
+    def __iter__(self):
+        return iter(self.sweeps)
+
+    def __len__(self):
+        return len(self.sweeps)
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return next(s for s in self.sweeps if s.name == key)
+        return self.sweeps[key]
+
+    def to_frame(self):
+        """Long table indexed by ``(dataset, degree)``."""
+        import pandas as pd
+
+        return pd.concat({s.name: s.to_frame() for s in self.sweeps}, names=["dataset"])
+
+    def best(self):
+        import pandas as pd
+
+        rows = []
+        for s in self.sweeps:
+            i = int(np.nanargmin(s.cv_mse))
+            rows.append(
+                {
+                    "dataset": s.name,
+                    "n": s.n,
+                    "best_degree": int(s.degrees[i]),
+                    "cv_mse": s.cv_mse[i],
+                    "linear_cv_mse": (
+                        s.cv_mse[s.degrees == 1][0]
+                        if (s.degrees == 1).any()
+                        else np.nan
+                    ),
+                    "bias2": s.bias2[i],
+                    "variance": s.variance[i],
+                }
+            )
+        return pd.DataFrame(rows).set_index("dataset")
+
+
+def _as_2d(X):
+    X = np.asarray(X, dtype=float)
+    return X[:, None] if X.ndim == 1 else X
+
+
+def _design(X, center, scale, degree):
+    """``[1, monomials of (X - center) / scale up to degree]``, degree-ordered."""
+    names = [str(i) for i in range(X.shape[1])]
+    Z, _, _ = expand_features((X - center) / scale, names, degree)
+    return np.column_stack([np.ones(len(X)), Z])
+
+
+def _block_sizes(n_features, degrees):
+    """Columns (intercept included) of the design of each degree."""
+    from math import comb
+
+    return np.array([comb(n_features + d, d) for d in degrees])
+
+
+def _full_rank(R, p, rtol=1e-10):
+    """Which of the stacked ``R`` factors have a non-singular leading p x p block."""
+    diag = np.abs(np.diagonal(R, axis1=-2, axis2=-1))
+    return (diag[..., :p] > rtol * diag.max(axis=-1, keepdims=True)).all(axis=-1)
+
+
+def _solve_blocks(R, c, sizes):
+    """Coefficients of every nested block, ``nan`` where a block is singular."""
+    betas = []
+    for p in sizes:
+        if p > R.shape[-2]:
+            # More coefficients than observations: R has no p x p block.
+            betas.append(np.full(R.shape[:-2] + (p,), np.nan))
+            continue
+        ok = _full_rank(R, p)
+        Rp = np.where(ok[..., None, None], R[..., :p, :p], np.eye(p))
+        beta = np.linalg.solve(Rp, c[..., :p, None])[..., 0]
+        betas.append(np.where(ok[..., None], beta, np.nan))
+    return betas
+
+
+def sweep_degrees(
+    X, y, degrees=range(1, 11), k=5, repeats=10, seed=42, name=""
+) -> DegreeSweep:
+    """Fit every degree in ``degrees`` on one dataset and cross-validate it.
+
+    Args:
+        X: ``(n,)`` or ``(n, n_features)``; several features get every
+            interaction term of each degree
+        y: ``(n,)`` target
+        degrees: polynomial degrees to compare (0 is the mean model)
+        k, repeats: repeated k-fold CV; all degrees share the same folds
+        seed: fold shuffling seed
+    """
+    X = _as_2d(X)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    degrees = np.array(sorted(set(degrees)))
+    sizes = _block_sizes(X.shape[1], degrees)
+
+    # Scale every feature to [-1, 1]; high powers of raw values (years,
+    # prices) would make the design hopelessly ill-conditioned.
+    lo, hi = X.min(axis=0), X.max(axis=0)
+    center = (hi + lo) / 2
+    scale = np.where(hi > lo, (hi - lo) / 2, 1.0)
+    V = _design(X, center, scale, int(degrees.max()))
+
+    Q, R = np.linalg.qr(V)
+    coef = _solve_blocks(R, Q.T @ y, sizes)
+    train_mse = np.array([np.mean((y - V[:, : len(b)] @ b) ** 2) for b in coef])
+
+    # Zeroed test rows drop out of the least-squares problem, so every fold's
+    # training design has the same shape and one batched QR covers them all.
+    folds = list(kfold_indices(n, k, repeats, seed))
+    test = np.zeros((len(folds), n), dtype=bool)
+    for f, idx in enumerate(folds):
+        test[f, idx] = True
+    keep = (~test).astype(float)
+    Qf, Rf = np.linalg.qr(V[None, :, :] * keep[:, :, None])
+    cf = np.einsum("fnp,fn->fp", Qf, y * keep)
+    betas = _solve_blocks(Rf, cf, sizes)
+
+    oof = np.empty((repeats, n, len(degrees)))
+    for j, beta in enumerate(betas):
+        pred = beta @ V[:, : sizes[j]].T  # (folds, n)
+        # Each point is in exactly one test fold per repeat.
+        pred = np.where(test, pred, 0.0).reshape(repeats, k, n).sum(axis=1)
+        oof[:, :, j] = pred
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # all-nan degrees
+        error = oof - y[None, :, None]
+        cv_mse = np.nanmean(error**2, axis=(0, 1))
+        mean_pred = np.nanmean(oof, axis=0)
+        bias2 = np.nanmean((mean_pred - y[:, None]) ** 2, axis=0)
+        variance = np.nanmean(np.nanvar(oof, axis=0), axis=0)
+
+    return DegreeSweep(
+        name=name,
+        n=n,
+        degrees=degrees,
+        train_mse=train_mse,
+        cv_mse=cv_mse,
+        bias2=bias2,
+        variance=variance,
+        coef=coef,
+        center=center,
+        scale=scale,
+    )
+
+
+def _sweep_job(job):
+    x, y, name, degrees, k, repeats, seed = job
+    return sweep_degrees(x, y, degrees, k, repeats, seed, name)
+
+
+def sweep_problems(
+    md_path=PROBLEMS_MD, degrees=range(1, 11), k=5, repeats=10, seed=42, n_jobs=None
+) -> SweepReport:
+    """``sweep_degrees`` on every problem in ``problems.md``.
+
+    ``n_jobs`` worker processes take the datasets in chunks; ``n_jobs=1`` runs
+    in the calling process, ``None`` uses ``os.cpu_count()``.
+    """
+    problems = parse_problems(md_path)
+    X, Y, mask = load_padded(problems)
+    degrees = list(degrees)
+    jobs = [
+        (X[i, mask[i]], Y[i, mask[i]], p.name, degrees, k, repeats, seed)
+        for i, p in enumerate(problems)
+    ]
+    n_jobs = n_jobs or os.cpu_count() or 1
+    if n_jobs == 1 or len(jobs) < 2 * n_jobs:
+        sweeps = [_sweep_job(job) for job in jobs]
+    else:
+        chunksize = -(-len(jobs) // n_jobs)
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            sweeps = list(pool.map(_sweep_job, jobs, chunksize=chunksize))
+    return SweepReport(sweeps=sweeps, k=k, repeats=repeats)
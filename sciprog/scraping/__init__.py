@@ -0,0 +1,43 @@
+"""Shared building blocks for the Lab 04 scrapers (Steel fetch + Gemini)."""
+
+from .batching import BatchAnalyzer, Document
+from .cache import PageCache
+from .extract import Extractor, Field, Rule
+from .incremental import Diff, FingerprintStore
+from .listing import ListingCrawler
+from .llm import GeminiGateway, LLMError, ResponseCache
+from .pipeline import Pipeline, Stage
+from .router import ModelRouter
+from .sessions import SteelSessionPool
+from .sites import Crawler, CrawlResult, Pagination, SiteSpec
+from .steel import SteelClient, SteelError, SteelPage, SteelTimeout, TokenBucket
+from .store import RecordStore
+
+__all__ = [
+    "BatchAnalyzer",
+    "CrawlResult",
+    "Crawler",
+    "Diff",
+    "Document",
+    "Extractor",
+    "Field",
+    "FingerprintStore",
+    "GeminiGateway",
+    "LLMError",
+    "ListingCrawler",
+    "ModelRouter",
+    "PageCache",
+    "Pagination",
+    "Pipeline",
+    "RecordStore",
+    "ResponseCache",
+    "Rule",
+    "SiteSpec",
+    "Stage",
+    "SteelClient",
+    "SteelError",
+    "SteelPage",
+    "SteelSessionPool",
+    "SteelTimeout",
+    "TokenBucket",
+]
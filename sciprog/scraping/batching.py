@@ -0,0 +1,207 @@
+"""Pack many small documents into few Gemini requests.
+
+``generate_ad_summary`` (smachiedo) sends one request per ad and the Ars
+Technica app summarizes RSS items one by one. ``BatchAnalyzer`` greedily packs
+documents into prompts up to a token budget, asks for a JSON array with one
+``{"id", "result"}`` object per item, splits the answer back out and runs the
+batches through a bounded thread pool. Items the model drops from its answer,
+or whose request fails, are retried on their own::
+
+    from sciprog.scraping import BatchAnalyzer, GeminiGateway
+
+    analyzer = BatchAnalyzer(
+        GeminiGateway(),
+        "Napiši sažetak oglasa u 2 rečenice na hrvatskom jeziku.",
+        token_budget=6000,
+    )
+    summaries = analyzer.run({ad["link"]: format_ad(ad) for ad in ads})
+"""
+
+import json
+import math
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from .llm import LLMError
+
+CHARS_PER_TOKEN = 4
+
+_PROMPT = """{instruction}
+
+You will receive {count} items, each starting with a line "### ITEM <id>".
+Handle every item independently. Answer with a JSON array only, one object per
+item, in the form [{{"id": "<id>", "result": <your answer for that item>}}].
+
+{items}"""
+
+
+@dataclass
+class Document:
+    id: str
+    text: str
+
+    @property
+    def tokens(self) -> int:
+        return estimate_tokens(self.text)
+
+
+def estimate_tokens(text) -> int:
+    """Rough token count (Gemini averages ~4 characters per token)."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def as_documents(items) -> list[Document]:
+    """Accept ``{id: text}``, ``[(id, text)]``, ``[Document]`` or ``[text]``."""
+    if isinstance(items, dict):
+        items = items.items()
+    documents = []
+    for i, item in enumerate(items):
+        if isinstance(item, Document):
+            documents.append(item)
+        elif isinstance(item, str):
+            documents.append(Document(str(i), item))
+        else:
+            key, text = item
+            documents.append(Document(str(key), text))
+    return documents
+
+
+def pack(
+    documents, token_budget, overhead_tokens=0, max_items=None
+) -> list[list[Document]]:
+    """Group documents (in order) so each batch fits ``token_budget``.
+
+    A document larger than the budget on its own is truncated to fit.
+    """
+    room = token_budget - overhead_tokens
+    if room <= 0:
+        raise ValueError("token_budget is smaller than the prompt overhead")
+    batches, current, used = [], [], 0
+    for doc in documents:
+        cost = doc.tokens + estimate_tokens(f"### ITEM {doc.id}\n")
+        if cost > room:
+            doc = Document(
+                doc.id, doc.text[: (room - cost + doc.tokens) * CHARS_PER_TOKEN]
+            )
+            cost = room
+        full = max_items is not None and len(current) >= max_items
+        if current and (used + cost > room or full):
+            batches.append(current)
+            current, used = [], 0
+        current.append(doc)
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+def build_prompt(instruction, batch) -> str:
+    items = "\n\n".join(f"### ITEM {doc.id}\n{doc.text}" for doc in batch)
+    return _PROMPT.format(instruction=instruction, count=len(batch), items=items)
+
+
+def parse_batch_response(text) -> dict:
+    """Map item id to result from the model's JSON answer.
+
+    Tolerates ```json fences and surrounding prose around the array.
+    """
+    text = text.strip()
+    fenced = re.search(r"```(?:json)?\s*(.*?)```", text, re.DOTALL)
+    if fenced:
+        text = fenced.group(1)
+    start, end = text.find("["), text.rfind("]")
+    if start == -1 or end == -1:
+        raise LLMError("batch response contains no JSON array")
+    try:
+        items = json.loads(text[start : end + 1])
+    except ValueError as e:
+        raise LLMError(f"batch response is not valid JSON: {e}") from e
+    results = {}
+    for item in items:
+        if isinstance(item, dict) and "id" in item:
+            result = item.get("result")
+            results[str(item["id"])] = (
+                result
+                if isinstance(result, str)
+                else json.dumps(result, ensure_ascii=False)
+            )
+    return results
+
+
+class BatchAnalyzer:
+    def __init__(
+        self,
+        llm,
+        instruction,
+        token_budget=8000,
+        max_items=50,
+        max_concurrency=4,
+        model=None,
+        config=None,
+    ):
+        """
+        Args:
+            llm: ``GeminiGateway`` (or anything with ``generate(prompt, ...)``)
+            instruction: what to do with each item
+            token_budget: estimated input tokens per request
+            max_items: hard cap on items per request
+            max_concurrency: requests in flight at once
+        """
+        self.llm = llm
+        self.instruction = instruction
+        self.token_budget = token_budget
+        self.max_items = max_items
+        self.max_concurrency = max_concurrency
+        self.model = model
+        self.config = {"responseMimeType": "application/json", **(config or {})}
+        self.errors = {}
+
+    def _overhead(self):
+        return estimate_tokens(build_prompt(self.instruction, []))
+
+    def batches(self, documents) -> list[list[Document]]:
+        return pack(
+            as_documents(documents), self.token_budget, self._overhead(), self.max_items
+        )
+
+    def _run_batch(self, batch):
+        try:
+            text = self.llm.generate(
+                build_prompt(self.instruction, batch),
+                model=self.model,
+                config=self.config,
+            )
+        except LLMError as e:
+            # The other batches keep their answers; these items are retried
+            # one by one.
+            if len(batch) == 1:
+                self.errors[batch[0].id] = e
+            return {}
+        try:
+            return parse_batch_response(text)
+        except LLMError:
+            if len(batch) == 1:
+                # A single item may come back as plain text; take it as is.
+                return {batch[0].id: text.strip()}
+            return {}
+
+    def run(self, documents) -> dict:
+        """Return ``{id: result}`` for every document, in input order.
+
+        A document whose request still fails on its own maps to ``None``,
+        with the ``LLMError`` in ``errors[id]``.
+        """
+        documents = as_documents(documents)
+        batches = self.batches(documents)
+        results = {}
+        self.errors = {}
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+            for part in pool.map(self._run_batch, batches):
+                results.update(part)
+
+            missing = [[doc] for doc in documents if doc.id not in results]
+            for part in pool.map(self._run_batch, missing):
+                results.update(part)
+        self.errors = {k: e for k, e in self.errors.items() if k not in results}
+        return {doc.id: results.get(doc.id) for doc in documents}
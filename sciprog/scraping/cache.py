@@ -0,0 +1,275 @@
+"""Persistent, content-addressed cache for scraped pages.
+
+Re-running a notebook while iterating on the parsing code should not
+re-download (and re-bill) the same page. Entries are keyed by the URL plus the
+Steel payload options that change the result (``format``, ``delay``,
+``waitFor``, ``fullPage``...). The HTML itself is stored gzip-compressed under
+its own SHA-256, so identical pages fetched with different options share one
+blob. A small SQLite index keeps ETag/Last-Modified, expiry and last access
+time, and evicts least-recently-used entries once ``max_bytes`` is exceeded::
+
+    from sciprog.scraping import PageCache, SteelClient
+
+    steel = SteelClient(cache=PageCache(ttl=6 * 3600))
+    page = steel.fetch(url, waitFor=5000)   # second run: page.from_cache
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+from sciprog import REPO_ROOT
+
+DEFAULT_ROOT = REPO_ROOT / "data" / "temp" / "pages"
+
+# Options that only steer the transport, not the content of the page.
+IGNORED_OPTIONS = {"sessionId", "useProxy", "region"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    options TEXT NOT NULL,
+    blob TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    status_code INTEGER,
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at REAL NOT NULL,
+    expires_at REAL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_lru ON entries(last_access);
+CREATE INDEX IF NOT EXISTS entries_blob ON entries(blob);
+"""
+
+
+@dataclass
+class CachedPage:
+    url: str
+    html: str
+    status_code: int
+    etag: str | None
+    last_modified: str | None
+    fetched_at: float
+    expires_at: float | None
+
+    @property
+    def expired(self) -> bool:
+        return self.expires_at is not None and time.time() >= self.expires_at
+
+
+def cache_key(url, options=None) -> str:
+    options = {k: v for k, v in (options or {}).items() if k not in IGNORED_OPTIONS}
+    raw = json.dumps({"url": url, "options": options}, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class PageCache:
+    def __init__(self, root=DEFAULT_ROOT, ttl=24 * 3600, max_bytes=512 * 2**20):
+        """
+        Args:
+            root: directory for ``index.sqlite`` and the ``objects/`` blobs
+            ttl: seconds an entry stays fresh (``None`` never expires)
+            max_bytes: compressed size budget before LRU eviction kicks in
+        """
+        self.root = Path(root)
+        self.objects = self.root / "objects"
+        self.objects.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.root / "index.sqlite", check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _blob_path(self, digest) -> Path:
+        return self.objects / digest[:2] / f"{digest}.html.gz"
+
+    def get(self, url, options=None, allow_stale=False) -> CachedPage | None:
+        """Return the cached page, or ``None`` if missing (or expired)."""
+        key = cache_key(url, options)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT blob, status_code, etag, last_modified, fetched_at, expires_at"
+                " FROM entries WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            blob, status_code, etag, last_modified, fetched_at, expires_at = row
+            if not allow_stale and expires_at is not None and time.time() >= expires_at:
+                return None
+            try:
+                html = gzip.decompress(self._blob_path(blob).read_bytes()).decode(
+                    "utf-8"
+                )
+            except OSError:
+                self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._db.commit()
+                return None
+            self._db.execute(
+                "UPDATE entries SET last_access = ? WHERE key = ?", (time.time(), key)
+            )
+            self._db.commit()
+        return CachedPage(
+            url, html, status_code, etag, last_modified, fetched_at, expires_at
+        )
+
+    def put(
+        self,
+        url,
+        html,
+        options=None,
+        status_code=200,
+        etag=None,
+        last_modified=None,
+        ttl=None,
+    ):
+        data = html.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        compressed = gzip.compress(data, compresslevel=6)
+        path = self._blob_path(digest)
+        now = time.time()
+        ttl = self.ttl if ttl is None else ttl
+        options = {k: v for k, v in (options or {}).items() if k not in IGNORED_OPTIONS}
+        # Blob and row go in together under the lock, so eviction never sees
+        # a blob without its row (or a row whose blob is still being written).
+        with self._lock:
+            if not path.exists():
+                self._write_blob(path, compressed)
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    cache_key(url, options),
+                    url,
+                    json.dumps(options, sort_keys=True, default=str),
+                    digest,
+                    len(compressed),
+                    status_code,
+                    etag,
+                    last_modified,
+                    now,
+                    None if ttl is None else now + ttl,
+                    now,
+                ),
+            )
+            self._db.commit()
+            self._evict_locked()
+
+    @staticmethod
+    def _write_blob(path, compressed):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(compressed)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def touch(self, url, options=None, ttl=None):
+        """Extend an entry's expiry, e.g. after a ``304 Not Modified``."""
+        ttl = self.ttl if ttl is None else ttl
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "UPDATE entries SET expires_at = ?, last_access = ? WHERE key = ?",
+                (None if ttl is None else now + ttl, now, cache_key(url, options)),
+            )
+            self._db.commit()
+
+    def conditional_headers(self, url, options=None) -> dict:
+        """``If-None-Match``/``If-Modified-Since`` for revalidating a direct fetch."""
+        page = self.get(url, options, allow_stale=True)
+        headers = {}
+        if page is not None and page.etag:
+            headers["If-None-Match"] = page.etag
+        if page is not None and page.last_modified:
+            headers["If-Modified-Since"] = page.last_modified
+        return headers
+
+    def delete(self, url, options=None):
+        key = cache_key(url, options)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT blob FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._db.commit()
+            if row is not None:
+                self._drop_blobs_locked([row[0]])
+
+    def size(self) -> int:
+        """Compressed bytes on disk (each blob counted once)."""
+        with self._lock:
+            return self._size_locked()
+
+    def _size_locked(self) -> int:
+        row = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM"
+            " (SELECT blob, MAX(size) AS size FROM entries GROUP BY blob)"
+        ).fetchone()
+        return row[0]
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def _evict_locked(self):
+        if self.max_bytes is None:
+            return
+        total = self._size_locked()
+        if total <= self.max_bytes:
+            return
+        rows = self._db.execute(
+            "SELECT key, blob, size FROM entries ORDER BY last_access"
+        ).fetchall()
+        dropped = []
+        for key, blob, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            shared = self._db.execute(
+                "SELECT 1 FROM entries WHERE blob = ? LIMIT 1", (blob,)
+            ).fetchone()
+            if shared is None:
+                total -= size
+                dropped.append(blob)
+        self._db.commit()
+        self._drop_blobs_locked(dropped)
+
+    def _drop_blobs_locked(self, blobs):
+        """Unlink the given blobs unless an entry still points at them."""
+        for blob in blobs:
+            shared = self._db.execute(
+                "SELECT 1 FROM entries WHERE blob = ? LIMIT 1", (blob,)
+            ).fetchone()
+            if shared is None:
+                self._blob_path(blob).unlink(missing_ok=True)
+
+    def clear(self):
+        with self._lock:
+            blobs = [
+                row[0] for row in self._db.execute("SELECT DISTINCT blob FROM entries")
+            ]
+            self._db.execute("DELETE FROM entries")
+            self._db.commit()
+            self._drop_blobs_locked(blobs)
@@ -0,0 +1,389 @@
+"""Single-pass HTML field extraction with precompiled selectors.
+
+The Lab 04 scrapers build a full BeautifulSoup tree and then scan it again
+for every field (``container.find(..., class_=lambda x: ...)`` per ad,
+nested ``find_all`` per FBref table). ``Extractor`` compiles a set of rules
+once and pulls every field out during one streaming pass of the tokenizer, so
+no tree is built at all::
+
+    from sciprog.scraping.extract import Extractor, Field, Rule
+
+    steam = Extractor(
+        Rule(
+            "games",
+            "a.search_result_row",
+            {
+                "title": Field(".title"),
+                "released": Field(".search_released"),
+                "review": Field(".search_review_summary", attr="data-tooltip-html"),
+                "price": Field(".discount_final_price"),
+                "link": Field(":scope", attr="href"),
+            },
+        )
+    )
+    games = steam.extract(html)["games"]
+
+Supported selectors: ``tag``, ``.class``, ``#id``, ``[attr]``,
+``[attr=v]``/``*=``/``^=``/``$=``/``~=``, descendant (space) and child
+(``>``) combinators, ``,`` groups and ``:scope`` for the container itself.
+``[class*=price]`` replaces the ``class_=lambda x: "price" in x`` idiom.
+Rules can nest (``children``) to keep rows under their table.
+"""
+
+import re
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+
+VOID_TAGS = frozenset(
+    "area base br col embed hr img input link meta param source track wbr".split()
+)
+# Their content is never part of an element's text.
+RAW_TEXT_TAGS = frozenset(["script", "style", "template", "noscript"])
+# Tags that separate words, like ``get_text(" ")`` would.
+BREAK_TAGS = frozenset(
+    "br p div li tr td th h1 h2 h3 h4 h5 h6 dt dd section article".split()
+)
+
+_COMPOUND = re.compile(
+    r"""
+    (?P<tag>[a-zA-Z][\w-]*|\*)?
+    (?P<rest>(?:\.[\w-]+|\#[\w-]+|\[[^\]]+\])*)
+    """,
+    re.VERBOSE,
+)
+_PART = re.compile(
+    r"\.([\w-]+)|#([\w-]+)|\[\s*([\w-]+)\s*(?:([*^$~]?=)\s*(['\"]?)(.*?)\5)?\s*\]"
+)
+
+
+class SelectorError(ValueError):
+    pass
+
+
+class Compound:
+    """One simple selector such as ``div.ad[data-id]``."""
+
+    __slots__ = ("tag", "id", "classes", "attrs")
+
+    def __init__(self, text):
+        match = _COMPOUND.fullmatch(text)
+        if not match or not text:
+            raise SelectorError(f"unsupported selector part: {text!r}")
+        tag = match.group("tag")
+        self.tag = None if tag in (None, "*") else tag.lower()
+        self.id = None
+        self.classes = frozenset()
+        self.attrs = []
+        classes = set()
+        for cls, id_, name, op, _, value in _PART.findall(match.group("rest")):
+            if cls:
+                classes.add(cls)
+            elif id_:
+                self.id = id_
+            else:
+                self.attrs.append((name.lower(), op or None, value))
+        self.classes = frozenset(classes)
+
+    def matches(self, elem) -> bool:
+        tag, attrs, classes = elem
+        if self.tag is not None and tag != self.tag:
+            return False
+        if self.id is not None and attrs.get("id") != self.id:
+            return False
+        if self.classes and not self.classes <= classes:
+            return False
+        for name, op, value in self.attrs:
+            actual = attrs.get(name)
+            if actual is None:
+                return False
+            if op is None:
+                continue
+            if op == "=" and actual != value:
+                return False
+            if op == "*=" and value.lower() not in actual.lower():
+                return False
+            if op == "^=" and not actual.startswith(value):
+                return False
+            if op == "$=" and not actual.endswith(value):
+                return False
+            if op == "~=" and value not in actual.split():
+                return False
+        return True
+
+
+class Selector:
+    """A compiled selector group (``a, b``) of compound chains."""
+
+    def __init__(self, text):
+        self.text = text.strip()
+        self.scope = self.text == ":scope"
+        self.chains = (
+            [] if self.scope else [self._compile(part) for part in self.text.split(",")]
+        )
+
+    @staticmethod
+    def _compile(text):
+        tokens = text.replace(">", " > ").split()
+        chain, combinator = [], " "
+        for token in tokens:
+            if token == ">":
+                combinator = ">"
+                continue
+            chain.append((combinator, Compound(token)))
+            combinator = " "
+        if not chain:
+            raise SelectorError(f"empty selector: {text!r}")
+        return chain
+
+    def matches(self, stack, lo=0) -> bool:
+        """Does the last element of ``stack`` match, looking no higher than ``lo``?"""
+        i = len(stack) - 1
+        for chain in self.chains:
+            if _match_at(chain, len(chain) - 1, stack, i, lo):
+                return True
+        return False
+
+
+def _match_at(chain, k, stack, i, lo):
+    if i < lo or not chain[k][1].matches(stack[i]):
+        return False
+    if k == 0:
+        return True
+    if chain[k][0] == ">":
+        return _match_at(chain, k - 1, stack, i - 1, lo)
+    for j in range(i - 1, lo - 1, -1):
+        if _match_at(chain, k - 1, stack, j, lo):
+            return True
+    return False
+
+
+def _convert(value, kind, default):
+    if value is None:
+        return default
+    if kind is None or kind is str:
+        return value
+    try:
+        if kind is int or kind == "int":
+            # Separators first: "1.299,00 €" is 1299, not 129900.
+            return round(parse_number(value))
+        if kind is float or kind == "float":
+            return parse_number(value)
+        return kind(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def parse_number(text) -> float:
+    """Parse ``"1.299,00 €"``, ``"$1,299.00"``, ``"13.717 €"`` or ``"12.5"``.
+
+    A lone separator followed by exactly three digits is read as a thousands
+    separator, as on Croatian listing sites.
+    """
+    digits = re.sub(r"[^\d.,-]", "", text)
+    if "," in digits and "." in digits:
+        if digits.rfind(",") > digits.rfind("."):
+            digits = digits.replace(".", "").replace(",", ".")
+        else:
+            digits = digits.replace(",", "")
+    elif "," in digits:
+        head, _, tail = digits.rpartition(",")
+        digits = head.replace(",", "") + ("." if len(tail) != 3 else "") + tail
+    elif digits.count(".") > 1 or re.fullmatch(r"-?[1-9]\d{0,2}\.\d{3}", digits):
+        digits = digits.replace(".", "")
+    return float(digits)
+
+
+@dataclass
+class Field:
+    """One value per record: element text (default) or an attribute.
+
+    ``many=True`` collects every match into a list (e.g. all cells of a row).
+    """
+
+    selector: str
+    attr: str | None = None
+    type: object = None
+    many: bool = False
+    default: object = None
+
+    def __post_init__(self):
+        self.compiled = Selector(self.selector)
+
+
+@dataclass
+class Rule:
+    """Records to pull out: one per ``container`` match (``None``: whole page)."""
+
+    name: str
+    container: str | None
+    fields: dict = field(default_factory=dict)
+    children: list = field(default_factory=list)
+
+    def __post_init__(self):
+        self.fields = {
+            k: v if isinstance(v, Field) else Field(v) for k, v in self.fields.items()
+        }
+        self.compiled = None if self.container is None else Selector(self.container)
+
+
+class _Record:
+    __slots__ = ("rule", "depth", "parent", "values", "children")
+
+    def __init__(self, rule, depth, parent=None):
+        self.rule = rule
+        self.depth = depth
+        self.parent = parent
+        self.values = {name: [] if f.many else None for name, f in rule.fields.items()}
+        self.children = {child.name: [] for child in rule.children}
+
+    def store(self, name, value):
+        if self.rule.fields[name].many:
+            self.values[name].append(value)
+        elif self.values[name] is None:
+            self.values[name] = value
+
+    def finish(self):
+        out = {}
+        for name, f in self.rule.fields.items():
+            value = self.values[name]
+            if f.many:
+                out[name] = [_convert(v, f.type, f.default) for v in value]
+            else:
+                out[name] = _convert(value, f.type, f.default)
+        out.update(self.children)
+        return out
+
+
+class _Capture:
+    __slots__ = ("depth", "record", "name", "parts")
+
+    def __init__(self, depth, record, name):
+        self.depth = depth
+        self.record = record
+        self.name = name
+        self.parts = []
+
+
+class _Parser(HTMLParser):
+    def __init__(self, rules):
+        super().__init__(convert_charrefs=True)
+        self.rules = [r for r in rules if r.compiled is not None]
+        self.stack = []
+        self.open_records = [_Record(r, -1) for r in rules if r.compiled is None]
+        self.page_records = list(self.open_records)
+        self.captures = []
+        self.results = {rule.name: [] for rule in rules}
+
+    def handle_starttag(self, tag, attrs):
+        attrs = {k: v or "" for k, v in attrs}
+        elem = (tag, attrs, frozenset(attrs.get("class", "").split()))
+        self.stack.append(elem)
+        depth = len(self.stack) - 1
+        if tag in BREAK_TAGS:
+            for capture in self.captures:
+                capture.parts.append(" ")
+
+        opened = []
+        for record in self.open_records:
+            lo = record.depth + 1
+            for name, f in record.rule.fields.items():
+                if f.compiled.scope or not f.compiled.matches(self.stack, lo):
+                    continue
+                if not f.many and record.values[name] is not None:
+                    continue
+                self._capture(record, name, f, attrs, depth)
+            for child in record.rule.children:
+                if child.compiled.matches(self.stack, lo):
+                    opened.append(_Record(child, depth, record))
+        for rule in self.rules:
+            if rule.compiled.matches(self.stack):
+                opened.append(_Record(rule, depth))
+
+        for record in opened:
+            for name, f in record.rule.fields.items():
+                if f.compiled.scope:
+                    self._capture(record, name, f, attrs, depth)
+            self.open_records.append(record)
+
+        if tag in VOID_TAGS:
+            self._pop(depth)
+
+    def _capture(self, record, name, f, attrs, depth):
+        if f.attr is not None:
+            value = attrs.get(f.attr)
+            if value is not None:
+                record.store(name, value)
+        elif f.many or not any(
+            c.record is record and c.name == name for c in self.captures
+        ):
+            self.captures.append(_Capture(depth, record, name))
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self._pop(len(self.stack) - 1)
+
+    def handle_endtag(self, tag):
+        for i in range(len(self.stack) - 1, -1, -1):
+            if self.stack[i][0] == tag:
+                self._pop(i)
+                return
+
+    def handle_data(self, data):
+        if self.stack and self.stack[-1][0] in RAW_TEXT_TAGS:
+            return
+        for capture in self.captures:
+            capture.parts.append(data)
+
+    def _pop(self, index):
+        """Close the element at ``index`` and every element opened after it."""
+        while len(self.stack) > index:
+            depth = len(self.stack) - 1
+            if self.captures and self.captures[-1].depth >= depth:
+                keep = []
+                for capture in self.captures:
+                    if capture.depth == depth:
+                        text = " ".join("".join(capture.parts).split())
+                        capture.record.store(capture.name, text)
+                    else:
+                        keep.append(capture)
+                self.captures = keep
+            while self.open_records and self.open_records[-1].depth == depth:
+                record = self.open_records.pop()
+                target = (
+                    self.results if record.parent is None else record.parent.children
+                )
+                target[record.rule.name].append(record.finish())
+            self.stack.pop()
+
+    def finish(self):
+        self.close()
+        self._pop(0)
+        for record in self.page_records:
+            self.results[record.rule.name].append(record.finish())
+        return self.results
+
+
+class Extractor:
+    """A compiled set of rules, reusable across any number of documents."""
+
+    def __init__(self, *rules):
+        self.rules = list(rules)
+
+    def extract(self, html) -> dict:
+        """Return ``{rule name: [record, ...]}`` after one pass over ``html``.
+
+        ``html`` may be a string or an iterable of string chunks (e.g. a
+        streamed response body).
+        """
+        parser = _Parser(self.rules)
+        if isinstance(html, str):
+            parser.feed(html)
+        else:
+            for chunk in html:
+                parser.feed(chunk)
+        return parser.finish()
+
+    def first(self, html, rule=None) -> list:
+        """Records of ``rule`` (default: the first rule)."""
+        return self.extract(html)[rule or self.rules[0].name]
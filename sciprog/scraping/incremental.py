@@ -0,0 +1,193 @@
+"""Change detection between recurring crawls.
+
+The news and listing scrapers re-fetch and re-summarize the whole page every
+hour even though most runs only see a handful of new headlines or ads.
+``FingerprintStore`` keeps a SQLite table of page hashes and per-item hashes
+for every crawled URL, and ``diff`` reports only what is new, changed or gone
+since the previous run::
+
+    from sciprog.scraping import Crawler, FingerprintStore
+
+    crawler = Crawler()
+    store = FingerprintStore()
+    changes = crawler.crawl_changes("njuskalo", store)
+    if changes:
+        crawler.analyze_changes(changes)   # Gemini sees only changes.records
+
+Items are identified by their ``id`` field, else ``link``, else ``title``
+(see ``item_key``); their content hash covers every other field.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from sciprog import REPO_ROOT
+
+DEFAULT_PATH = REPO_ROOT / "data" / "temp" / "fingerprints.sqlite"
+KEY_FIELDS = ("id", "link", "url", "href", "title")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url TEXT PRIMARY KEY,
+    digest TEXT NOT NULL,
+    checked_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS items (
+    scope TEXT NOT NULL,
+    key TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    PRIMARY KEY (scope, key)
+);
+"""
+
+
+def digest(value) -> str:
+    """SHA-256 of a string, or of the canonical JSON of anything else."""
+    if not isinstance(value, str):
+        value = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+def item_key(record, fields=KEY_FIELDS) -> str:
+    """The first non-empty identifying field, else the hash of the record."""
+    for name in fields:
+        value = record.get(name)
+        if value not in (None, ""):
+            return str(value)
+    return digest(record)
+
+
+@dataclass
+class Diff:
+    scope: str
+    new: list = field(default_factory=list)
+    changed: list = field(default_factory=list)
+    removed: list = field(default_factory=list)
+    unchanged: int = 0
+    pages_changed: bool = True
+    result: object = None
+
+    @property
+    def records(self) -> list:
+        """Items the downstream stage has to look at: new and changed."""
+        return self.new + self.changed
+
+    def __bool__(self):
+        return bool(self.new or self.changed or self.removed)
+
+    def summary(self) -> str:
+        return (
+            f"{self.scope}: {len(self.new)} new, {len(self.changed)} changed, "
+            f"{len(self.removed)} removed, {self.unchanged} unchanged"
+        )
+
+
+class FingerprintStore:
+    def __init__(self, path=DEFAULT_PATH, key_fields=KEY_FIELDS, ignore=()):
+        """
+        Args:
+            path: SQLite file, shared across runs (``":memory:"`` for tests)
+            key_fields: record fields tried, in order, as the item identity
+            ignore: fields left out of the item hash (e.g. a relative date)
+        """
+        if str(path) != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.key_fields = tuple(key_fields)
+        self.ignore = frozenset(ignore)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def pages_changed(self, digests, commit=True) -> bool:
+        """Compare ``{url: page digest}`` with the last run; store the new ones."""
+        now = time.time()
+        changed = False
+        with self._lock:
+            for url, value in digests.items():
+                row = self._db.execute(
+                    "SELECT digest FROM pages WHERE url = ?", (url,)
+                ).fetchone()
+                changed = changed or row is None or row[0] != value
+                if commit:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO pages VALUES (?, ?, ?)",
+                        (url, value, now),
+                    )
+            if commit:
+                self._db.commit()
+        return changed
+
+    def _item_digest(self, record):
+        return digest({k: v for k, v in record.items() if k not in self.ignore})
+
+    def diff(self, scope, records, commit=True) -> Diff:
+        """Classify ``records`` against the items stored under ``scope``.
+
+        With ``commit`` the store is updated to this run's items, so the next
+        ``diff`` compares against them; removed items are forgotten.
+        """
+        current = {}
+        for record in records:
+            current.setdefault(item_key(record, self.key_fields), record)
+
+        result = Diff(scope)
+        now = time.time()
+        with self._lock:
+            previous = dict(
+                self._db.execute(
+                    "SELECT key, digest FROM items WHERE scope = ?", (scope,)
+                ).fetchall()
+            )
+            rows = []
+            for key, record in current.items():
+                value = self._item_digest(record)
+                old = previous.get(key)
+                if old is None:
+                    result.new.append(record)
+                elif old != value:
+                    result.changed.append(record)
+                else:
+                    result.unchanged += 1
+                rows.append((scope, key, value, now, now))
+            result.removed = [key for key in previous if key not in current]
+
+            if commit:
+                self._db.executemany(
+                    "INSERT INTO items VALUES (?, ?, ?, ?, ?)"
+                    " ON CONFLICT (scope, key) DO UPDATE SET"
+                    " digest = excluded.digest, last_seen = excluded.last_seen",
+                    rows,
+                )
+                self._db.executemany(
+                    "DELETE FROM items WHERE scope = ? AND key = ?",
+                    [(scope, key) for key in result.removed],
+                )
+                self._db.commit()
+        return result
+
+    def forget(self, scope=None):
+        """Drop the stored items of one scope, or everything."""
+        with self._lock:
+            if scope is None:
+                self._db.execute("DELETE FROM items")
+                self._db.execute("DELETE FROM pages")
+            else:
+                self._db.execute("DELETE FROM items WHERE scope = ?", (scope,))
+            self._db.commit()
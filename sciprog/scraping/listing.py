@@ -0,0 +1,191 @@
+"""Crawl every result page of a Njuškalo-style listing search.
+
+``scrape_njuskalo`` (smachiedo) reads only the first page of its search and
+stops after five ads. ``ListingCrawler`` reads the page numbers linked from
+each result page, fetches them concurrently while keeping at most a few
+requests in flight per host, drops ads it has already seen (by ``id``/link,
+not by title) and streams every new ad straight into a sink, so memory use
+does not grow with the number of pages::
+
+    from sciprog.scraping.listing import ListingCrawler
+    from sciprog.scraping.sink import open_sink
+
+    crawler = ListingCrawler("njuskalo", per_host=2, delay=1.0, max_pages=500)
+    with open_sink("data/temp/njuskalo_auti.parquet") as sink:
+        stats = crawler.run("https://www.njuskalo.hr/rabljeni-automobili", sink)
+    print(stats)
+
+Pages are discovered as they arrive: pagination bars usually show a window
+of page numbers, and each fetched page reveals the next ones. The crawl ends
+at ``max_pages`` or at the first page that yields no new ads.
+"""
+
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from urllib.parse import parse_qsl, urljoin, urlsplit
+
+from .extract import Extractor, Field, Rule
+from .incremental import KEY_FIELDS, item_key
+from .sites import Crawler, Pagination, SiteSpec, get
+from .steel import SteelError
+
+_LINKS = Extractor(Rule("links", None, {"href": Field("a[href]", "href", many=True)}))
+
+
+def page_numbers(html, url, param="page") -> set[int]:
+    """Page numbers linked from ``html`` that point at the same listing path."""
+    base = urlsplit(url)
+    numbers = set()
+    for href in _LINKS.first(html)[0]["href"]:
+        target = urlsplit(urljoin(url, href))
+        if target.netloc != base.netloc or target.path != base.path:
+            continue
+        for key, value in parse_qsl(target.query):
+            if key == param and value.isdigit():
+                numbers.add(int(value))
+    return numbers
+
+
+class HostLimiter:
+    """At most ``concurrency`` requests per host, started ``delay`` s apart."""
+
+    def __init__(self, concurrency=2, delay=0.0):
+        self.concurrency = concurrency
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._slots = defaultdict(lambda: threading.BoundedSemaphore(concurrency))
+        self._next_start = defaultdict(float)
+
+    @contextmanager
+    def __call__(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            slot = self._slots[host]
+        with slot:
+            if self.delay:
+                with self._lock:
+                    now = time.monotonic()
+                    start = max(now, self._next_start[host])
+                    self._next_start[host] = start + self.delay
+                time.sleep(start - now)
+            yield
+
+
+@dataclass
+class ListingStats:
+    pages: int = 0
+    items: int = 0
+    duplicates: int = 0
+    last_page: int = 0
+    errors: list = field(default_factory=list)
+    elapsed: float = 0.0
+
+    def __str__(self):
+        return (
+            f"{self.items} items from {self.pages} pages "
+            f"({self.duplicates} duplicates, {len(self.errors)} errors) "
+            f"in {self.elapsed:.1f}s"
+        )
+
+
+class ListingCrawler:
+    def __init__(
+        self,
+        site,
+        crawler=None,
+        rule=None,
+        per_host=2,
+        delay=0.0,
+        max_pages=None,
+        max_workers=8,
+        key_fields=KEY_FIELDS,
+    ):
+        """
+        Args:
+            site: ``SiteSpec`` or registered site name
+            crawler: ``Crawler`` whose Steel client (and cache) is used
+            rule: rule whose records are the listing items (default: first)
+            per_host, delay: politeness limit per target host
+            max_pages: stop after this many pages (``None``: until exhausted)
+            max_workers: page fetches in flight overall
+            key_fields: fields identifying an ad, tried in order
+        """
+        self.spec = site if isinstance(site, SiteSpec) else get(site)
+        self.crawler = crawler or Crawler()
+        self.rule = rule or self.spec.rules[0].name
+        self.paging = self.spec.pagination or Pagination(param="page")
+        self.limiter = HostLimiter(per_host, delay)
+        self.max_pages = max_pages
+        self.max_workers = max_workers
+        self.key_fields = key_fields
+
+    def _fetch(self, url):
+        with self.limiter(url):
+            return self.crawler.steel.fetch(url, **self.spec.options)
+
+    def run(self, url, sink) -> ListingStats:
+        """Crawl the listing at ``url`` and ``sink.write`` every unique item."""
+        start = time.monotonic()
+        stats = ListingStats()
+        seen = set()
+        scheduled = set()
+        end = None  # first page number that had nothing new
+        limit = self.max_pages or float("inf")
+        first = self.paging.start
+
+        def accept(number, page):
+            nonlocal end
+            stats.pages += 1
+            stats.last_page = max(stats.last_page, number)
+            fresh = 0
+            for record in self.spec.extract(page.html).get(self.rule, []):
+                key = item_key(record, self.key_fields)
+                if key in seen:
+                    stats.duplicates += 1
+                    continue
+                seen.add(key)
+                sink.write(record)
+                fresh += 1
+            stats.items += fresh
+            if fresh == 0 and (end is None or number < end):
+                end = number
+            return page_numbers(page.html, page.url, self.paging.param)
+
+        def schedule(pool, numbers, pending):
+            for n in sorted(numbers):
+                if n in scheduled or n - first >= limit:
+                    continue
+                if end is not None and n >= end:
+                    continue
+                scheduled.add(n)
+                pending[pool.submit(self._fetch, self.paging.page_url(url, n))] = n
+
+        scheduled.add(first)
+        try:
+            page = self._fetch(self.paging.page_url(url, first))
+            discovered = accept(first, page) | {first + 1}
+        except SteelError as e:
+            stats.errors.append(e)
+            stats.elapsed = time.monotonic() - start
+            return stats
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            pending = {}
+            schedule(pool, discovered, pending)
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    number = pending.pop(future)
+                    try:
+                        page = future.result()
+                    except SteelError as e:
+                        stats.errors.append(e)
+                        continue
+                    # The next page may exist even when no link points to it.
+                    schedule(pool, accept(number, page) | {number + 1}, pending)
+        stats.elapsed = time.monotonic() - start
+        return stats
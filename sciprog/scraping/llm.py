@@ -0,0 +1,282 @@
+"""Memoizing gateway for the Gemini ``generateContent`` REST API.
+
+The Lab 04 notebooks call ``genai.list_models()`` before every summary and
+re-send identical prompts whenever a cell is re-run. ``GeminiGateway``
+lists models once per process, stores every response in a SQLite cache keyed
+by ``(model, prompt hash, generation config)`` and makes concurrent callers
+with the same request wait for a single in-flight call::
+
+    from sciprog.scraping import GeminiGateway
+
+    llm = GeminiGateway()                     # GOOGLE_API_KEY / GEMINI_API_KEY
+    summary = llm.generate("Sažmi: ...", config={"temperature": 0.4})
+
+Re-running the cell returns the stored answer with no API call.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+
+import requests
+
+from sciprog import REPO_ROOT
+
+GEMINI_URL = "https://generativelanguage.googleapis.com"
+DEFAULT_MODEL = "gemini-2.5-flash"
+DEFAULT_CACHE = REPO_ROOT / "data" / "temp" / "llm.sqlite"
+
+
+class LLMError(Exception):
+    """Gemini returned an error or a response without text."""
+
+    def __init__(self, message, model=None, status_code=None):
+        super().__init__(message)
+        self.model = model
+        self.status_code = status_code
+
+
+def request_key(model, prompt, config=None, system=None) -> str:
+    digest = hashlib.sha256()
+    for part in (model, system or "", prompt):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    digest.update(json.dumps(config or {}, sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def response_text(data, model=None) -> str:
+    """Concatenate the text parts of the first candidate.
+
+    A response without text (blocked, or stopped by ``SAFETY`` or
+    ``MAX_TOKENS`` before any output) raises ``LLMError``.
+    """
+    if not isinstance(data, dict):
+        raise LLMError(f"unexpected response: {str(data)[:200]}", model=model)
+    candidates = data.get("candidates") or []
+    if not candidates:
+        reason = (data.get("promptFeedback") or {}).get("blockReason")
+        raise LLMError(f"no candidates in response (blockReason={reason})", model=model)
+    parts = (candidates[0].get("content") or {}).get("parts") or []
+    text = "".join(p.get("text", "") for p in parts)
+    if not text:
+        reason = candidates[0].get("finishReason")
+        raise LLMError(f"empty response (finishReason={reason})", model=model)
+    return text
+
+
+class ResponseCache:
+    """SQLite store of generated text, shared across processes and reruns."""
+
+    def __init__(self, path=DEFAULT_CACHE):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, model TEXT, text TEXT, created_at REAL)"
+        )
+        self._db.commit()
+
+    def get(self, key):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT text FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        return None if row is None else row[0]
+
+    def put(self, key, model, text):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)",
+                (key, model, text, time.time()),
+            )
+            self._db.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+# One model list per (endpoint, key) per process.
+_MODEL_LISTS: dict[tuple, list] = {}
+_MODEL_LOCK = threading.Lock()
+
+
+class GeminiGateway:
+    def __init__(
+        self,
+        api_key=None,
+        base_url=GEMINI_URL,
+        model=DEFAULT_MODEL,
+        cache=DEFAULT_CACHE,
+        timeout=60.0,
+        session=None,
+    ):
+        """
+        Args:
+            api_key: defaults to ``GOOGLE_API_KEY`` (or ``GEMINI_API_KEY``)
+            model: model used when ``generate`` gets none
+            cache: ``ResponseCache``, a path for one, or ``None`` to disable
+            timeout: seconds per HTTP request
+        """
+        self.api_key = (
+            api_key or os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY")
+        )
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.timeout = timeout
+        self.session = session or requests.Session()
+        if cache is None or isinstance(cache, ResponseCache):
+            self.cache = cache
+        else:
+            self.cache = ResponseCache(cache)
+        self.calls = 0
+        self._inflight: dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+
+    def _url(self, path):
+        return f"{self.base_url}/v1beta/{path}"
+
+    def _params(self):
+        if not self.api_key:
+            raise LLMError("GOOGLE_API_KEY is not set")
+        return {"key": self.api_key}
+
+    def list_models(self, refresh=False) -> list[dict]:
+        """Models supporting ``generateContent``; fetched once per process."""
+        cache_key = (
+            self.base_url,
+            hashlib.sha256((self.api_key or "").encode()).hexdigest(),
+        )
+        with _MODEL_LOCK:
+            if not refresh and cache_key in _MODEL_LISTS:
+                return _MODEL_LISTS[cache_key]
+            models, token = [], None
+            while True:
+                params = dict(self._params(), pageSize=1000)
+                if token:
+                    params["pageToken"] = token
+                try:
+                    resp = self.session.get(
+                        self._url("models"), params=params, timeout=self.timeout
+                    )
+                except requests.RequestException as e:
+                    raise LLMError(
+                        f"list models failed: {type(e).__name__}: {e}"
+                    ) from e
+                if resp.status_code != 200:
+                    raise LLMError(
+                        f"list models failed: {resp.status_code} {resp.text[:200]}",
+                        status_code=resp.status_code,
+                    )
+                try:
+                    data = resp.json()
+                except ValueError:
+                    raise LLMError(
+                        f"list models failed: non-JSON response: {resp.text[:200]}",
+                        status_code=resp.status_code,
+                    ) from None
+                if not isinstance(data, dict):
+                    raise LLMError(f"list models failed: {str(data)[:200]}")
+                models.extend(data.get("models", []))
+                token = data.get("nextPageToken")
+                if not token:
+                    break
+            models = [
+                m
+                for m in models
+                if "generateContent" in m.get("supportedGenerationMethods", [])
+            ]
+            _MODEL_LISTS[cache_key] = models
+            return models
+
+    def model_names(self) -> list[str]:
+        return [m["name"].removeprefix("models/") for m in self.list_models()]
+
+    def _call(self, model, prompt, config, system):
+        payload = {"contents": [{"role": "user", "parts": [{"text": prompt}]}]}
+        if config:
+            payload["generationConfig"] = config
+        if system:
+            payload["systemInstruction"] = {"parts": [{"text": system}]}
+        params = self._params()
+        with self._inflight_lock:
+            self.calls += 1
+        try:
+            resp = self.session.post(
+                self._url(f"models/{model}:generateContent"),
+                params=params,
+                json=payload,
+                timeout=self.timeout,
+            )
+        except requests.RequestException as e:
+            raise LLMError(f"{model}: {type(e).__name__}: {e}", model=model) from e
+        if resp.status_code != 200:
+            raise LLMError(
+                f"{model}: {resp.status_code} {resp.text[:200]}",
+                model=model,
+                status_code=resp.status_code,
+            )
+        try:
+            data = resp.json()
+        except ValueError:
+            raise LLMError(
+                f"{model}: non-JSON response: {resp.text[:200]}",
+                model=model,
+                status_code=resp.status_code,
+            ) from None
+        return response_text(data, model)
+
+    def generate(
+        self, prompt, model=None, config=None, system=None, refresh=False
+    ) -> str:
+        """Return the model's text for ``prompt``, from the cache when possible.
+
+        Identical requests issued concurrently from several threads share one
+        API call.
+        """
+        model = (model or self.model).removeprefix("models/")
+        key = request_key(model, prompt, config, system)
+        if self.cache is not None and not refresh:
+            text = self.cache.get(key)
+            if text is not None:
+                return text
+
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner and self.cache is not None and not refresh:
+                # A call that finished since the check above has already
+                # stored its answer and left ``_inflight``.
+                text = self.cache.get(key)
+                if text is not None:
+                    return text
+            if owner:
+                future = self._inflight[key] = Future()
+        if not owner:
+            return future.result()
+
+        try:
+            text = self._call(model, prompt, config, system)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            if self.cache is not None and text:
+                self.cache.put(key, model, text)
+            future.set_result(text)
+            return text
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
@@ -0,0 +1,284 @@
+"""Bounded, concurrent fetch → parse → LLM → sink pipeline.
+
+``FBrefScraper.scrape_and_analyze`` and the marimo scrapers handle one URL at
+a time: fetch, sleep, parse, ask Gemini, write. ``Pipeline`` runs each stage
+with its own number of asyncio workers and a bounded queue in front of it, so
+while Gemini works on one page the next pages are already being fetched and
+parsed, and a slow stage makes the earlier ones wait instead of piling up
+HTML in memory. Every stage records throughput, queue depth and latency
+percentiles::
+
+    from sciprog.scraping import Crawler
+    from sciprog.scraping.pipeline import scrape_pipeline
+
+    crawler = Crawler()
+    pipeline = scrape_pipeline(crawler, fetch_workers=8, llm_workers=2)
+    results = pipeline.run_sync(match_urls)
+    print(pipeline.report())
+
+Stage functions may be plain functions (run in a thread pool, since the Steel
+and Gemini clients are blocking) or coroutines. Returning ``None`` drops the
+item; a stage built with ``many=True`` returns an iterable of items.
+"""
+
+import asyncio
+import inspect
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+import numpy as np
+
+_DONE = object()
+
+
+@dataclass
+class Stage:
+    name: str
+    func: object
+    workers: int = 1
+    queue_size: int = 16
+    many: bool = False
+
+
+@dataclass
+class StageMetrics:
+    name: str
+    workers: int
+    processed: int = 0
+    errors: int = 0
+    busy: float = 0.0
+    max_depth: int = 0
+    latencies: deque = field(default_factory=lambda: deque(maxlen=10_000))
+    depths: deque = field(default_factory=lambda: deque(maxlen=10_000))
+
+    def percentile(self, q) -> float:
+        return float(np.percentile(self.latencies, q)) if self.latencies else 0.0
+
+    def as_dict(self, elapsed) -> dict:
+        return {
+            "stage": self.name,
+            "workers": self.workers,
+            "processed": self.processed,
+            "errors": self.errors,
+            "throughput": self.processed / elapsed if elapsed else 0.0,
+            "mean_depth": float(np.mean(self.depths)) if self.depths else 0.0,
+            "max_depth": self.max_depth,
+            "p50_ms": self.percentile(50) * 1e3,
+            "p95_ms": self.percentile(95) * 1e3,
+            "utilization": self.busy / (elapsed * self.workers) if elapsed else 0.0,
+        }
+
+
+@dataclass
+class StageError:
+    stage: str
+    item: object
+    error: BaseException
+
+
+class Pipeline:
+    def __init__(self, stages, collect=True, sample_interval=0.05):
+        """
+        Args:
+            stages: ``Stage`` list, in order
+            collect: keep the last stage's outputs and return them from ``run``
+            sample_interval: seconds between queue depth samples
+        """
+        self.stages = list(stages)
+        self.collect = collect
+        self.sample_interval = sample_interval
+        self.metrics = [StageMetrics(s.name, s.workers) for s in self.stages]
+        self.errors = []
+        self.elapsed = 0.0
+        self._executor = None
+
+    async def _call(self, stage, item):
+        if inspect.iscoroutinefunction(stage.func):
+            return await stage.func(item)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, stage.func, item)
+
+    async def _worker(self, stage, metrics, inbox, outbox):
+        while True:
+            item = await inbox.get()
+            if item is _DONE:
+                return
+            start = time.perf_counter()
+            try:
+                result = await self._call(stage, item)
+            except Exception as e:
+                metrics.errors += 1
+                self.errors.append(StageError(stage.name, item, e))
+                continue
+            finally:
+                took = time.perf_counter() - start
+                metrics.busy += took
+                metrics.latencies.append(took)
+            metrics.processed += 1
+            if result is None:
+                continue
+            for out in result if stage.many else (result,):
+                await outbox.put(out)
+
+    async def _stage(self, stage, metrics, inbox, outbox, downstream_workers):
+        await asyncio.gather(
+            *(self._worker(stage, metrics, inbox, outbox) for _ in range(stage.workers))
+        )
+        for _ in range(downstream_workers):
+            await outbox.put(_DONE)
+
+    async def _feed(self, items, inbox, workers):
+        try:
+            if hasattr(items, "__aiter__"):
+                async for item in items:
+                    await inbox.put(item)
+            else:
+                for item in items:
+                    await inbox.put(item)
+        finally:
+            # Also when the source raises, or the workers would wait forever.
+            for _ in range(workers):
+                await inbox.put(_DONE)
+
+    async def _sample(self, queues):
+        while True:
+            for metrics, queue in zip(self.metrics, queues):
+                depth = queue.qsize()
+                metrics.depths.append(depth)
+                metrics.max_depth = max(metrics.max_depth, depth)
+            await asyncio.sleep(self.sample_interval)
+
+    async def run(self, items) -> list:
+        """Push ``items`` (iterable or async iterable) through every stage.
+
+        Metrics and errors are reset at the start of every run. An exception
+        from ``items`` itself stops the run and is raised here.
+        """
+        self.metrics = [StageMetrics(s.name, s.workers) for s in self.stages]
+        self.errors = []
+        queues = [asyncio.Queue(maxsize=s.queue_size) for s in self.stages]
+        output = asyncio.Queue()
+        outboxes = queues[1:] + [output]
+        downstream = [s.workers for s in self.stages[1:]] + [1]
+        threads = sum(
+            s.workers for s in self.stages if not inspect.iscoroutinefunction(s.func)
+        )
+        self._executor = ThreadPoolExecutor(max_workers=max(1, threads))
+
+        start = time.perf_counter()
+        sampler = asyncio.create_task(self._sample(queues))
+        tasks = [
+            asyncio.create_task(self._feed(items, queues[0], self.stages[0].workers))
+        ]
+        for i, stage in enumerate(self.stages):
+            tasks.append(
+                asyncio.create_task(
+                    self._stage(
+                        stage, self.metrics[i], queues[i], outboxes[i], downstream[i]
+                    )
+                )
+            )
+
+        def _abort(task):
+            # A failed feed or stage task wakes the loop below.
+            if not task.cancelled() and task.exception() is not None:
+                output.put_nowait(_DONE)
+
+        for task in tasks:
+            task.add_done_callback(_abort)
+        results = []
+        try:
+            while True:
+                item = await output.get()
+                if item is _DONE:
+                    break
+                if self.collect:
+                    results.append(item)
+            for task in tasks:
+                if task.done() and not task.cancelled() and task.exception():
+                    raise task.exception()
+            await asyncio.gather(*tasks)
+        finally:
+            sampler.cancel()
+            for task in tasks:
+                task.cancel()
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self.elapsed = time.perf_counter() - start
+        return results
+
+    def run_sync(self, items) -> list:
+        return asyncio.run(self.run(items))
+
+    def stats(self) -> list[dict]:
+        return [m.as_dict(self.elapsed) for m in self.metrics]
+
+    def report(self) -> str:
+        rows = self.stats()
+        lines = [
+            f"{'stage':<10} {'n':>5} {'err':>4} {'items/s':>8} {'depth':>6}"
+            f" {'max':>4} {'p50 ms':>8} {'p95 ms':>8} {'busy':>5}"
+        ]
+        for r in rows:
+            lines.append(
+                f"{r['stage']:<10} {r['processed']:>5} {r['errors']:>4}"
+                f" {r['throughput']:>8.1f} {r['mean_depth']:>6.1f} {r['max_depth']:>4}"
+                f" {r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['utilization']:>5.0%}"
+            )
+        lines.append(f"total {self.elapsed:.2f}s, {len(self.errors)} errors")
+        return "\n".join(lines)
+
+    def to_frame(self):
+        import pandas as pd
+
+        return pd.DataFrame(self.stats()).set_index("stage")
+
+
+def scrape_pipeline(
+    crawler,
+    site=None,
+    sink=None,
+    analyze=True,
+    prompt=None,
+    fetch_workers=8,
+    parse_workers=2,
+    llm_workers=2,
+    queue_size=16,
+) -> Pipeline:
+    """fetch → parse → (Gemini) → (sink) stages on top of a ``Crawler``.
+
+    Items are URLs; each result is ``{"site", "url", "records", "analysis"}``.
+    With a ``sink`` the results are written there instead of collected.
+    """
+    from .sites import for_url, get
+
+    def spec_for(url):
+        if site is None:
+            return for_url(url)
+        return site if not isinstance(site, str) else get(site)
+
+    def fetch(url):
+        spec = spec_for(url)
+        return spec, crawler.steel.fetch(url, **spec.options)
+
+    def parse(fetched):
+        spec, page = fetched
+        return {"site": spec.name, "url": page.url, "records": spec.extract(page.html)}
+
+    def llm(row):
+        row["analysis"] = crawler.ask(site or row["site"], row["records"], prompt)
+        return row
+
+    def write(row):
+        sink.write(row)
+
+    stages = [
+        Stage("fetch", fetch, fetch_workers, queue_size),
+        Stage("parse", parse, parse_workers, queue_size),
+    ]
+    if analyze:
+        stages.append(Stage("llm", llm, llm_workers, queue_size))
+    if sink is not None:
+        stages.append(Stage("sink", write, 1, queue_size))
+    return Pipeline(stages, collect=sink is None)
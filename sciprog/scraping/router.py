@@ -0,0 +1,335 @@
+"""Route Gemini requests to the fastest healthy model, with hedging.
+
+The Lab 04 apps call ``genai.list_models()`` before every summary and then
+try ``candidate_models`` one after another, waiting for each failure before
+the next attempt (dbaric, mjovanovic, mkatavic; ``get_available_gemini_model``
+in smachiedo). ``ModelRouter`` lists the models once, keeps a latency and
+health table per model and sends each request to the fastest healthy model
+that passes a capability filter. A failure starts the next model at once; a
+request still running after the model's p95 latency gets a parallel (hedged)
+attempt on the runner-up, and whichever answers first wins::
+
+    from sciprog.scraping.router import ModelRouter
+
+    router = ModelRouter(GeminiGateway(), min_input_tokens=100_000)
+    summary = router.generate("Sažmi: ...")
+    print(router.to_frame())
+
+``ModelRouter.generate`` takes the same arguments as
+``GeminiGateway.generate``, so it can be passed as ``llm`` to ``Crawler`` or
+``BatchAnalyzer``.
+"""
+
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from .llm import DEFAULT_MODEL, GeminiGateway, LLMError, request_key
+
+EXCLUDE = r"tts|image|audio|live|embedding|aqa"
+RETRY_STATUS = frozenset({408, 429, 500, 502, 503, 504})
+
+
+@dataclass
+class ModelHealth:
+    name: str
+    input_tokens: int = 0
+    output_tokens: int = 0
+    calls: int = 0
+    failures: int = 0
+    streak: int = 0  # consecutive failures
+    down_until: float = 0.0
+    disabled: bool = False
+    ewma: float | None = None
+    latencies: deque = field(default_factory=lambda: deque(maxlen=200))
+
+    def healthy(self, now) -> bool:
+        return not self.disabled and now >= self.down_until
+
+    def percentile(self, q) -> float:
+        return float(np.percentile(self.latencies, q)) if self.latencies else 0.0
+
+    def as_dict(self, now) -> dict:
+        return {
+            "model": self.name,
+            "healthy": self.healthy(now),
+            "calls": self.calls,
+            "failures": self.failures,
+            "ewma_s": self.ewma,
+            "p50_s": self.percentile(50),
+            "p95_s": self.percentile(95),
+            "down_for_s": max(0.0, self.down_until - now),
+        }
+
+
+def _retryable(error) -> bool:
+    status = getattr(error, "status_code", None)
+    return status is None or status in RETRY_STATUS or status == 404
+
+
+class ModelRouter:
+    def __init__(
+        self,
+        gateway=None,
+        prefer=(DEFAULT_MODEL, "gemini-2.0-flash"),
+        models=None,
+        include=None,
+        exclude=EXCLUDE,
+        min_input_tokens=None,
+        min_output_tokens=None,
+        max_attempts=3,
+        hedge_quantile=95,
+        hedge_min=0.5,
+        hedge_default=10.0,
+        min_samples=10,
+        cooldown=15.0,
+        max_cooldown=300.0,
+        alpha=0.2,
+        max_workers=8,
+    ):
+        """
+        Args:
+            gateway: ``GeminiGateway`` doing the calls (cache, in-flight dedupe)
+            prefer: models to try first while there is no latency data
+            models: fixed model names instead of ``gateway.list_models()``
+            include, exclude: regexes on the model name; ``exclude`` drops
+                TTS, image, audio and embedding variants by default
+            min_input_tokens, min_output_tokens: default capability filter
+            max_attempts: models tried per request, hedges included
+            hedge_quantile: latency percentile after which a request is hedged
+            hedge_min: never hedge earlier than this many seconds
+            hedge_default: hedge delay while a model has < ``min_samples``
+            cooldown, max_cooldown: first and largest pause after a failure;
+                doubles with each consecutive failure
+            alpha: weight of the newest latency in the moving average
+            max_workers: threads for concurrent attempts
+        """
+        self.gateway = gateway or GeminiGateway()
+        self.prefer = list(prefer)
+        self.include = include
+        self.exclude = exclude
+        self.min_input_tokens = min_input_tokens
+        self.min_output_tokens = min_output_tokens
+        self.max_attempts = max_attempts
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min = hedge_min
+        self.hedge_default = hedge_default
+        self.min_samples = min_samples
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.alpha = alpha
+        self.hedges = 0
+        self.fallbacks = 0
+        self._names = models
+        self._table = None
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    # ------------------------------------------------------------------
+    # Model table
+
+    def discover(self, refresh=False) -> dict[str, ModelHealth]:
+        """Build the health table from one ``list_models`` call."""
+        with self._lock:
+            if self._table is not None and not refresh:
+                return self._table
+            if self._names is not None:
+                listed = [{"name": name} for name in self._names]
+            else:
+                listed = self.gateway.list_models(refresh=refresh)
+            old = self._table or {}
+            table = {}
+            for model in listed:
+                name = model["name"].removeprefix("models/")
+                if self.include and not re.search(self.include, name):
+                    continue
+                if self.exclude and re.search(self.exclude, name):
+                    continue
+                health = old.get(name) or ModelHealth(name)
+                health.input_tokens = model.get("inputTokenLimit", 0)
+                health.output_tokens = model.get("outputTokenLimit", 0)
+                table[name] = health
+            self._table = table
+            return table
+
+    def _capable(self, health, min_input_tokens, min_output_tokens) -> bool:
+        # Limits of 0 mean the model list did not say; do not filter on them.
+        if min_input_tokens and 0 < health.input_tokens < min_input_tokens:
+            return False
+        if min_output_tokens and 0 < health.output_tokens < min_output_tokens:
+            return False
+        return True
+
+    def ranked(self, min_input_tokens=None, min_output_tokens=None) -> list[str]:
+        """Healthy, capable models, fastest (moving average) first.
+
+        Models without latency data follow in ``prefer`` order, then in the
+        order ``list_models`` returned them.
+        """
+        table = self.discover()
+        min_input_tokens = min_input_tokens or self.min_input_tokens
+        min_output_tokens = min_output_tokens or self.min_output_tokens
+        now = time.monotonic()
+        order = {name: i for i, name in enumerate(self.prefer)}
+        with self._lock:
+            candidates = [
+                (
+                    h.ewma if h.ewma is not None else float("inf"),
+                    order.get(h.name, len(order)),
+                    i,
+                    h.name,
+                )
+                for i, h in enumerate(table.values())
+                if h.healthy(now)
+                and self._capable(h, min_input_tokens, min_output_tokens)
+            ]
+        return [name for *_, name in sorted(candidates)]
+
+    def hedge_after(self, model) -> float:
+        health = self.discover().get(model)
+        if health is None or len(health.latencies) < self.min_samples:
+            return self.hedge_default
+        return max(self.hedge_min, health.percentile(self.hedge_quantile))
+
+    def _succeeded(self, model, elapsed):
+        with self._lock:
+            health = self._table[model]
+            health.calls += 1
+            health.streak = 0
+            health.down_until = 0.0
+            health.latencies.append(elapsed)
+            if health.ewma is None:
+                health.ewma = elapsed
+            else:
+                health.ewma += self.alpha * (elapsed - health.ewma)
+
+    def _failed(self, model, error):
+        with self._lock:
+            health = self._table[model]
+            health.calls += 1
+            health.failures += 1
+            if getattr(error, "status_code", None) == 404:
+                health.disabled = True  # retired or not available to this key
+                return
+            health.streak += 1
+            pause = min(self.cooldown * 2 ** (health.streak - 1), self.max_cooldown)
+            health.down_until = time.monotonic() + pause
+
+    # ------------------------------------------------------------------
+    # Requests
+
+    def _attempt(self, model, prompt, config, system):
+        start = time.monotonic()
+        try:
+            text = self.gateway.generate(prompt, model, config, system, refresh=True)
+        except LLMError as e:
+            # A 400/401/403 is about the request or the key, not the model.
+            if _retryable(e):
+                self._failed(model, e)
+            raise
+        self._succeeded(model, time.monotonic() - start)
+        return text
+
+    def _cached(self, models, prompt, config, system):
+        cache = self.gateway.cache
+        if cache is None:
+            return None
+        for model in models:
+            text = cache.get(request_key(model, prompt, config, system))
+            if text is not None:
+                return text
+        return None
+
+    def generate(
+        self,
+        prompt,
+        model=None,
+        config=None,
+        system=None,
+        refresh=False,
+        min_input_tokens=None,
+        min_output_tokens=None,
+    ) -> str:
+        """Answer ``prompt`` with the best available model.
+
+        ``model`` pins the request to one model (no fallback). Raises
+        ``LLMError`` when every attempt failed or no model qualifies.
+        """
+        if model is not None:
+            models = [model.removeprefix("models/")]
+            table = self.discover()
+            with self._lock:
+                table.setdefault(models[0], ModelHealth(models[0]))
+        else:
+            models = self.ranked(min_input_tokens, min_output_tokens)
+        if not models:
+            raise LLMError("no healthy model matches the capability filter")
+        models = models[: self.max_attempts]
+        if not refresh:
+            text = self._cached(models, prompt, config, system)
+            if text is not None:
+                return text
+
+        waiting = iter(models)
+        pending = {}
+        errors = []
+
+        def launch():
+            name = next(waiting, None)
+            if name is not None:
+                args = (name, prompt, config, system)
+                pending[self._pool.submit(self._attempt, *args)] = name
+            return name is not None
+
+        launch()
+        hedge_at = time.monotonic() + self.hedge_after(models[0])
+        hedged = False
+        while pending:
+            timeout = None if hedged else max(0.0, hedge_at - time.monotonic())
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                hedged = True
+                if launch():
+                    self.hedges += 1
+                continue
+            for future in done:
+                pending.pop(future)
+                try:
+                    return future.result()
+                except LLMError as e:
+                    errors.append(e)
+                    if not _retryable(e):
+                        raise
+                    if launch():
+                        self.fallbacks += 1
+        raise LLMError(
+            "all models failed: " + "; ".join(str(e) for e in errors),
+            status_code=getattr(errors[-1], "status_code", None) if errors else None,
+        )
+
+    # ------------------------------------------------------------------
+    # Reporting
+
+    def stats(self) -> list[dict]:
+        now = time.monotonic()
+        with self._lock:
+            return [h.as_dict(now) for h in (self._table or {}).values()]
+
+    def to_frame(self):
+        import pandas as pd
+
+        return pd.DataFrame(self.stats()).set_index("model")
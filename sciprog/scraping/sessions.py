@@ -0,0 +1,213 @@
+"""Warm Steel browser sessions with readiness polling.
+
+``FBrefScraper.fetch_with_steel_api`` creates a session per match, waits a
+fixed ``time.sleep(5)`` for the stats tables to render, reads
+``document.documentElement.outerHTML`` and deletes the session again.
+``SteelSessionPool`` keeps a few sessions open across many URLs and, instead
+of sleeping, polls until a CSS selector is present in the page::
+
+    from sciprog.scraping import SteelClient
+    from sciprog.scraping.sessions import SteelSessionPool
+
+    with SteelSessionPool(SteelClient(), size=4) as pool:
+        pages = pool.fetch_many(match_urls, ready="table.stats_table")
+
+A session that fails or times out is released and replaced; healthy ones are
+also recycled after ``max_uses`` pages or ``max_age`` seconds, before Steel's
+own ``sessionTimeout`` closes them.
+"""
+
+import json
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from .steel import SteelClient, SteelError, SteelPage, SteelTimeout
+
+OUTER_HTML = "document.documentElement.outerHTML"
+
+
+def ready_script(selector) -> str:
+    return f"document.querySelector({json.dumps(selector)}) !== null"
+
+
+@dataclass
+class SteelSession:
+    id: str
+    created: float
+    uses: int = 0
+    broken: bool = False
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.created
+
+
+class SteelSessionPool:
+    def __init__(
+        self,
+        steel=None,
+        size=4,
+        session_timeout=300_000,
+        max_uses=50,
+        max_age=240.0,
+        poll=0.1,
+        max_poll=1.0,
+        **session_options,
+    ):
+        """
+        Args:
+            steel: ``SteelClient`` used for every call
+            size: sessions open at most (and ``fetch_many`` threads)
+            session_timeout: Steel ``sessionTimeout`` in milliseconds
+            max_uses, max_age: recycle a healthy session after this many
+                pages or seconds
+            poll, max_poll: first and largest interval between readiness checks
+            session_options: extra ``POST /v1/sessions`` fields
+                (``useProxy``, ``solveCaptcha``...)
+        """
+        self.steel = steel or SteelClient()
+        self.size = size
+        self.session_timeout = session_timeout
+        self.max_uses = max_uses
+        self.max_age = min(max_age, session_timeout / 1000)
+        self.poll = poll
+        self.max_poll = max_poll
+        self.session_options = session_options
+        self.created = 0
+        self.released = 0
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _create(self) -> SteelSession:
+        data = self.steel.post(
+            "/v1/sessions",
+            {"sessionTimeout": self.session_timeout, **self.session_options},
+        )
+        with self._lock:
+            self.created += 1
+        return SteelSession(data["id"], time.monotonic())
+
+    def _release(self, session):
+        try:
+            self.steel.delete(f"/v1/sessions/{session.id}")
+        except SteelError:
+            pass  # Steel closes it after sessionTimeout anyway.
+        with self._lock:
+            self.released += 1
+
+    def _worn(self, session) -> bool:
+        return (
+            session.broken
+            or session.uses >= self.max_uses
+            or session.age >= self.max_age
+        )
+
+    @contextmanager
+    def session(self):
+        """Borrow a live session; it is marked broken if the block raises."""
+        if self._closed:
+            raise RuntimeError("session pool is closed")
+        with self._slots:
+            session = None
+            while session is None:
+                try:
+                    session = self._idle.get_nowait()
+                except queue.Empty:
+                    session = self._create()
+                    break
+                if self._worn(session):
+                    self._release(session)
+                    session = None
+            try:
+                yield session
+            except BaseException:
+                session.broken = True
+                raise
+            finally:
+                session.uses += 1
+                if self._closed or self._worn(session):
+                    self._release(session)
+                else:
+                    self._idle.put(session)
+
+    def evaluate(self, session, command, deadline=None):
+        data = self.steel.post(
+            "/v1/sessions/evaluate",
+            {"sessionId": session.id, "command": command},
+            deadline,
+        )
+        return (data.get("result") or {}).get("value")
+
+    def wait_for(self, session, selector, timeout=30.0):
+        """Poll until ``selector`` matches, backing off up to ``max_poll``."""
+        deadline = time.monotonic() + timeout
+        interval = self.poll
+        script = ready_script(selector)
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise SteelTimeout(f"{selector!r} not present after {timeout:.1f}s")
+            if self.evaluate(session, script, remaining):
+                return
+            time.sleep(min(interval, max(0.0, deadline - time.monotonic())))
+            interval = min(interval * 1.5, self.max_poll)
+
+    def fetch(self, url, ready=None, timeout=30.0, **options) -> SteelPage:
+        """Open ``url`` in a pooled session and return its rendered HTML.
+
+        ``ready`` is a CSS selector that must be present before the HTML is
+        read (e.g. ``"table.stats_table"``); ``timeout`` bounds that wait.
+        """
+        start = time.monotonic()
+        with self.session() as session:
+            self.steel.post(
+                "/v1/scrape", {"url": url, "sessionId": session.id, **options}
+            )
+            if ready is not None:
+                self.wait_for(session, ready, timeout)
+            html = self.evaluate(session, OUTER_HTML) or ""
+        return SteelPage(
+            url=url,
+            html=html,
+            status_code=200,
+            metadata={"sessionId": session.id},
+            elapsed=time.monotonic() - start,
+        )
+
+    def fetch_many(
+        self, urls, ready=None, timeout=30.0, return_exceptions=True, **options
+    ) -> list:
+        """``fetch`` every URL on ``size`` threads; results keep input order."""
+        urls = list(urls)
+
+        def one(url):
+            try:
+                return self.fetch(url, ready, timeout, **options)
+            except SteelError as e:
+                if return_exceptions:
+                    return e
+                raise
+
+        with ThreadPoolExecutor(max_workers=max(1, self.size)) as pool:
+            return list(pool.map(one, urls))
+
+    def close(self):
+        """Release every idle session; borrowed ones are released on return."""
+        self._closed = True
+        while True:
+            try:
+                self._release(self._idle.get_nowait())
+            except queue.Empty:
+                break
@@ -0,0 +1,213 @@
+"""Append-only record sinks that keep memory flat on long crawls.
+
+Records are buffered in small batches and written out as they arrive, so a
+crawl of thousands of result pages never holds more than ``batch_size`` rows::
+
+    from sciprog.scraping.sink import open_sink
+
+    with open_sink("data/temp/njuskalo.parquet") as sink:
+        for ad in ads:
+            sink.write(ad)
+
+``.parquet`` needs ``pyarrow`` (``pip install pyarrow``); ``.csv`` and
+``.jsonl`` only use the standard library.
+"""
+
+import csv
+import json
+from pathlib import Path
+
+
+class Sink:
+    """Base class: buffers rows and hands full batches to ``_flush``."""
+
+    def __init__(self, path, batch_size=5000):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self.rows = 0
+        self._buffer = []
+
+    def write(self, record):
+        self._buffer.append(record)
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def write_many(self, records):
+        for record in records:
+            self.write(record)
+
+    def flush(self):
+        if self._buffer:
+            self._flush(self._buffer)
+            self.rows += len(self._buffer)
+            self._buffer = []
+
+    def _flush(self, batch):
+        raise NotImplementedError
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ParquetSink(Sink):
+    """One Parquet file, one row group per batch.
+
+    With a given ``schema`` every batch is cast to it: missing fields become
+    nulls and unknown fields are dropped. Otherwise the schema is inferred
+    and widened as batches arrive, the way ``RecordStore`` unifies its
+    files: when a field that was all null so far, an int column that turns
+    float or a new field widens it, the sink closes the current file and
+    continues in a new part file next to ``path``. ``close`` merges the parts
+    into ``path`` one row group at a time, so widening never reloads what was
+    already written.
+    """
+
+    def __init__(self, path, batch_size=5000, schema=None, compression="zstd"):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ImportError(
+                "ParquetSink needs pyarrow: pip install pyarrow "
+                "(or write to a .csv/.jsonl sink instead)"
+            ) from None
+        super().__init__(path, batch_size)
+        self.schema = schema
+        self.compression = compression
+        self.parts = []
+        self._fixed = schema is not None
+        self._writer = None
+
+    def _flush(self, batch):
+        import pyarrow as pa
+
+        if self._fixed:
+            table = pa.Table.from_pylist(batch, schema=self.schema)
+        else:
+            # ``from_pylist`` would only look at the first record's keys.
+            names = dict.fromkeys(key for record in batch for key in record)
+            table = pa.Table.from_pydict(
+                {name: [record.get(name) for record in batch] for name in names}
+            )
+            if self.schema is not None:
+                schema = pa.unify_schemas(
+                    [self.schema, table.schema], promote_options="permissive"
+                )
+                if not schema.equals(self.schema):
+                    self._writer.close()
+                    self._writer = None
+                    self.schema = schema
+                table = pa.Table.from_pylist(batch, schema=self.schema)
+        if self._writer is None:
+            self._open(table.schema)
+        self._writer.write_table(table)
+
+    def _open(self, schema):
+        import pyarrow.parquet as pq
+
+        path = self.path
+        if self.parts:
+            path = path.with_name(f".{path.name}.part{len(self.parts)}")
+        self.parts.append(path)
+        self.schema = schema
+        self._writer = pq.ParquetWriter(path, schema, compression=self.compression)
+
+    def _merge(self):
+        """Rewrite the parts into ``path`` under the final schema."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        merged = self.path.with_name(f".{self.path.name}.merged")
+        with pq.ParquetWriter(
+            merged, self.schema, compression=self.compression
+        ) as writer:
+            for part in self.parts:
+                file = pq.ParquetFile(part)
+                for i in range(file.num_row_groups):
+                    group = file.read_row_group(i)
+                    columns = [
+                        (
+                            group.column(f.name).cast(f.type)
+                            if f.name in group.column_names
+                            else pa.nulls(group.num_rows, f.type)
+                        )
+                        for f in self.schema
+                    ]
+                    writer.write_table(
+                        pa.Table.from_arrays(columns, schema=self.schema)
+                    )
+                file.close()
+        for part in self.parts[1:]:
+            part.unlink()
+        merged.replace(self.path)
+        self.parts = [self.path]
+
+    def close(self):
+        super().close()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if len(self.parts) > 1:
+            self._merge()
+
+
+class CSVSink(Sink):
+    """CSV with the header taken from the first record."""
+
+    def __init__(self, path, batch_size=1000, fieldnames=None, encoding="utf-8"):
+        super().__init__(path, batch_size)
+        self.fieldnames = fieldnames
+        self._file = open(self.path, "w", newline="", encoding=encoding)
+        self._writer = None
+
+    def _flush(self, batch):
+        if self._writer is None:
+            self.fieldnames = self.fieldnames or list(batch[0])
+            self._writer = csv.DictWriter(
+                self._file, self.fieldnames, extrasaction="ignore"
+            )
+            self._writer.writeheader()
+        self._writer.writerows(batch)
+        self._file.flush()
+
+    def close(self):
+        super().close()
+        self._file.close()
+
+
+class JSONLinesSink(Sink):
+    def __init__(self, path, batch_size=1000, encoding="utf-8"):
+        super().__init__(path, batch_size)
+        self._file = open(self.path, "w", encoding=encoding)
+
+    def _flush(self, batch):
+        self._file.writelines(
+            json.dumps(record, ensure_ascii=False, default=str) + "\n"
+            for record in batch
+        )
+        self._file.flush()
+
+    def close(self):
+        super().close()
+        self._file.close()
+
+
+SINKS = {".parquet": ParquetSink, ".csv": CSVSink, ".jsonl": JSONLinesSink}
+
+
+def open_sink(path, **kwargs) -> Sink:
+    """Pick the sink class from the file suffix."""
+    suffix = Path(path).suffix.lower()
+    try:
+        cls = SINKS[suffix]
+    except KeyError:
+        raise ValueError(
+            f"no sink for {suffix!r} files; use one of {', '.join(SINKS)}"
+        ) from None
+    return cls(path, **kwargs)
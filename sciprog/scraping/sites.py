@@ -0,0 +1,460 @@
+"""Declarative extractor specs for the Lab 04 target sites, and one crawler.
+
+Every Lab 04 scraper carries its own fetch, parse and Gemini code for a
+single site. Here a site is data: a URL pattern, the ``Extractor`` rules
+that pull its records, the Steel options it needs and how it paginates.
+``Crawler`` is the one runtime that serves all of them with a shared
+``SteelClient`` (pooled connections, ``PageCache``) and ``GeminiGateway``::
+
+    from sciprog.scraping.sites import Crawler
+
+    crawler = Crawler()
+    jobs = crawler.crawl("scst_jobs")                 # registered start URL
+    games = crawler.crawl("https://store.steampowered.com/search/?filter=topsellers")
+    results = crawler.crawl_many(["bbc", "jutarnji", "meteo"])
+    print(crawler.analyze(games))                     # the site's Gemini prompt
+
+Add a site with ``register(SiteSpec(...))``; ``for_url`` picks the spec whose
+``pattern`` matches a URL.
+"""
+
+import json
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+from .cache import PageCache
+from .extract import Extractor, Field, Rule
+from .incremental import digest
+from .steel import SteelClient, SteelError
+
+_NEXT = "_next"
+
+
+@dataclass
+class Pagination:
+    """How to reach further result pages.
+
+    ``param`` numbers pages through a query parameter (``?page=2``), so all
+    pages can be fetched concurrently; ``next`` is a selector for the "next"
+    link, followed one page at a time.
+    """
+
+    param: str | None = None
+    next: str | None = None
+    start: int = 1
+    max_pages: int = 1
+
+    def page_url(self, url, number) -> str:
+        parts = urlsplit(url)
+        query = [(k, v) for k, v in parse_qsl(parts.query) if k != self.param]
+        if number != self.start:
+            query.append((self.param, str(number)))
+        return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+@dataclass
+class SiteSpec:
+    name: str
+    pattern: str
+    rules: list
+    start_url: str | None = None
+    options: dict = field(default_factory=dict)
+    pagination: Pagination | None = None
+    prompt: str | None = None
+    description: str = ""
+
+    def __post_init__(self):
+        self.regex = re.compile(self.pattern)
+        rules = list(self.rules)
+        if self.pagination is not None and self.pagination.next:
+            rules.append(
+                Rule(_NEXT, None, {"href": Field(self.pagination.next, attr="href")})
+            )
+        self.extractor = Extractor(*rules)
+
+    def matches(self, url) -> bool:
+        return self.regex.search(url) is not None
+
+    def extract(self, html) -> dict:
+        return self.extractor.extract(html)
+
+
+_REGISTRY: dict[str, SiteSpec] = {}
+
+
+def register(spec) -> SiteSpec:
+    """Add (or replace) a site spec."""
+    _REGISTRY[spec.name] = spec
+    return spec
+
+
+def names() -> list[str]:
+    return sorted(_REGISTRY)
+
+
+def get(name) -> SiteSpec:
+    try:
+        return _REGISTRY[name]
+    except KeyError:
+        raise KeyError(
+            f"Unknown site {name!r}. Available: {', '.join(names())}"
+        ) from None
+
+
+def for_url(url) -> SiteSpec:
+    for spec in _REGISTRY.values():
+        if spec.matches(url):
+            return spec
+    raise KeyError(f"No site spec matches {url!r}")
+
+
+def _register_defaults():
+    register(
+        SiteSpec(
+            "njuskalo",
+            r"^https?://(www\.)?njuskalo\.hr/",
+            [
+                Rule(
+                    "ads",
+                    "li.EntityList-item",
+                    {
+                        "id": Field("h3 a", attr="name"),
+                        "title": Field("[class*=title]"),
+                        "price": Field("[class*=price]", type=float),
+                        "description": Field("[class*=description]"),
+                        "published": Field("time", attr="datetime"),
+                        "link": Field("h3 a[href]", attr="href"),
+                    },
+                )
+            ],
+            start_url="https://www.njuskalo.hr/search/?keywords=iphone",
+            options={"waitFor": 3000},
+            pagination=Pagination(param="page", max_pages=5),
+            prompt="Napiši sažetak svakog oglasa u 2 rečenice na hrvatskom jeziku.",
+            description="Njuškalo search results (smachiedo)",
+        )
+    )
+    register(
+        SiteSpec(
+            "steam",
+            r"^https?://store\.steampowered\.com/search",
+            [
+                Rule(
+                    "games",
+                    "a.search_result_row",
+                    {
+                        "id": Field(":scope", attr="data-ds-appid"),
+                        "title": Field(".title"),
+                        "released": Field(".search_released"),
+                        "review": Field(
+                            ".search_review_summary", attr="data-tooltip-html"
+                        ),
+                        "price": Field(".discount_final_price", type=float),
+                        "link": Field(":scope", attr="href"),
+                    },
+                )
+            ],
+            start_url="https://store.steampowered.com/search/?filter=topsellers",
+            pagination=Pagination(param="page", max_pages=2),
+            prompt="Ovo su trenutno najprodavanije igre na Steamu. Ukratko ih opiši.",
+            description="Steam top sellers (ajurjevic)",
+        )
+    )
+    register(
+        SiteSpec(
+            "bbc",
+            r"^https?://(www\.)?bbc\.(com|co\.uk)/news",
+            [
+                Rule(
+                    "headlines",
+                    "[data-testid$=-card]",
+                    {
+                        "title": Field("h2"),
+                        "summary": Field("p"),
+                        "link": Field("a[href]", attr="href"),
+                    },
+                )
+            ],
+            start_url="https://www.bbc.com/news",
+            prompt="Summarize the main news stories in 5 bullet points.",
+            description="BBC News front page (pkatavic, mbabic, mcovic)",
+        )
+    )
+    register(
+        SiteSpec(
+            "jutarnji",
+            r"^https?://(www\.)?jutarnji\.hr/",
+            [
+                Rule(
+                    "headlines",
+                    "article",
+                    {
+                        "title": Field("h2, h3, h4"),
+                        "link": Field("a[href]", attr="href"),
+                    },
+                )
+            ],
+            start_url="https://www.jutarnji.hr/",
+            prompt=(
+                "Sažmi glavne vijesti u 5 točaka i napiši kratak pregled dana "
+                "na hrvatskom jeziku."
+            ),
+            description="Jutarnji list front page (pkristo)",
+        )
+    )
+    register(
+        SiteSpec(
+            "meteo",
+            r"^https?://(www\.)?meteo\.hr",
+            [Rule("page", None, {"title": Field("title"), "text": Field("body")})],
+            start_url="https://meteo.hr",
+            prompt=(
+                "Napiši kratku, razumljivu vremensku prognozu na hrvatskom jeziku, "
+                "kao da si radijski voditelj."
+            ),
+            description="DHMZ forecast page (lkrvavica)",
+        )
+    )
+    register(
+        SiteSpec(
+            "scst_jobs",
+            r"^https?://(www\.)?scst\.unist\.hr/student/za-studente/ponuda-poslova",
+            [
+                Rule(
+                    "jobs",
+                    "tr",
+                    {
+                        "title": Field(".posao-naslov"),
+                        "pay": Field(".cijena"),
+                        "intro": Field(".intro"),
+                        "link": Field("a[href]", attr="href"),
+                    },
+                )
+            ],
+            start_url="https://www.scst.unist.hr/student/za-studente/ponuda-poslova",
+            prompt="Koji su od ovih studentskih poslova najbolje plaćeni?",
+            description="SCST student job board (mkaroglan)",
+        )
+    )
+    register(
+        SiteSpec(
+            "fbref",
+            r"^https?://(www\.)?fbref\.com/",
+            [
+                Rule("score", ".scorebox", {"teams": Field("strong", many=True)}),
+                Rule(
+                    "tables",
+                    "table.stats_table",
+                    {
+                        "id": Field(":scope", attr="id"),
+                        "headers": Field("thead th", many=True),
+                    },
+                    children=[
+                        Rule("rows", "tbody tr", {"cells": Field("td, th", many=True)})
+                    ],
+                ),
+                Rule("events", "div.event", {"text": Field(":scope")}),
+            ],
+            options={"waitFor": 10000},
+            prompt="Analyze this football match: result, key players and events.",
+            description="FBref match report (jmestrovic)",
+        )
+    )
+    register(
+        SiteSpec(
+            "playstation",
+            r"^https?://store\.playstation\.com/",
+            [
+                Rule(
+                    "games",
+                    "section.ems-sdk-strand li",
+                    {
+                        "title": Field("[data-qa$=product-name]"),
+                        "price": Field("[data-qa$=display-price]"),
+                        "link": Field("a[href]", attr="href"),
+                    },
+                )
+            ],
+            start_url="https://store.playstation.com/en-hr/pages/latest",
+            options={"waitFor": 5000},
+            prompt="Tell me the most interesting facts about these PlayStation games.",
+            description="PlayStation Store latest (rkrstic, dpavisic)",
+        )
+    )
+
+
+_register_defaults()
+
+
+@dataclass
+class CrawlResult:
+    site: str
+    url: str
+    records: dict = field(default_factory=dict)
+    pages: list = field(default_factory=list)
+    errors: list = field(default_factory=list)
+    digests: dict = field(default_factory=dict)
+    spec: SiteSpec | None = field(default=None, repr=False)
+
+    @property
+    def items(self) -> list:
+        """Records of the site's first rule."""
+        return next(iter(self.records.values()), [])
+
+
+class Crawler:
+    """One long-lived worker for every registered site.
+
+    Args:
+        steel: ``SteelClient``; by default one with a ``PageCache``
+        llm: ``GeminiGateway`` for ``analyze``; created on first use
+        max_workers: sites (and pages) fetched at once
+    """
+
+    def __init__(self, steel=None, llm=None, max_workers=8):
+        self.steel = steel or SteelClient(cache=PageCache())
+        self._llm = llm
+        self._llm_lock = threading.Lock()
+        self.max_workers = max_workers
+
+    @property
+    def llm(self):
+        with self._llm_lock:
+            if self._llm is None:
+                from .llm import GeminiGateway
+
+                self._llm = GeminiGateway()
+            return self._llm
+
+    def close(self):
+        self.steel.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _resolve(self, target, site=None):
+        if site is not None:
+            spec = site if isinstance(site, SiteSpec) else get(site)
+            return spec, target
+        if target in _REGISTRY:
+            spec = _REGISTRY[target]
+            if spec.start_url is None:
+                raise ValueError(f"site {target!r} has no start_url; pass a URL")
+            return spec, spec.start_url
+        return for_url(target), target
+
+    def _add_page(self, result, spec, page):
+        if isinstance(page, Exception):
+            result.errors.append(page)
+            return None
+        result.pages.append(page.url)
+        result.digests[page.url] = digest(page.html)
+        records = spec.extract(page.html)
+        for name, values in records.items():
+            if name != _NEXT:
+                result.records.setdefault(name, []).extend(values)
+        return records
+
+    def crawl(self, target, site=None, max_pages=None, refresh=False) -> CrawlResult:
+        """Fetch ``target`` (a URL or a site name) and extract its records.
+
+        Follows the site's pagination up to ``max_pages`` (default: the
+        spec's own limit). ``refresh`` bypasses the page cache.
+        """
+        spec, url = self._resolve(target, site)
+        result = CrawlResult(spec.name, url, spec=spec)
+        paging = spec.pagination
+        limit = max_pages or (paging.max_pages if paging else 1)
+
+        if paging is not None and paging.param and limit > 1:
+            urls = [
+                paging.page_url(url, n)
+                for n in range(paging.start, paging.start + limit)
+            ]
+            pages = self.steel.fetch_many(
+                urls, max_workers=self.max_workers, refresh=refresh, **spec.options
+            )
+            for page in pages:
+                self._add_page(result, spec, page)
+            return result
+
+        seen = set()
+        while url is not None and url not in seen and len(seen) < limit:
+            seen.add(url)
+            try:
+                page = self.steel.fetch(url, refresh=refresh, **spec.options)
+            except SteelError as e:
+                page = e
+            records = self._add_page(result, spec, page)
+            url = None
+            if records and records.get(_NEXT):
+                href = records[_NEXT][0]["href"]
+                url = urljoin(page.url, href) if href else None
+        return result
+
+    def crawl_many(self, targets, max_pages=None) -> list[CrawlResult]:
+        """Crawl several URLs or site names concurrently; results keep order."""
+        targets = list(targets)
+        workers = max(1, min(self.max_workers, len(targets) or 1))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(lambda t: self.crawl(t, max_pages=max_pages), targets))
+
+    def crawl_changes(self, target, store, site=None, max_pages=None, rule=None):
+        """Crawl ``target`` and return the ``Diff`` of ``rule``'s records
+        (default: the first rule) against the previous run in ``store``.
+
+        Pages are fetched fresh, never from the page cache. When a page
+        fails, the items it would have listed are unknown: nothing is
+        reported as removed and ``store`` keeps the previous run, so the
+        next complete crawl is compared against that.
+        """
+        result = self.crawl(target, site, max_pages, refresh=True)
+        rule = rule or (result.spec or get(result.site)).rules[0].name
+        complete = not result.errors
+        pages_changed = store.pages_changed(result.digests, commit=complete)
+        changes = store.diff(
+            f"{result.site}|{result.url}|{rule}",
+            result.records.get(rule, []),
+            commit=complete,
+        )
+        if not complete:
+            changes.removed = []
+        changes.pages_changed = pages_changed
+        changes.result = result
+        return changes
+
+    def ask(self, site, records, prompt=None, **generate_kwargs) -> str:
+        """Send ``records`` as JSON under the site's (or the given) prompt.
+
+        ``site`` is a registered site name or a ``SiteSpec``.
+        """
+        spec = site if isinstance(site, SiteSpec) else get(site)
+        prompt = prompt or spec.prompt
+        if not prompt:
+            raise ValueError(f"site {spec.name!r} has no prompt")
+        data = json.dumps(records, ensure_ascii=False, indent=1)
+        return self.llm.generate(f"{prompt}\n\n{data}", **generate_kwargs)
+
+    def analyze(self, result, prompt=None, **generate_kwargs) -> str:
+        """Ask Gemini about a crawl result, using the site's prompt by default."""
+        return self.ask(
+            result.spec or result.site, result.records, prompt, **generate_kwargs
+        )
+
+    def analyze_changes(self, changes, prompt=None, **generate_kwargs):
+        """Like ``analyze``, but only the new and changed items are sent.
+
+        Returns ``None`` without calling Gemini when nothing new arrived.
+        """
+        if not changes.records:
+            return None
+        result = changes.result
+        return self.ask(
+            result.spec or result.site, changes.records, prompt, **generate_kwargs
+        )
@@ -0,0 +1,333 @@
+"""Reusable Steel (``https://api.steel.dev``) scrape client.
+
+Replaces the per-notebook ``requests.post(".../v1/scrape")`` calls with one
+client that keeps a pooled HTTP session, limits the request rate with a token
+bucket, retries transient failures with jittered exponential backoff and gives
+every request a hard deadline::
+
+    from sciprog.scraping import SteelClient
+
+    with SteelClient() as steel:              # STEEL_API_KEY from the env
+        page = steel.fetch("https://www.bbc.com/news")
+        pages = steel.fetch_many(urls, max_workers=8)
+
+``base_url`` can point at ``sciprog.scraping.stub.StubSteelServer`` to run
+everything offline.
+"""
+
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+import requests
+from requests.adapters import HTTPAdapter
+
+STEEL_URL = "https://api.steel.dev"
+
+RETRY_STATUS = {408, 425, 429, 500, 502, 503, 504}
+
+
+class SteelError(Exception):
+    """A scrape failed after all retries (or with a non-retryable status)."""
+
+    def __init__(self, message, url=None, status_code=None):
+        super().__init__(message)
+        self.url = url
+        self.status_code = status_code
+
+
+class SteelTimeout(SteelError):
+    """The per-request deadline ran out."""
+
+
+@dataclass
+class SteelPage:
+    url: str
+    html: str
+    status_code: int = 200
+    metadata: dict = field(default_factory=dict)
+    elapsed: float = 0.0
+    attempts: int = 1
+    from_cache: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return bool(self.html) and self.status_code < 400
+
+
+def extract_html(data) -> str:
+    """Pull the page HTML out of a ``/v1/scrape`` JSON response.
+
+    Steel nests it under ``content.html``; older responses and other formats
+    use ``html``, ``content.body`` or a plain ``content``/``text`` string.
+    """
+    if not isinstance(data, dict):
+        return "" if data is None else str(data)
+    content = data.get("content")
+    if isinstance(content, dict):
+        for key in ("html", "body", "cleaned_html", "markdown", "text"):
+            value = content.get(key)
+            if isinstance(value, str) and value:
+                return value
+    elif isinstance(content, str) and content:
+        return content
+    for key in ("html", "text"):
+        value = data.get(key)
+        if isinstance(value, str) and value:
+            return value
+    return ""
+
+
+class TokenBucket:
+    """Thread-safe token bucket: ``rate`` requests per second, ``burst`` at once."""
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.capacity = float(burst if burst is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def acquire(self, deadline=None) -> bool:
+        """Block until a token is available; ``False`` if ``deadline`` passes first."""
+        if self.rate <= 0:
+            return True
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return True
+                wait = (1.0 - self._tokens) / self.rate
+            if deadline is not None and now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+class SteelClient:
+    def __init__(
+        self,
+        api_key=None,
+        base_url=STEEL_URL,
+        rate=5.0,
+        burst=None,
+        max_retries=3,
+        backoff=0.5,
+        max_backoff=20.0,
+        timeout=60.0,
+        deadline=120.0,
+        pool_size=16,
+        max_workers=8,
+        session=None,
+        cache=None,
+    ):
+        """
+        Args:
+            api_key: Steel key, defaults to ``STEEL_API_KEY`` from the environment
+            rate, burst: token-bucket limit shared by all threads (0 disables it)
+            max_retries: extra attempts for timeouts, connection errors, 429/5xx
+            backoff, max_backoff: base and cap (seconds) of the jittered backoff
+            timeout: socket timeout of a single attempt
+            deadline: total seconds one ``fetch`` may take, retries included
+            pool_size: HTTP connections kept alive to the Steel host
+            max_workers: default thread count for ``fetch_many``
+            cache: optional ``PageCache``; hits skip the Steel request entirely
+        """
+        self.api_key = api_key or os.getenv("STEEL_API_KEY")
+        self.base_url = base_url.rstrip("/")
+        self.limiter = TokenBucket(rate, burst)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.deadline = deadline
+        self.max_workers = max_workers
+        self.cache = cache
+
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update(
+            {
+                "steel-api-key": self.api_key or "",
+                "content-type": "application/json",
+                "accept": "application/json",
+            }
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.session.close()
+
+    def _sleep_before_retry(self, attempt, deadline, retry_after=None):
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        if time.monotonic() + delay >= deadline:
+            return False
+        time.sleep(delay)
+        return True
+
+    def post(self, path, payload, deadline=None):
+        """POST ``payload`` to ``path`` with rate limiting, retries and a deadline.
+
+        Returns the decoded JSON body.
+        """
+        return self._request("POST", path, payload, deadline)[0]
+
+    def delete(self, path, deadline=None):
+        """DELETE ``path`` (e.g. ``/v1/sessions/<id>``) with the same retries."""
+        return self._request("DELETE", path, None, deadline)[0]
+
+    @staticmethod
+    def _decode(resp, target):
+        if not resp.content:
+            return {}
+        try:
+            return resp.json()
+        except ValueError:
+            # A proxy error page or truncated body; not worth retrying.
+            raise SteelError(
+                f"Steel returned {resp.status_code} with a non-JSON body: "
+                f"{resp.text[:200]}",
+                target,
+                resp.status_code,
+            ) from None
+
+    def _request(self, method, path, payload=None, deadline=None):
+        if not self.api_key:
+            raise SteelError("STEEL_API_KEY is not set")
+        start = time.monotonic()
+        deadline = start + (deadline if deadline is not None else self.deadline)
+        url = f"{self.base_url}{path}"
+        target = (payload or {}).get("url")
+        last_error = None
+
+        for attempt in range(self.max_retries + 1):
+            if not self.limiter.acquire(deadline):
+                break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            retry_after = None
+            try:
+                resp = self.session.request(
+                    method, url, json=payload, timeout=min(self.timeout, remaining)
+                )
+            except (
+                requests.ConnectionError,
+                requests.Timeout,
+                requests.exceptions.ChunkedEncodingError,
+            ) as e:
+                last_error = SteelError(f"{type(e).__name__}: {e}", target)
+            except requests.RequestException as e:
+                # Redirect loops, invalid URLs: the same request fails again.
+                raise SteelError(f"{type(e).__name__}: {e}", target) from e
+            else:
+                if resp.status_code < 400:
+                    return self._decode(resp, target), attempt + 1
+                last_error = SteelError(
+                    f"Steel returned {resp.status_code}: {resp.text[:200]}",
+                    target,
+                    resp.status_code,
+                )
+                if resp.status_code not in RETRY_STATUS:
+                    raise last_error
+                try:
+                    retry_after = float(resp.headers.get("retry-after", ""))
+                except ValueError:
+                    retry_after = None
+            if attempt == self.max_retries:
+                break
+            if not self._sleep_before_retry(attempt, deadline, retry_after):
+                break
+
+        if last_error is None or time.monotonic() >= deadline:
+            raise SteelTimeout(
+                f"deadline of {deadline - start:.2f}s exceeded", target
+            ) from last_error
+        raise last_error
+
+    def fetch(self, url, deadline=None, refresh=False, **options) -> SteelPage:
+        """Scrape one URL. ``options`` are passed through to ``/v1/scrape``
+        (``format``, ``delay``, ``waitFor``, ``fullPage``, ``useProxy``...).
+
+        With a cache attached, a fresh entry is returned without contacting
+        Steel unless ``refresh`` is set.
+        """
+        start = time.monotonic()
+        if self.cache is not None and not refresh:
+            hit = self.cache.get(url, options)
+            if hit is not None:
+                return SteelPage(
+                    url=url,
+                    html=hit.html,
+                    status_code=hit.status_code,
+                    metadata={"etag": hit.etag, "lastModified": hit.last_modified},
+                    elapsed=time.monotonic() - start,
+                    attempts=0,
+                    from_cache=True,
+                )
+
+        data, attempts = self._request(
+            "POST", "/v1/scrape", {"url": url, **options}, deadline
+        )
+        metadata = data.get("metadata") if isinstance(data, dict) else None
+        if not isinstance(metadata, dict):
+            metadata = {}
+        page = SteelPage(
+            url=url,
+            html=extract_html(data),
+            status_code=int(metadata.get("statusCode") or 200),
+            metadata=metadata,
+            elapsed=time.monotonic() - start,
+            attempts=attempts,
+        )
+        if self.cache is not None and page.ok:
+            self.cache.put(
+                url,
+                page.html,
+                options,
+                status_code=page.status_code,
+                etag=metadata.get("etag"),
+                last_modified=metadata.get("lastModified"),
+            )
+        return page
+
+    def fetch_many(
+        self, urls, max_workers=None, deadline=None, return_exceptions=True, **options
+    ) -> list:
+        """Scrape ``urls`` concurrently; results keep the input order.
+
+        With ``return_exceptions`` (default) a failed URL yields its
+        ``SteelError`` in place of a page instead of aborting the batch.
+        """
+        urls = list(urls)
+        workers = max(1, min(max_workers or self.max_workers, len(urls) or 1))
+
+        def one(url):
+            try:
+                return self.fetch(url, deadline=deadline, **options)
+            except SteelError as e:
+                if return_exceptions:
+                    return e
+                raise
+
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(one, urls))
@@ -0,0 +1,246 @@
+"""Partitioned Parquet store for scraped records.
+
+The scrapers either print their results or dump them as timestamped JSON
+files (``njuskalo_iphone17_<timestamp>.json``). ``RecordStore`` appends typed
+rows - ``site``, ``url``, ``fetched_at``, the record's own fields and the
+optional LLM output - to Parquet files partitioned by site and day::
+
+    data/temp/records/site=njuskalo/date=2025-11-03/part-<uuid>.parquet
+
+Rows are buffered and written in batches. A site's fields may change between
+runs (a new column, an int that becomes a float); ``query`` unifies the
+schemas of the files it reads and only opens the partitions that match::
+
+    from sciprog.scraping.store import RecordStore
+
+    with RecordStore() as store:
+        store.append_result(crawler.crawl("njuskalo"), analysis=summary)
+
+    ads = RecordStore().query("njuskalo", start="2025-11-01", columns=["price"])
+
+Needs ``pyarrow`` (``pip install pyarrow``).
+"""
+
+import datetime as dt
+import json
+import threading
+import uuid
+from collections import defaultdict
+from pathlib import Path
+
+from sciprog import REPO_ROOT
+
+DEFAULT_ROOT = REPO_ROOT / "data" / "temp" / "records"
+META_COLUMNS = ("url", "fetched_at", "rule", "analysis")
+PARTITIONS = ("site", "date")
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise ImportError("RecordStore needs pyarrow: pip install pyarrow") from None
+
+
+def _cell(value):
+    """Scalars and lists of scalars stay typed; nested structures become JSON."""
+    if isinstance(value, dict):
+        return json.dumps(value, ensure_ascii=False, default=str)
+    if isinstance(value, (list, tuple)):
+        if all(v is None or isinstance(v, (str, int, float, bool)) for v in value):
+            return list(value)
+        return json.dumps(value, ensure_ascii=False, default=str)
+    return value
+
+
+def _as_date(value):
+    if value is None or isinstance(value, dt.date):
+        return value
+    return dt.date.fromisoformat(str(value)[:10])
+
+
+class RecordStore:
+    def __init__(self, root=DEFAULT_ROOT, batch_size=5000, compression="zstd"):
+        """
+        Args:
+            root: directory holding the ``site=*/date=*`` partitions
+            batch_size: buffered rows that trigger a write
+            compression: Parquet codec
+        """
+        _require_pyarrow()
+        self.root = Path(root)
+        self.batch_size = batch_size
+        self.compression = compression
+        self._buffer = defaultdict(list)
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.flush()
+
+    def append(self, site, records, url=None, rule=None, analysis=None, at=None):
+        """Buffer ``records`` (dicts) of one fetch of ``site``."""
+        at = at or dt.datetime.now(dt.timezone.utc)
+        if at.tzinfo is None:
+            at = at.replace(tzinfo=dt.timezone.utc)
+        rows = []
+        for record in records:
+            row = {"url": url, "fetched_at": at, "rule": rule, "analysis": analysis}
+            for key, value in record.items():
+                name = key if key not in META_COLUMNS + PARTITIONS else f"field_{key}"
+                row[name] = _cell(value)
+            rows.append(row)
+        with self._lock:
+            self._buffer[(site, at.date().isoformat())].extend(rows)
+            self._pending += len(rows)
+            full = self._pending >= self.batch_size
+        if full:
+            self.flush()
+
+    def append_result(self, result, analysis=None, at=None):
+        """Buffer every rule's records of a ``CrawlResult``."""
+        for rule, records in result.records.items():
+            self.append(result.site, records, result.url, rule, analysis, at)
+
+    def flush(self):
+        """Write the buffered rows, one file per partition.
+
+        A partition whose write fails (for example a column mixing numbers and
+        text) stays buffered, along with any not reached yet, and the error is
+        raised.
+        """
+        with self._lock:
+            buffer, self._buffer = self._buffer, defaultdict(list)
+            self._pending = 0
+        pending = dict(buffer)
+        try:
+            for (site, date), rows in buffer.items():
+                if rows:
+                    self._write(site, date, rows)
+                del pending[site, date]
+        finally:
+            if pending:
+                with self._lock:
+                    for key, rows in pending.items():
+                        # Ahead of anything appended while this flush ran.
+                        self._buffer[key] = rows + self._buffer[key]
+                        self._pending += len(rows)
+
+    def _write(self, site, date, rows):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        directory = self.root / f"site={site}" / f"date={date}"
+        directory.mkdir(parents=True, exist_ok=True)
+        # Records of one batch may not all carry the same fields.
+        names = dict.fromkeys(key for row in rows for key in row)
+        meta = {
+            "url": pa.string(),
+            "fetched_at": pa.timestamp("us", tz="UTC"),
+            "rule": pa.string(),
+            "analysis": pa.string(),
+        }
+        table = pa.table(
+            {
+                name: pa.array([row.get(name) for row in rows], meta.get(name))
+                for name in names
+            }
+        )
+        path = directory / f"part-{uuid.uuid4().hex}.parquet"
+        tmp = path.with_suffix(".tmp")
+        pq.write_table(table, tmp, compression=self.compression)
+        tmp.replace(path)
+
+    # ------------------------------------------------------------------
+    # Reading
+
+    def sites(self) -> list[str]:
+        return sorted(p.name.split("=", 1)[1] for p in self.root.glob("site=*"))
+
+    def files(self, site=None, start=None, end=None) -> list[Path]:
+        """Parquet files of the matching partitions (dates are inclusive)."""
+        start, end = _as_date(start), _as_date(end)
+        pattern = f"site={site}" if site is not None else "site=*"
+        files = []
+        for directory in sorted(self.root.glob(f"{pattern}/date=*")):
+            date = dt.date.fromisoformat(directory.name.split("=", 1)[1])
+            if (start is None or date >= start) and (end is None or date <= end):
+                files.extend(sorted(directory.glob("*.parquet")))
+        return files
+
+    def schema(self, site=None, start=None, end=None):
+        """The union of the file schemas, widening types that changed."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schemas = [pq.read_schema(f) for f in self.files(site, start, end)]
+        if not schemas:
+            return pa.schema([])
+        return pa.unify_schemas(schemas, promote_options="permissive")
+
+    def dataset(self, site=None, start=None, end=None):
+        """A ``pyarrow.dataset.Dataset`` over the matching partitions."""
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+
+        files = self.files(site, start, end)
+        partitioning = ds.partitioning(
+            pa.schema([("site", pa.string()), ("date", pa.string())]),
+            flavor="hive",
+        )
+        schema = self.schema(site, start, end)
+        for name in PARTITIONS:
+            schema = schema.append(pa.field(name, pa.string()))
+        return ds.dataset(
+            [str(f) for f in files],
+            schema=schema,
+            format="parquet",
+            partitioning=partitioning,
+            partition_base_dir=str(self.root),
+        )
+
+    def query(self, site=None, start=None, end=None, columns=None, filter=None):
+        """Load matching rows as a DataFrame.
+
+        Args:
+            site: one site, or ``None`` for all
+            start, end: inclusive ``date``/ISO strings bounding ``fetched_at``
+            columns: columns to read (partition columns are always allowed)
+            filter: extra ``pyarrow.dataset`` expression,
+                e.g. ``pc.field("price") < 500``
+        """
+        if not self.files(site, start, end):
+            import pandas as pd
+
+            return pd.DataFrame(columns=columns)
+        table = self.dataset(site, start, end).to_table(columns=columns, filter=filter)
+        return table.to_pandas()
+
+    def compact(self, site=None):
+        """Merge each partition's batch files into one file."""
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+
+        for directory in sorted({f.parent for f in self.files(site)}):
+            parts = sorted(directory.glob("*.parquet"))
+            if len(parts) < 2:
+                continue
+            name, date = (
+                p.name.split("=", 1)[1] for p in (directory.parent, directory)
+            )
+            schema = self.schema(name, date, date)
+            table = ds.dataset(
+                [str(p) for p in parts], schema=schema, format="parquet"
+            ).to_table()
+            path = directory / f"part-{uuid.uuid4().hex}.parquet"
+            tmp = path.with_suffix(".tmp")
+            pq.write_table(table, tmp, compression=self.compression)
+            tmp.replace(path)
+            for part in parts:
+                part.unlink()
@@ -0,0 +1,334 @@
+"""Local stand-in for the Steel ``/v1/scrape`` and session endpoints.
+
+Serves canned HTML in the same JSON shape Steel returns
+(``{"content": {"html": ...}, "metadata": {...}}``), with optional latency and
+injected failures, so clients can be exercised without an API key. Browser
+sessions (``/v1/sessions``, ``/v1/sessions/evaluate``) are simulated too: a
+page navigated to in a session only shows its full HTML ``render_delay``
+seconds later, like a page that fills its tables from JavaScript.
+
+The same server answers the Gemini ``models`` and ``generateContent`` calls
+of ``GeminiGateway``, with their own latency, so a whole scrape-and-summarize
+run works offline::
+
+    from sciprog.scraping import GeminiGateway, SteelClient
+    from sciprog.scraping.stub import StubSteelServer
+
+    with StubSteelServer({"https://example.com/": "<html>...</html>"}) as stub:
+        steel = SteelClient(api_key="test", base_url=stub.url)
+        page = steel.fetch("https://example.com/")
+        llm = GeminiGateway(api_key="test", base_url=stub.url, cache=None)
+        summary = llm.generate("Sažmi: ...")
+"""
+
+import itertools
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from .extract import Extractor, Rule
+
+LOADING_HTML = "<html><head></head><body><div id='loading'></div></body></html>"
+GEMINI_MODELS = ("gemini-2.5-flash", "gemini-2.0-flash")
+_QUERY = re.compile(r'document\.querySelector\((?P<selector>"(?:[^"\\]|\\.)*")\)')
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "StubSteel/1.0"
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; with Nagle on, the body
+    # waits for the client's delayed ACK and every answer gains ~40 ms.
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, body, headers=None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        try:
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up (deadline/timeout tests); nothing to answer.
+            pass
+
+    def _read_json(self):
+        length = int(self.headers.get("content-length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        return json.loads(raw or b"{}")
+
+    def _dispatch(self, method):
+        stub = self.server.stub
+        payload = self._read_json()
+        url = urlsplit(self.path)
+        stub.record(url.path, payload, dict(self.headers))
+        if url.path.startswith("/v1beta/"):
+            if not parse_qs(url.query).get("key"):
+                self._send_json(403, {"error": {"message": "missing API key"}})
+                return
+        elif self.headers.get("steel-api-key") is None:
+            self._send_json(401, {"error": "missing steel-api-key"})
+            return
+        handler, args = stub.route(method, url.path)
+        if handler is None:
+            self._send_json(404, {"error": f"no route {method} {url.path}"})
+            return
+        status, body, headers = handler(payload, *args)
+        self._send_json(status, body, headers)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+
+class StubSteelServer:
+    """Threaded HTTP server that mimics the parts of the Steel and Gemini
+    APIs we use.
+
+    Args:
+        pages: ``{url: html}`` or a callable ``url -> html | None``
+        latency: seconds (or ``(low, high)`` range) to wait before answering
+        fail_rate: probability of answering ``503`` to exercise retries
+        render_delay: seconds until a page opened in a session is complete
+        session_setup: seconds ``POST /v1/sessions`` takes
+        llm_latency: like ``latency``, for ``generateContent``; a dict
+            gives each model its own value
+        llm_fail_rate: like ``fail_rate``, for ``generateContent``; may be
+            a dict per model too
+        reply: callable ``(model, prompt) -> text`` for Gemini answers
+        models: Gemini model names ``GET /v1beta/models`` lists
+        host, port: bind address, port 0 picks a free one
+    """
+
+    def __init__(
+        self,
+        pages=None,
+        latency=0.0,
+        fail_rate=0.0,
+        render_delay=0.0,
+        session_setup=0.0,
+        llm_latency=0.0,
+        llm_fail_rate=0.0,
+        reply=None,
+        models=GEMINI_MODELS,
+        host="127.0.0.1",
+        port=0,
+    ):
+        self.pages = pages if pages is not None else {}
+        self.latency = latency
+        self.fail_rate = fail_rate
+        self.render_delay = render_delay
+        self.session_setup = session_setup
+        self.llm_latency = llm_latency
+        self.llm_fail_rate = llm_fail_rate
+        self.reply = reply
+        self.models = list(models)
+        self.requests = []
+        self.sessions = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        # Exact paths; a key ending in "/" also matches longer paths and
+        # passes the remainder to the handler.
+        self.routes = {
+            ("POST", "/v1/scrape"): self._scrape,
+            ("POST", "/v1/sessions"): self._create_session,
+            ("POST", "/v1/sessions/evaluate"): self._evaluate,
+            ("POST", "/v1/sessions/"): self._release_session,
+            ("DELETE", "/v1/sessions/"): self._release_session,
+            ("GET", "/v1beta/models"): self._list_models,
+            ("POST", "/v1beta/models/"): self._generate,
+        }
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def record(self, path, payload, headers):
+        with self._lock:
+            self.requests.append({"path": path, "payload": payload, "headers": headers})
+
+    def count(self, path="/v1/scrape") -> int:
+        with self._lock:
+            return sum(1 for r in self.requests if r["path"] == path)
+
+    def route(self, method, path):
+        handler = self.routes.get((method, path))
+        if handler is not None:
+            return handler, ()
+        for (verb, prefix), handler in self.routes.items():
+            if verb == method and prefix.endswith("/") and path.startswith(prefix):
+                return handler, (path[len(prefix) :],)
+        return None, ()
+
+    def _delay(self, latency):
+        if isinstance(latency, (tuple, list)):
+            latency = random.uniform(*latency)
+        if latency:
+            time.sleep(latency)
+
+    def lookup(self, url):
+        if callable(self.pages):
+            return self.pages(url)
+        return self.pages.get(url)
+
+    def _scrape(self, payload):
+        self._delay(self.latency)
+        if self.fail_rate and random.random() < self.fail_rate:
+            return 503, {"error": "stub: injected failure"}, {"retry-after": "0"}
+        url = payload.get("url", "")
+        html = self.lookup(url)
+        if html is None:
+            return 404, {"error": f"stub: no page for {url}"}, {}
+        session_id = payload.get("sessionId")
+        if session_id is not None:
+            with self._lock:
+                session = self.sessions.get(session_id)
+                if session is None:
+                    return 404, {"error": f"stub: no session {session_id}"}, {}
+                session.update(url=url, html=html, opened=time.monotonic())
+            html = LOADING_HTML
+        return (
+            200,
+            {
+                "content": {"html": html},
+                "metadata": {"statusCode": 200, "sourceURL": url, "title": ""},
+                "links": [],
+            },
+            {},
+        )
+
+    def _create_session(self, payload):
+        if self.session_setup:
+            time.sleep(self.session_setup)
+        session_id = f"stub-{next(self._ids)}"
+        with self._lock:
+            self.sessions[session_id] = {"url": None, "html": None, "opened": 0.0}
+        return 201, {"id": session_id, "status": "live", **payload}, {}
+
+    def _release_session(self, payload, rest):
+        session_id = rest.removesuffix("/release")
+        with self._lock:
+            session = self.sessions.pop(session_id, None)
+        if session is None:
+            return 404, {"error": f"stub: no session {session_id}"}, {}
+        return 200, {"id": session_id, "status": "released"}, {}
+
+    def _rendered(self, session):
+        if session["html"] is None:
+            return LOADING_HTML
+        if time.monotonic() - session["opened"] < self.render_delay:
+            return LOADING_HTML
+        return session["html"]
+
+    def _evaluate(self, payload):
+        """Understands ``document.documentElement.outerHTML`` and
+        ``document.querySelector("<css>") !== null``.
+        """
+        self._delay(self.latency)
+        with self._lock:
+            session = self.sessions.get(payload.get("sessionId"))
+        if session is None:
+            return 404, {"error": "stub: unknown session"}, {}
+        command = payload.get("command", "")
+        html = self._rendered(session)
+        if "outerHTML" in command:
+            value = html
+        else:
+            match = _QUERY.search(command)
+            if match is None:
+                return 400, {"error": f"stub: cannot evaluate {command!r}"}, {}
+            selector = json.loads(match.group("selector"))
+            value = bool(Extractor(Rule("q", selector, {})).first(html))
+        return 200, {"result": {"type": type(value).__name__, "value": value}}, {}
+
+    def _list_models(self, payload):
+        models = [
+            {
+                "name": f"models/{name}",
+                "displayName": name,
+                "inputTokenLimit": 1_048_576,
+                "outputTokenLimit": 65_536,
+                "supportedGenerationMethods": ["generateContent", "countTokens"],
+            }
+            for name in self.models
+        ]
+        return 200, {"models": models}, {}
+
+    def _generate(self, payload, rest):
+        model, _, method = rest.partition(":")
+        if method != "generateContent" or model not in self.models:
+            return 404, {"error": {"message": f"stub: no model {rest}"}}, {}
+        latency, fail_rate = self.llm_latency, self.llm_fail_rate
+        if isinstance(latency, dict):
+            latency = latency.get(model, 0.0)
+        if isinstance(fail_rate, dict):
+            fail_rate = fail_rate.get(model, 0.0)
+        self._delay(latency)
+        if fail_rate and random.random() < fail_rate:
+            return 503, {"error": {"message": "stub: model overloaded"}}, {}
+        prompt = "".join(
+            part.get("text", "")
+            for content in payload.get("contents", [])
+            for part in content.get("parts", [])
+        )
+        if self.reply is not None:
+            text = self.reply(model, prompt)
+        else:
+            text = f"[{model}] {len(prompt)} znakova: {prompt[:60]}"
+        return (
+            200,
+            {
+                "candidates": [
+                    {
+                        "content": {"role": "model", "parts": [{"text": text}]},
+                        "finishReason": "STOP",
+                    }
+                ],
+                "usageMetadata": {
+                    "promptTokenCount": len(prompt) // 4,
+                    "candidatesTokenCount": len(text) // 4,
+                },
+                "modelVersion": model,
+            },
+            {},
+        )
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._server.serve_forever, daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self):
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,265 @@
+"""Streaming HTML-to-text for LLM prompts, with a character/token budget.
+
+The scrapers call ``soup.get_text(" ", strip=True)`` on the whole page and
+then slice the result (``[:500]``, ``[:2500]``, ``[:8000]``), so navigation
+menus, cookie banners and inline scripts eat most of the budget and the full
+page is materialized first. ``html_to_text`` tokenizes the HTML in chunks,
+drops boilerplate elements as it goes, splits the rest into text blocks and
+stops reading as soon as the budget is filled::
+
+    from sciprog.scraping.text import html_to_text
+
+    prompt_text = html_to_text(page.html, max_tokens=1500)
+    best = html_to_text(page.html, max_chars=2500, rank=True)
+
+With ``rank=True`` the densest blocks (long text, few links) are kept, in
+document order; parsing then stops after ``scan_factor`` times the budget
+worth of candidate text instead of at the budget itself.
+"""
+
+import re
+from dataclasses import dataclass
+from html.parser import HTMLParser
+
+from .batching import CHARS_PER_TOKEN
+from .extract import VOID_TAGS
+
+SKIP_TAGS = frozenset(
+    "script style noscript template svg canvas iframe nav footer aside "
+    "form button select option label menu dialog".split()
+)
+# Never dropped, whatever their attributes say (``<body class="has-sidebar">``).
+CONTENT_TAGS = frozenset("html body main article".split())
+BLOCK_TAGS = frozenset(
+    "p div section article main li ul ol dl dt dd tr td th table h1 h2 h3 h4 h5 "
+    "h6 blockquote pre figure figcaption br hr summary details caption".split()
+)
+HEADING_TAGS = frozenset("h1 h2 h3 h4".split())
+# Matched against the ``-``/``_`` separated parts of each class, id and role
+# token, so ``cookie-banner`` and ``site-footer`` match but ``header`` or
+# ``download`` do not.
+BOILERPLATE = frozenset(
+    "cookie cookies consent banner navbar nav navigation menu breadcrumb "
+    "breadcrumbs footer sidebar share sharing social newsletter subscribe "
+    "advert advertisement ad ads promo related comment comments popup modal".split()
+)
+HIDDEN_TOKENS = frozenset("skip-link sr-only visually-hidden".split())
+# State classes such as ``has-sidebar`` or ``modal-open`` describe the page,
+# not a boilerplate element.
+STATE_PREFIXES = frozenset("is has no with show".split())
+STATE_SUFFIXES = frozenset("open opened active visible shown expanded on".split())
+_PARTS = re.compile(r"[-_]+")
+CHUNK = 1 << 14
+
+
+@dataclass
+class TextBlock:
+    index: int
+    tag: str
+    text: str
+    link_chars: int = 0
+
+    @property
+    def link_density(self) -> float:
+        return self.link_chars / len(self.text) if self.text else 0.0
+
+    @property
+    def score(self) -> float:
+        """Text length discounted by the share of it that is link text."""
+        return len(self.text) * (1.0 - self.link_density)
+
+
+def boilerplate_token(token) -> bool:
+    """Whether one class/id/role token names a boilerplate element."""
+    token = token.lower()
+    if token in HIDDEN_TOKENS:
+        return True
+    parts = [part for part in _PARTS.split(token) if part]
+    if not parts or parts[0] in STATE_PREFIXES or parts[-1] in STATE_SUFFIXES:
+        return False
+    return any(part in BOILERPLATE for part in parts)
+
+
+class _BlockParser(HTMLParser):
+    def __init__(self, min_words=3, max_link_density=0.5):
+        super().__init__(convert_charrefs=True)
+        self.min_words = min_words
+        self.max_link_density = max_link_density
+        self.stack = []  # (tag, skips)
+        self.skip = 0
+        self.links = 0
+        self.parts = []
+        self.link_chars = 0
+        self.blocks = []
+        self._count = 0
+
+    def _block_tag(self):
+        for tag, _ in reversed(self.stack):
+            if tag in BLOCK_TAGS:
+                return tag
+        return "body"
+
+    def _flush(self):
+        if not self.parts:
+            return
+        text = " ".join("".join(self.parts).split())
+        link_chars = self.link_chars
+        self.parts, self.link_chars = [], 0
+        if not text:
+            return
+        block = TextBlock(
+            self._count, self._block_tag(), text, min(link_chars, len(text))
+        )
+        self._count += 1
+        heading = block.tag in HEADING_TAGS
+        if not heading and len(text.split()) < self.min_words:
+            return
+        if block.link_density > self.max_link_density:
+            return
+        self.blocks.append(block)
+
+    def _inside(self, tags) -> bool:
+        return any(tag in tags for tag, _ in self.stack)
+
+    def _boilerplate(self, tag, attrs):
+        if tag in CONTENT_TAGS:
+            return False
+        if tag in SKIP_TAGS:
+            return True
+        if tag == "header" and not self._inside(("article", "main")):
+            # A page header; an article's own header holds its title.
+            return True
+        for name in ("class", "id", "role"):
+            value = attrs.get(name)
+            if value and any(boilerplate_token(t) for t in value.split()):
+                return True
+        return attrs.get("aria-hidden") == "true" or "hidden" in attrs
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if self.skip == 0 and tag in BLOCK_TAGS:
+            self._flush()
+        if tag in VOID_TAGS:
+            return
+        skips = self.skip == 0 and self._boilerplate(tag, attrs)
+        if skips:
+            self.skip += 1
+        if tag == "a":
+            self.links += 1
+        self.stack.append((tag, skips))
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in BLOCK_TAGS and self.skip == 0:
+            self._flush()
+
+    def handle_endtag(self, tag):
+        for i in range(len(self.stack) - 1, -1, -1):
+            if self.stack[i][0] == tag:
+                break
+        else:
+            return
+        while len(self.stack) > i:
+            name, skips = self.stack[-1]
+            if name in BLOCK_TAGS and self.skip == 0:
+                # Before the pop, so the block is tagged with its own element.
+                self._flush()
+            self.stack.pop()
+            if skips:
+                self.skip -= 1
+            if name == "a":
+                self.links -= 1
+
+    def handle_data(self, data):
+        if self.skip:
+            return
+        self.parts.append(data)
+        if self.links:
+            self.link_chars += len(data.strip())
+
+    def text_chars(self) -> int:
+        return sum(len(b.text) + 1 for b in self.blocks)
+
+
+def iter_chunks(html, size=CHUNK):
+    if isinstance(html, str):
+        for i in range(0, len(html), size):
+            yield html[i : i + size]
+    else:
+        yield from html
+
+
+def _budget(max_chars, max_tokens):
+    limits = [n for n in (max_chars, max_tokens and max_tokens * CHARS_PER_TOKEN) if n]
+    return min(limits) if limits else None
+
+
+def extract_blocks(
+    html, stop_after=None, min_words=3, max_link_density=0.5
+) -> list[TextBlock]:
+    """Content blocks of ``html`` (a string or an iterable of chunks).
+
+    Parsing stops at the first chunk boundary after ``stop_after`` characters
+    of block text have been collected.
+    """
+    parser = _BlockParser(min_words, max_link_density)
+    for chunk in iter_chunks(html):
+        parser.feed(chunk)
+        if stop_after is not None and parser.text_chars() >= stop_after:
+            break
+    else:
+        parser.close()
+        parser._flush()
+    return parser.blocks
+
+
+def _fill(blocks, budget, separator):
+    out, used = [], 0
+    for block in blocks:
+        cost = len(block.text) + (len(separator) if out else 0)
+        if budget is not None and used + cost > budget:
+            room = budget - used - (len(separator) if out else 0)
+            if room > 40:
+                out.append(block.text[:room].rsplit(" ", 1)[0])
+            break
+        out.append(block.text)
+        used += cost
+    return out
+
+
+def html_to_text(
+    html,
+    max_chars=None,
+    max_tokens=None,
+    rank=False,
+    scan_factor=4,
+    min_words=3,
+    max_link_density=0.5,
+    separator="\n",
+) -> str:
+    """Readable text of ``html`` within ``max_chars``/``max_tokens``.
+
+    Args:
+        html: page HTML, or an iterable of chunks (e.g. a streamed body)
+        max_chars, max_tokens: budget (tokens estimated at 4 characters)
+        rank: keep the highest-scoring blocks instead of the first ones
+        scan_factor: with ``rank``, candidate text to read per budget char
+        min_words: shorter non-heading blocks are dropped as boilerplate
+        max_link_density: blocks made mostly of link text are dropped
+    """
+    budget = _budget(max_chars, max_tokens)
+    stop_after = None
+    if budget is not None:
+        stop_after = budget * scan_factor if rank else budget
+    blocks = extract_blocks(html, stop_after, min_words, max_link_density)
+    if rank and budget is not None:
+        ranked = sorted(blocks, key=lambda b: b.score, reverse=True)
+        chosen, used = set(), 0
+        for block in ranked:
+            cost = len(block.text) + len(separator)
+            if used + cost <= budget + len(separator):
+                chosen.add(block.index)
+                used += cost
+        if not chosen and ranked:
+            chosen.add(ranked[0].index)
+        blocks = [b for b in blocks if b.index in chosen]
+    return separator.join(_fill(blocks, budget, separator))
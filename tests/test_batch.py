@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from sciprog.regression import fit_many, fit_problems, load_padded, parse_problems
+
+
+def test_fit_many_matches_polyfit_per_row():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(3, 40))
+    Y = 2.0 * X + 1.0 + rng.normal(scale=0.1, size=X.shape)
+    mask = np.ones(X.shape, dtype=bool)
+    mask[1, 25:] = False  # a shorter, zero-padded dataset
+
+    fit = fit_many(np.where(mask, X, 0.0), np.where(mask, Y, 0.0), mask)
+
+    for i in range(3):
+        slope, intercept = np.polyfit(X[i, mask[i]], Y[i, mask[i]], 1)
+        assert fit.slope[i] == pytest.approx(slope)
+        assert fit.intercept[i] == pytest.approx(intercept)
+    assert fit.n.tolist() == [40, 25, 40]
+
+
+def test_constant_x_gives_nan_slope():
+    fit = fit_many([[1.0, 1.0, 1.0]], [[1.0, 2.0, 3.0]])
+    assert np.isnan(fit.slope[0])
+
+
+def test_fit_problems_covers_every_dataset():
+    problems = parse_problems()
+    X, Y, mask = load_padded(problems)
+    fit = fit_problems()
+
+    assert len(fit) == len(problems) == 30
+    assert mask.sum(axis=1).tolist() == fit.n.tolist()
+    frame = fit.to_frame()
+    assert list(frame.columns) == ["n", "slope", "intercept", "r2", "rmse", "mae"]
+    assert (frame["r2"] <= 1.0).all()
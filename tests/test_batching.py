@@ -0,0 +1,135 @@
+import json
+import re
+import threading
+
+import pytest
+
+from sciprog.scraping import BatchAnalyzer
+from sciprog.scraping.batching import (
+    Document,
+    as_documents,
+    build_prompt,
+    pack,
+    parse_batch_response,
+)
+from sciprog.scraping.llm import LLMError
+
+
+class FakeLLM:
+    """Answers every item with its text reversed, optionally dropping some."""
+
+    def __init__(self, drop=(), fence=False):
+        self.drop = set(drop)
+        self.fence = fence
+        self.prompts = []
+        self._lock = threading.Lock()
+
+    def generate(self, prompt, model=None, config=None):
+        with self._lock:
+            self.prompts.append(prompt)
+        items = re.findall(
+            r"^### ITEM (\S+)\n(.*?)(?=\n\n### ITEM |\Z)", prompt, re.S | re.M
+        )
+        batch = len(items) > 1
+        answer = [
+            {"id": key, "result": text[::-1]}
+            for key, text in items
+            if not (batch and key in self.drop)
+        ]
+        text = json.dumps(answer)
+        return f"Evo:\n```json\n{text}\n```" if self.fence else text
+
+
+def test_as_documents_accepts_several_shapes():
+    assert as_documents({"a": "x"}) == [Document("a", "x")]
+    assert as_documents([("b", "y")]) == [Document("b", "y")]
+    assert as_documents(["z"]) == [Document("0", "z")]
+
+
+def test_pack_respects_budget_and_order():
+    docs = [Document(str(i), "x" * 40) for i in range(10)]
+    batches = pack(docs, token_budget=40)
+    assert [d.id for batch in batches for d in batch] == [str(i) for i in range(10)]
+    for batch in batches:
+        assert sum(d.tokens + 3 for d in batch) <= 40
+    assert all(len(b) <= 3 for b in pack(docs, token_budget=1000, max_items=3))
+
+
+def test_pack_truncates_oversized_documents():
+    (batch,) = pack([Document("big", "x" * 1000)], token_budget=50)
+    assert batch[0].id == "big" and batch[0].tokens < 50
+    with pytest.raises(ValueError):
+        pack([Document("a", "x")], token_budget=10, overhead_tokens=10)
+
+
+def test_parse_batch_response():
+    text = 'Sure!\n```json\n[{"id": 1, "result": "a"}, {"id": "2", "result": [1]}]\n```'
+    assert parse_batch_response(text) == {"1": "a", "2": "[1]"}
+    with pytest.raises(LLMError):
+        parse_batch_response("no array here")
+    with pytest.raises(LLMError):
+        parse_batch_response("[not json]")
+
+
+def test_build_prompt_lists_every_item():
+    prompt = build_prompt("Sažmi.", [Document("a", "x"), Document("b", "y")])
+    assert prompt.startswith("Sažmi.")
+    assert "### ITEM a\nx" in prompt and "### ITEM b\ny" in prompt
+
+
+def test_run_batches_and_preserves_order():
+    llm = FakeLLM(fence=True)
+    docs = {f"ad{i}": f"oglas {i} " * 20 for i in range(20)}
+    analyzer = BatchAnalyzer(llm, "Obrni.", token_budget=500, max_concurrency=3)
+    results = analyzer.run(docs)
+    assert list(results) == list(docs)
+    assert results == {key: text[::-1] for key, text in docs.items()}
+    assert 1 < len(llm.prompts) < len(docs)
+
+
+def test_dropped_items_are_retried_alone():
+    llm = FakeLLM(drop={"b"})
+    analyzer = BatchAnalyzer(llm, "Obrni.", token_budget=1000)
+    results = analyzer.run({"a": "abc", "b": "def", "c": "ghi"})
+    assert results == {"a": "cba", "b": "fed", "c": "ihg"}
+    assert len(llm.prompts) == 2
+
+
+def test_single_item_plain_text_answer_is_kept():
+    class PlainLLM:
+        def generate(self, prompt, model=None, config=None):
+            return "  samo tekst  "
+
+    results = BatchAnalyzer(PlainLLM(), "Sažmi.").run(["jedan"])
+    assert results == {"0": "samo tekst"}
+
+
+class FlakyLLM(FakeLLM):
+    """Fails every batch containing ``bad`` and any prompt for ``dead``."""
+
+    def __init__(self, bad, dead):
+        super().__init__()
+        self.bad, self.dead = bad, dead
+
+    def generate(self, prompt, model=None, config=None):
+        batch = prompt.count("### ITEM ") > 2
+        if f"### ITEM {self.dead}\n" in prompt or (
+            batch and f"### ITEM {self.bad}\n" in prompt
+        ):
+            with self._lock:
+                self.prompts.append(prompt)
+            raise LLMError("503 overloaded", status_code=503)
+        return super().generate(prompt, model, config)
+
+
+def test_failed_batch_keeps_other_batches_and_retries_its_items():
+    llm = FlakyLLM(bad="d3", dead="d7")
+    docs = {f"d{i}": f"oglas {i} " * 20 for i in range(12)}
+    analyzer = BatchAnalyzer(llm, "Obrni.", max_items=4, max_concurrency=2)
+    results = analyzer.run(docs)
+    assert list(results) == list(docs)
+    assert results["d7"] is None and list(analyzer.errors) == ["d7"]
+    assert analyzer.errors["d7"].status_code == 503
+    for key, text in docs.items():
+        if key != "d7":
+            assert results[key] == text[::-1]
@@ -0,0 +1,80 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from sciprog import REPO_ROOT
+
+sys.path.insert(0, str(REPO_ROOT / "benchmarks"))
+
+import bench_extract  # noqa: E402
+import bench_scrape  # noqa: E402
+import harness  # noqa: E402
+
+
+def test_pedantic_times_every_round():
+    calls = []
+    bench = harness.Benchmark("b")
+    result = bench.pedantic(
+        calls.append,
+        (1,),
+        setup=lambda: ((2,), {}),
+        rounds=3,
+        iterations=2,
+        warmup_rounds=1,
+    )
+    assert result is None and calls == [1] + [2] * 6
+    bench.extra_info["pages"] = 4
+    stats = bench.stats()
+    assert stats["rounds"] == 3 and stats["min"] <= stats["median"] <= stats["max"]
+    assert stats["pages_per_s"] == pytest.approx(4 / stats["median"])
+
+
+def test_collect_expands_parameters():
+    names = [name for name, _, _ in harness.collect([bench_scrape], "parse")]
+    assert names == [f"bench_parse[{site}]" for site in bench_scrape.URLS]
+
+
+def test_every_fixture_parses_with_its_site_spec():
+    benches = harness.collect([bench_scrape], "parse")
+    for stats in harness.run(benches, rounds=1, warmup=0):
+        assert stats["extra_info"]["records"] > 0, stats["name"]
+
+
+def test_extractor_matches_the_bs4_baselines(capsys):
+    bench_extract.main(["-n", "1"])
+    lines = capsys.readouterr().out.splitlines()
+    assert [line.split()[0] for line in lines[1:]] == ["steam", "njuskalo", "fbref"]
+
+
+def test_save_previous_and_compare(tmp_path, monkeypatch):
+    monkeypatch.setattr(harness, "commit_id", lambda: "aaa")
+    old = [{"name": "x", "median": 1.0}, {"name": "y", "median": 1.0}]
+    harness.save(old, tmp_path)
+    monkeypatch.setattr(harness, "commit_id", lambda: "bbb")
+    path = harness.save([{"name": "x", "median": 2.0}], tmp_path)
+    assert path.name == "0002_bbb.json"
+    assert json.loads(path.read_text())["commit"] == "bbb"
+
+    baseline = harness.previous(tmp_path, commit="bbb")
+    assert baseline["commit"] == "aaa"
+    assert harness.previous(tmp_path, commit="ccc")["commit"] == "bbb"
+    (row,) = harness.compare([{"name": "x", "median": 1.05}], baseline)
+    assert row["change"] == pytest.approx(0.05) and not row["regressed"]
+    (row,) = harness.compare([{"name": "x", "median": 1.5}], baseline)
+    assert row["regressed"]
+
+
+@pytest.mark.parametrize("script", ["bench_extract.py", "bench_scrape.py"])
+def test_scripts_run_from_the_repo_root_without_install(script):
+    env = {k: v for k, v in os.environ.items() if k != "PYTHONPATH"}
+    proc = subprocess.run(
+        [sys.executable, f"benchmarks/{script}", "--help"],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    assert proc.returncode == 0, proc.stderr
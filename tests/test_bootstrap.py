@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from sciprog import REPO_ROOT
+from sciprog.regression import bootstrap_coefficients, bootstrap_ols
+
+MARKETING = REPO_ROOT / "labs" / "03" / "marketing.csv"
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(3)
+    X = rng.normal(size=(50, 2)) * [1.0, 100.0]
+    y = 2 + X @ [1.5, -0.01] + rng.normal(0, 0.5, 50)
+    return X, y
+
+
+def test_replicates_match_refitting_each_resample(data):
+    X, y = data
+    boot = bootstrap_ols(X, y, B=40, seed=5, n_jobs=1, max_cells=50 * 16)
+    assert boot.replicates.shape == (40, 3) and boot.names == ["const", "x0", "x1"]
+    A = np.column_stack([np.ones(len(X)), X])
+    np.testing.assert_allclose(boot.estimate, np.linalg.lstsq(A, y, rcond=None)[0])
+
+    children = np.random.SeedSequence(5).spawn(3)
+    sizes = [16, 16, 8]
+    expected = []
+    for child, size in zip(children, sizes):
+        idx = np.random.default_rng(child).integers(0, len(y), size=(size, len(y)))
+        for rows in idx:
+            expected.append(np.linalg.lstsq(A[rows], y[rows], rcond=None)[0])
+    np.testing.assert_allclose(boot.replicates, expected, rtol=1e-8, atol=1e-10)
+
+
+def test_results_do_not_depend_on_n_jobs(data):
+    X, y = data
+    one = bootstrap_ols(X, y, B=300, seed=2, n_jobs=1, max_cells=50 * 64)
+    two = bootstrap_ols(X, y, B=300, seed=2, n_jobs=2, max_cells=50 * 64)
+    np.testing.assert_array_equal(one.replicates, two.replicates)
+
+
+def test_intervals():
+    data = pd.read_csv(MARKETING)
+    boot = bootstrap_coefficients(data, "Sales", B=2000, seed=1, n_jobs=1)
+    assert boot.names == ["const", "TV", "Radio", "Newspaper"]
+
+    A = np.column_stack([np.ones(len(data)), data[["TV", "Radio", "Newspaper"]]])
+    y = data["Sales"].to_numpy()
+    beta, rss, *_ = np.linalg.lstsq(A, y, rcond=None)
+    sigma2 = rss[0] / (len(y) - A.shape[1])
+    se = np.sqrt(sigma2 * np.diag(np.linalg.inv(A.T @ A)))
+    np.testing.assert_allclose(boot.estimate, beta)
+    ratio = boot.std_error / se
+    assert np.all((ratio > 0.7) & (ratio < 1.5))
+
+    for method in ("percentile", "basic", "normal"):
+        low, high = boot.ci(0.9, method)
+        assert np.all(low < boot.estimate) and np.all(boot.estimate < high)
+    frame = boot.to_frame(level=0.9)
+    assert list(frame.columns) == ["coef", "std_err", "ci_low_90%", "ci_high_90%"]
+    with pytest.raises(ValueError):
+        boot.ci(method="bca")
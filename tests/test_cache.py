@@ -0,0 +1,85 @@
+import threading
+import time
+
+from sciprog.scraping import PageCache, SteelClient
+from sciprog.scraping.stub import StubSteelServer
+
+
+def test_put_get_and_options_key(tmp_path):
+    with PageCache(tmp_path) as cache:
+        cache.put("https://a.hr/", "<p>plain</p>", etag='"v1"')
+        cache.put("https://a.hr/", "<p>waited</p>", {"waitFor": 500})
+        assert cache.get("https://a.hr/").html == "<p>plain</p>"
+        assert cache.get("https://a.hr/", {"waitFor": 500}).html == "<p>waited</p>"
+        # Transport-only options do not change the key.
+        assert cache.get("https://a.hr/", {"useProxy": True}) is not None
+        assert cache.conditional_headers("https://a.hr/") == {"If-None-Match": '"v1"'}
+
+
+def test_expired_entries_are_misses(tmp_path):
+    with PageCache(tmp_path, ttl=0.05) as cache:
+        cache.put("https://a.hr/", "<p>x</p>")
+        time.sleep(0.1)
+        assert cache.get("https://a.hr/") is None
+        assert cache.get("https://a.hr/", allow_stale=True).html == "<p>x</p>"
+
+
+def test_identical_pages_share_one_blob(tmp_path):
+    with PageCache(tmp_path) as cache:
+        cache.put("https://a.hr/1", "<p>same</p>")
+        cache.put("https://a.hr/2", "<p>same</p>")
+        assert len(cache) == 2
+        assert len(list((tmp_path / "objects").glob("*/*.html.gz"))) == 1
+        cache.delete("https://a.hr/1")
+        assert cache.get("https://a.hr/2").html == "<p>same</p>"
+        cache.delete("https://a.hr/2")
+        assert not list((tmp_path / "objects").glob("*/*"))
+
+
+def test_lru_eviction_drops_old_blobs(tmp_path):
+    pages = [f"<p>{'x' * 2000}{i}</p>" for i in range(5)]
+    with PageCache(tmp_path, max_bytes=200) as cache:
+        for i, html in enumerate(pages):
+            cache.put(f"https://a.hr/{i}", html)
+        assert cache.size() <= 200 or len(cache) == 1
+        assert cache.get("https://a.hr/4").html == pages[4]
+        assert len(list((tmp_path / "objects").glob("*/*.html.gz"))) == len(cache)
+
+
+def test_concurrent_identical_puts(tmp_path):
+    """Regression: threads writing the same blob raced on a shared tmp name,
+    and eviction could unlink a blob whose row was not inserted yet."""
+    errors = []
+    barrier = threading.Barrier(16)
+    with PageCache(tmp_path, max_bytes=4000) as cache:
+
+        def put(i):
+            try:
+                barrier.wait()
+                for j in range(20):
+                    cache.put(f"https://a.hr/same/{i}/{j}", "<p>identical</p>")
+                    cache.put(f"https://a.hr/own/{i}/{j}", f"<p>{i} {j}</p>" * 50)
+            except Exception as e:  # noqa: BLE001 - collected for the assert
+                errors.append(e)
+
+        threads = [threading.Thread(target=put, args=(i,)) for i in range(16)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert errors == []
+        blobs = {row[0] for row in cache._db.execute("SELECT blob FROM entries")}
+        assert all(cache._blob_path(blob).exists() for blob in blobs)
+        assert len(list((tmp_path / "objects").glob("*/*.html.gz"))) == len(blobs)
+    assert not list((tmp_path / "objects").glob("*/*.tmp"))
+
+
+def test_steel_client_serves_hits_from_cache(tmp_path):
+    url = "https://example.com/"
+    with StubSteelServer({url: "<p>hi</p>"}) as stub, PageCache(tmp_path) as cache:
+        steel = SteelClient(api_key="test", base_url=stub.url, rate=0, cache=cache)
+        first, second = steel.fetch(url), steel.fetch(url)
+        fresh = steel.fetch(url, refresh=True)
+    assert not first.from_cache and second.from_cache and not fresh.from_cache
+    assert stub.count() == 2
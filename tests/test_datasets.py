@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from sciprog import datasets
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(datasets, "CACHE_DIR", tmp_path / "cache")
+    return tmp_path / "cache"
+
+
+@pytest.fixture
+def toy(tmp_path):
+    path = tmp_path / "toy.csv"
+    path.write_text("x,label\n1.5,a\n2.5,b\n3.5,c\n", encoding="utf-8")
+    yield datasets.register("toy", path)
+    datasets._REGISTRY.pop("toy", None)
+
+
+def test_load_matches_read_csv(cache):
+    frame = datasets.load("marketing")
+    expected = pd.read_csv(datasets.path("marketing"))
+    pd.testing.assert_frame_equal(frame, expected)
+    assert (cache / "marketing" / datasets.MANIFEST).exists()
+
+
+def test_numeric_columns_are_memory_mapped(cache, toy):
+    arrays = datasets.load_arrays("toy")
+    assert isinstance(arrays["x"], np.memmap)
+    assert datasets.load("toy")["label"].tolist() == ["a", "b", "c"]
+
+
+def test_cache_is_rebuilt_when_source_changes(cache, toy):
+    assert datasets.load("toy")["x"].sum() == pytest.approx(7.5)
+    toy.path.write_text("x,label\n10.0,a\n", encoding="utf-8")
+    assert datasets.load("toy")["x"].tolist() == [10.0]
+
+
+def test_unknown_dataset_and_column(cache, toy):
+    with pytest.raises(KeyError, match="Available"):
+        datasets.get("nope")
+    with pytest.raises(KeyError, match="no column"):
+        datasets.load_arrays("toy", ["missing"])
@@ -0,0 +1,100 @@
+import pytest
+
+from sciprog.scraping import Extractor, Field, Rule
+from sciprog.scraping.extract import SelectorError, parse_number
+
+ADS = """
+<ul>
+  <li class="EntityList-item entity"><article>
+    <h3 class="entity-title"><a href="/oglas/1">Bicikl <b>A</b></a></h3>
+    <strong class="price price--hrk">1.299,00 €</strong>
+    <p class="entity-description-main">Rabljeno</p>
+  </article></li>
+  <li class="EntityList-item entity"><article>
+    <h3 class="entity-title"><a href="/oglas/2">Bicikl B</a></h3>
+    <strong class="price">13.717 €</strong>
+  </article></li>
+</ul>
+<table class="stats_table" id="stats">
+  <thead><tr><th>Player</th><th>Goals</th></tr></thead>
+  <tbody><tr><th>Modrić</th><td>2</td></tr><tr><th>Perišić</th><td>1</td></tr></tbody>
+</table>
+"""
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("1.299,00 €", 1299.0),
+        ("$1,299.00", 1299.0),
+        ("13.717 €", 13717.0),
+        ("12.5", 12.5),
+        ("12,50 kn", 12.5),
+        ("1,299", 1299.0),
+        ("-3", -3.0),
+    ],
+)
+def test_parse_number(text, expected):
+    assert parse_number(text) == expected
+
+
+def test_fields_and_types():
+    ads = Extractor(
+        Rule(
+            "ads",
+            "li[class~=entity]",
+            {
+                "title": "[class*=title]",
+                "price": Field("[class*=price]", type=float),
+                "euros": Field("[class*=price]", type=int),
+                "description": Field("p[class*=desc]", default="-"),
+                "link": Field("a[href]", attr="href"),
+            },
+        )
+    ).first(ADS)
+    assert [ad["title"] for ad in ads] == ["Bicikl A", "Bicikl B"]
+    assert [ad["price"] for ad in ads] == [1299.0, 13717.0]
+    # Decimal separators are read before the integer conversion.
+    assert [ad["euros"] for ad in ads] == [1299, 13717]
+    assert [ad["description"] for ad in ads] == ["Rabljeno", "-"]
+    assert [ad["link"] for ad in ads] == ["/oglas/1", "/oglas/2"]
+
+
+def test_unparseable_values_fall_back_to_default():
+    (record,) = Extractor(
+        Rule("x", None, {"n": Field("p", type=int, default=0)})
+    ).first("<p>n/a</p>")
+    assert record == {"n": 0}
+
+
+def test_nested_rules_keep_rows_under_their_table():
+    (table,) = Extractor(
+        Rule(
+            "tables",
+            "table.stats_table",
+            {"id": Field(":scope", attr="id"), "headers": Field("thead th", many=True)},
+            children=[
+                Rule("rows", "tbody > tr", {"cells": Field("td, th", many=True)})
+            ],
+        )
+    ).first(ADS)
+    assert table["id"] == "stats"
+    assert table["headers"] == ["Player", "Goals"]
+    assert [row["cells"] for row in table["rows"]] == [
+        ["Modrić", "2"],
+        ["Perišić", "1"],
+    ]
+
+
+def test_several_rules_in_one_pass():
+    result = Extractor(
+        Rule("titles", "h3", {"text": ":scope"}),
+        Rule("tables", "table", {"id": Field(":scope", attr="id")}),
+    ).extract(ADS)
+    assert len(result["titles"]) == 2
+    assert result["tables"] == [{"id": "stats"}]
+
+
+def test_bad_selector_raises():
+    with pytest.raises(SelectorError):
+        Field("a:hover")
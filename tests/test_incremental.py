@@ -0,0 +1,88 @@
+import pytest
+
+from sciprog.scraping import FingerprintStore, PageCache, SteelClient
+from sciprog.scraping.extract import Field, Rule
+from sciprog.scraping.incremental import item_key
+from sciprog.scraping.sites import Crawler, Pagination, SiteSpec
+from sciprog.scraping.stub import StubSteelServer
+
+SHOP = SiteSpec(
+    "test_listing",
+    r"^https://listing\.test/",
+    [Rule("ads", "li", {"id": Field(":scope", attr="id"), "price": Field("b")})],
+    pagination=Pagination(param="page", max_pages=2),
+)
+PAGE_1, PAGE_2 = "https://listing.test/", "https://listing.test/?page=2"
+
+
+def _ads(**prices):
+    return "".join(
+        f'<li id="{key}"><b>{price}</b></li>' for key, price in prices.items()
+    )
+
+
+def test_item_key_prefers_identifying_fields():
+    assert item_key({"id": 7, "link": "/a"}) == "7"
+    assert item_key({"id": "", "link": "/a"}) == "/a"
+    assert item_key({"x": 1}) == item_key({"x": 1}) != item_key({"x": 2})
+
+
+def test_diff_new_changed_removed():
+    with FingerprintStore(":memory:", ignore=("seen",)) as store:
+        first = store.diff("s", [{"id": 1, "p": 10}, {"id": 2, "p": 20}])
+        assert len(first.new) == 2 and bool(first)
+        second = store.diff(
+            "s", [{"id": 1, "p": 10, "seen": "now"}, {"id": 3, "p": 30}]
+        )
+        assert second.unchanged == 1
+        assert second.new == [{"id": 3, "p": 30}] and second.removed == ["2"]
+        third = store.diff("s", [{"id": 1, "p": 11}, {"id": 3, "p": 30}], commit=False)
+        assert third.changed == [{"id": 1, "p": 11}]
+        assert store.diff("s", [{"id": 1, "p": 10}, {"id": 3, "p": 30}]).unchanged == 2
+
+
+def test_pages_changed():
+    with FingerprintStore(":memory:") as store:
+        assert store.pages_changed({"u": "a"})
+        assert not store.pages_changed({"u": "a"})
+        assert store.pages_changed({"u": "b"})
+
+
+@pytest.fixture
+def pages():
+    return {PAGE_1: _ads(a=1, b=2), PAGE_2: _ads(c=3)}
+
+
+@pytest.fixture
+def crawler(pages, tmp_path):
+    with StubSteelServer(pages) as stub:
+        steel = SteelClient(
+            api_key="test", base_url=stub.url, cache=PageCache(tmp_path), backoff=0
+        )
+        with Crawler(steel) as crawler:
+            yield crawler
+
+
+def test_failed_fetch_does_not_remove_or_commit(crawler, pages):
+    with FingerprintStore(":memory:") as store:
+        first = crawler.crawl_changes(PAGE_1, store, site=SHOP)
+        assert [ad["id"] for ad in first.new] == ["a", "b", "c"]
+
+        del pages[PAGE_2]
+        partial = crawler.crawl_changes(PAGE_1, store, site=SHOP)
+        assert partial.result.errors
+        assert partial.removed == [] and partial.unchanged == 2
+
+        pages[PAGE_2] = _ads(c=3)
+        again = crawler.crawl_changes(PAGE_1, store, site=SHOP)
+        assert not again.result.errors
+        assert again.new == [] and again.removed == [] and again.unchanged == 3
+
+
+def test_incremental_crawls_bypass_the_page_cache(crawler, pages):
+    with FingerprintStore(":memory:") as store:
+        crawler.crawl_changes(PAGE_1, store, site=SHOP)
+        pages[PAGE_1] = _ads(a=1, b=5)
+        changes = crawler.crawl_changes(PAGE_1, store, site=SHOP)
+        assert changes.pages_changed
+        assert changes.changed == [{"id": "b", "price": "5"}]
@@ -0,0 +1,62 @@
+import sys
+
+from sciprog.lazy import LazyModule, lazy_from, lazy_import, parse_importtime
+
+
+def test_lazy_import_defers_until_attribute_access(monkeypatch):
+    monkeypatch.delitem(sys.modules, "colorsys", raising=False)
+    module = lazy_import("colorsys")
+    assert isinstance(module, LazyModule)
+    assert not module.loaded
+    assert module.rgb_to_hsv(1.0, 0.0, 0.0) == (0.0, 1.0, 1.0)
+    assert module.loaded
+
+
+def test_lazy_import_returns_loaded_module():
+    import json
+
+    assert lazy_import("json") is json
+
+
+def test_headless_replaces_plotting(monkeypatch):
+    monkeypatch.setenv("SCIPROG_HEADLESS", "1")
+    monkeypatch.delitem(sys.modules, "matplotlib.pyplot", raising=False)
+    plt = lazy_import("matplotlib.pyplot")
+    fig, ax = plt.subplots()
+    ax.plot([1, 2], [3, 4])
+    assert not plt
+    assert not lazy_from("seaborn", "heatmap")(None)
+
+
+def test_headless_subplots_unpack_like_matplotlib(monkeypatch):
+    monkeypatch.setenv("SCIPROG_HEADLESS", "1")
+    plt = lazy_import("matplotlib.pyplot")
+    fig, (ax1, ax2, ax3) = plt.subplots(1, 3, figsize=(9, 3))
+    ax3.set_title("x")
+    _, axes = plt.subplots(2, 2)
+    assert axes.shape == (2, 2) and not axes[1, 0]
+    _, axes = fig.subplots(nrows=2, ncols=3, squeeze=False)
+    assert axes.shape == (2, 3)
+    assert list(plt.gca()) == []
+
+
+def test_headless_wins_over_loaded_modules(monkeypatch):
+    import colorsys
+
+    monkeypatch.setenv("SCIPROG_HEADLESS", "1")
+    monkeypatch.setitem(sys.modules, "seaborn", colorsys)
+    assert not lazy_import("seaborn")
+    assert not lazy_from("seaborn", "rgb_to_hsv")
+    assert lazy_from("colorsys", "rgb_to_hsv") is colorsys.rgb_to_hsv
+
+
+def test_parse_importtime_sums_top_level_packages():
+    stderr = "\n".join(
+        [
+            "import time: self [us] | cumulative | imported package",
+            "import time:       100 |        300 |   pandas.core",
+            "import time:       200 |       1500 | pandas",
+            "import time:        50 |        500 | numpy",
+        ]
+    )
+    assert parse_importtime(stderr) == {"pandas": 0.0015, "numpy": 0.0005}
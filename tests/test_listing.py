@@ -0,0 +1,108 @@
+import threading
+import time
+
+import pyarrow.parquet as pq
+
+from sciprog.scraping import SteelClient
+from sciprog.scraping.extract import Field, Rule
+from sciprog.scraping.listing import HostLimiter, ListingCrawler, page_numbers
+from sciprog.scraping.sink import open_sink
+from sciprog.scraping.sites import Crawler, Pagination, SiteSpec
+from sciprog.scraping.stub import StubSteelServer
+
+LISTING = "https://oglasi.test/auti"
+SPEC = SiteSpec(
+    "test_oglasi",
+    r"^https://oglasi\.test/",
+    [
+        Rule(
+            "ads",
+            "li.ad",
+            {"id": Field(":scope", attr="id"), "price": Field("b", type=float)},
+        )
+    ],
+    pagination=Pagination(param="page"),
+)
+
+
+def _page(number, last=7, per_page=3):
+    """Ads of one result page; the bar links up to two pages ahead."""
+    ads = "".join(
+        f'<li class="ad" id="{number}-{i}"><b>{"" if number == 1 else i}</b></li>'
+        for i in range(per_page)
+    )
+    bar = "".join(
+        f'<a href="/auti?page={n}">{n}</a>' for n in range(1, min(number + 2, last) + 1)
+    )
+    # Page 3 repeats a promoted ad from page 1.
+    if number == 3:
+        ads += '<li class="ad" id="1-0"><b>0</b></li>'
+    return f"<ul>{ads}</ul><nav>{bar}</nav>"
+
+
+def _pages(url, last=7):
+    if url == LISTING:
+        return _page(1, last)
+    if url.startswith(LISTING + "?page="):
+        number = int(url.rsplit("=", 1)[1])
+        # Past the last page the site shows page 1 again.
+        return _page(number if number <= last else 1, last)
+    return None
+
+
+def test_page_numbers_stay_on_the_listing_path():
+    html = (
+        '<a href="?page=2">2</a><a href="/auti?page=3">3</a>'
+        '<a href="/moto?page=4">x</a><a href="https://other.test/auti?page=5">y</a>'
+    )
+    assert page_numbers(html, LISTING) == {2, 3}
+
+
+def test_listing_crawl_streams_every_ad_once(tmp_path):
+    with StubSteelServer(_pages) as stub:
+        steel = SteelClient(api_key="test", base_url=stub.url, backoff=0)
+        crawler = ListingCrawler(SPEC, Crawler(steel), per_host=2)
+        path = tmp_path / "ads.parquet"
+        with open_sink(path, batch_size=3) as sink:
+            stats = crawler.run(LISTING, sink)
+    assert stats.items == 21 and stats.duplicates >= 1 and not stats.errors
+    assert stats.last_page >= 7
+    table = pq.read_table(path)
+    assert table.num_rows == 21 and len(set(table.column("id").to_pylist())) == 21
+    # The first batch (page 1) only had empty prices.
+    assert table.column("price").null_count == 3
+
+
+def test_listing_crawl_respects_max_pages():
+    with StubSteelServer(_pages) as stub:
+        steel = SteelClient(api_key="test", base_url=stub.url, backoff=0)
+        rows = []
+
+        class ListSink:
+            write = rows.append
+
+        stats = ListingCrawler(SPEC, Crawler(steel), max_pages=2).run(
+            LISTING, ListSink()
+        )
+    assert stats.pages == 2 and len(rows) == 6
+
+
+def test_host_limiter_caps_concurrency():
+    limiter = HostLimiter(concurrency=2)
+    active, peak, lock = [0], [0], threading.Lock()
+
+    def hit():
+        with limiter("https://a.test/x"):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+
+    threads = [threading.Thread(target=hit) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert peak[0] == 2
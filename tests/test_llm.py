@@ -0,0 +1,136 @@
+import json
+import socket
+import threading
+
+import pytest
+import requests
+
+from sciprog.scraping import GeminiGateway
+from sciprog.scraping.llm import LLMError, ResponseCache, request_key
+from sciprog.scraping.stub import StubSteelServer
+
+GENERATE = "/v1beta/models/gemini-2.5-flash:generateContent"
+
+
+def test_generate_caches_responses(tmp_path):
+    with StubSteelServer(reply=lambda model, prompt: prompt.upper()) as stub:
+        cache = ResponseCache(tmp_path / "llm.sqlite")
+        llm = GeminiGateway(api_key="test", base_url=stub.url, cache=cache)
+        assert llm.generate("sažmi") == "SAŽMI"
+        assert llm.generate("sažmi") == "SAŽMI"
+        assert llm.generate("sažmi", config={"temperature": 0.4}) == "SAŽMI"
+        assert stub.count(GENERATE) == 2
+        llm.generate("sažmi", refresh=True)
+        assert stub.count(GENERATE) == 3
+        assert llm.calls == 3
+
+
+def test_concurrent_identical_requests_share_one_call():
+    with StubSteelServer(llm_latency=0.2) as stub:
+        llm = GeminiGateway(api_key="test", base_url=stub.url, cache=None)
+        barrier = threading.Barrier(8)
+        results = []
+
+        def worker():
+            barrier.wait()
+            results.append(llm.generate("isti upit"))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(set(results)) == 1 and len(results) == 8
+        assert stub.count(GENERATE) == 1
+        assert llm.calls == 1
+
+
+class _StaleFirstCache(ResponseCache):
+    """Misses once, as if another thread stored the answer just afterwards."""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.missed = False
+
+    def get(self, key):
+        if not self.missed:
+            self.missed = True
+            return None
+        return super().get(key)
+
+
+def test_cache_is_rechecked_before_calling(tmp_path):
+    with StubSteelServer() as stub:
+        cache = _StaleFirstCache(tmp_path / "llm.sqlite")
+        key = request_key("gemini-2.5-flash", "upit")
+        cache.put(key, "gemini-2.5-flash", "spremljeno")
+        llm = GeminiGateway(api_key="test", base_url=stub.url, cache=cache)
+        assert llm.generate("upit") == "spremljeno"
+        assert stub.count(GENERATE) == 0
+
+
+def test_http_errors_raise_llm_error():
+    with StubSteelServer(llm_fail_rate=1.0) as stub:
+        llm = GeminiGateway(api_key="test", base_url=stub.url, cache=None)
+        with pytest.raises(LLMError) as info:
+            llm.generate("upit")
+        assert info.value.status_code == 503
+        with pytest.raises(LLMError):
+            llm.generate("upit", model="no-such-model")
+
+
+def test_connection_errors_raise_llm_error():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    llm = GeminiGateway(api_key="test", base_url=f"http://127.0.0.1:{port}", cache=None)
+    with pytest.raises(LLMError) as info:
+        llm.generate("upit")
+    assert info.value.model == "gemini-2.5-flash"
+    with pytest.raises(LLMError):
+        llm.list_models(refresh=True)
+
+
+def test_list_models():
+    with StubSteelServer(models=("gemini-x", "gemini-y")) as stub:
+        llm = GeminiGateway(api_key="test", base_url=stub.url, cache=None)
+        assert llm.model_names() == ["gemini-x", "gemini-y"]
+
+
+class _ScriptedSession(requests.Session):
+    """Answers each request with the next ``(status, body)`` pair."""
+
+    def __init__(self, *answers):
+        super().__init__()
+        self.answers = list(answers)
+        self.calls = 0
+
+    def request(self, method, url, **kwargs):
+        status, body = self.answers[min(self.calls, len(self.answers) - 1)]
+        self.calls += 1
+        resp = requests.Response()
+        resp.status_code = status
+        resp._content = body if isinstance(body, bytes) else json.dumps(body).encode()
+        resp.url = url
+        return resp
+
+
+def test_empty_candidate_raises_and_is_not_cached(tmp_path):
+    stopped = {"candidates": [{"content": {}, "finishReason": "SAFETY"}]}
+    answer = {"candidates": [{"content": {"parts": [{"text": "odgovor"}]}}]}
+    session = _ScriptedSession((200, stopped), (200, answer))
+    cache = ResponseCache(tmp_path / "llm.sqlite")
+    llm = GeminiGateway(api_key="test", cache=cache, session=session)
+    with pytest.raises(LLMError, match="finishReason=SAFETY") as info:
+        llm.generate("upit")
+    assert info.value.model == "gemini-2.5-flash"
+    assert len(cache) == 0
+    assert llm.generate("upit") == "odgovor" and session.calls == 2
+
+
+def test_list_models_non_json_raises_llm_error():
+    llm = GeminiGateway(
+        api_key="test", cache=None, session=_ScriptedSession((200, b"<html>"))
+    )
+    with pytest.raises(LLMError, match="non-JSON"):
+        llm.list_models(refresh=True)
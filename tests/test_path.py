@@ -0,0 +1,95 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import ElasticNet, Lasso, Ridge
+from sklearn.preprocessing import StandardScaler
+
+from sciprog import REPO_ROOT
+from sciprog.regression import expand_features, fit_path, regularization_path
+from sciprog.regression.selection import kfold_indices
+
+MARKETING = REPO_ROOT / "labs" / "03" / "marketing.csv"
+FEATURES = ["TV", "Radio", "Newspaper"]
+
+
+@pytest.fixture(scope="module")
+def data():
+    return pd.read_csv(MARKETING)
+
+
+@pytest.fixture(scope="module")
+def design(data):
+    X, names, _ = expand_features(data[FEATURES].to_numpy(dtype=float), FEATURES, 2)
+    return X, data["Sales"].to_numpy(dtype=float), names
+
+
+def _sklearn(model, alpha, l1_ratio=0.5):
+    if model == "ridge":
+        return Ridge(alpha=alpha)
+    # Converged far past the default tol, so the comparison measures fit_path.
+    if model == "lasso":
+        return Lasso(alpha=alpha, tol=1e-12, max_iter=1_000_000)
+    return ElasticNet(alpha=alpha, l1_ratio=l1_ratio, tol=1e-12, max_iter=1_000_000)
+
+
+@pytest.mark.parametrize("model", ["ridge", "lasso", "elasticnet"])
+def test_path_matches_scikit_learn(design, model):
+    X, y, names = design
+    path = fit_path(X, y, model=model, n_alphas=20, names=names, k=None)
+    scaler = StandardScaler().fit(X)
+    for i in range(1, 20):
+        reference = _sklearn(model, path.alphas[i]).fit(scaler.transform(X), y)
+        coef = reference.coef_ / scaler.scale_
+        intercept = reference.intercept_ - coef @ scaler.mean_
+        np.testing.assert_allclose(path.coef[i], coef, rtol=1e-6, atol=1e-9)
+        assert path.intercept[i] == pytest.approx(intercept, rel=1e-8)
+
+
+def test_cv_error_matches_refitting_each_fold(design):
+    X, y, _ = design
+    path = fit_path(X, y, model="lasso", n_alphas=10, k=5, seed=3)
+    Z = StandardScaler().fit_transform(X)
+    for i in (2, 6, 9):
+        mse = []
+        for test in kfold_indices(len(y), 5, 1, 3):
+            train = np.setdiff1d(np.arange(len(y)), test)
+            fitted = _sklearn("lasso", path.alphas[i]).fit(Z[train], y[train])
+            mse.append(np.mean((fitted.predict(Z[test]) - y[test]) ** 2))
+        assert path.cv_mse[i] == pytest.approx(np.mean(mse), rel=1e-6)
+    assert path.alpha_1se >= path.alpha
+
+
+@pytest.mark.parametrize("model", ["ridge", "lasso", "elasticnet"])
+def test_constant_column_is_ignored(design, model):
+    X, y, _ = design
+    X1 = np.column_stack([X[:, :3], np.full(len(y), 0.1)])
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        path = fit_path(X1, y, model=model, n_alphas=20)
+    reference = fit_path(X[:, :3], y, model=model, alphas=path.alphas)
+    assert not path.coef[:, 3].any()
+    np.testing.assert_allclose(path.coef[:, :3], reference.coef, rtol=1e-9, atol=1e-12)
+    np.testing.assert_allclose(path.cv_mse, reference.cv_mse, rtol=1e-9)
+
+
+def test_regularization_path_frame_and_model(data):
+    path = regularization_path(data, "Sales", model="lasso", degree=2, n_alphas=20)
+    frame = path.to_frame()
+    assert list(frame.columns[:2]) == ["intercept", "TV"]
+    # The grid starts where every coefficient is zero (up to rounding).
+    assert np.abs(path.coef[0]).max() < 1e-12 and frame["nonzero"].iloc[-1] > 1
+    model = path.linear_model()
+    X, _, _ = expand_features(data[FEATURES].to_numpy(dtype=float), FEATURES, 2)
+    np.testing.assert_allclose(model.predict(X), path.predict(X))
+
+
+def test_invalid_arguments(design):
+    X, y, _ = design
+    with pytest.raises(ValueError):
+        fit_path(X, y, model="ols")
+    with pytest.raises(ValueError):
+        fit_path(X, y, model="elasticnet", l1_ratio=0.0)
+    with pytest.raises(ValueError):
+        fit_path(X, y, k=None).alpha
@@ -0,0 +1,117 @@
+import asyncio
+import time
+
+import pytest
+
+from sciprog.scraping import GeminiGateway, SteelClient
+from sciprog.scraping.extract import Field, Rule
+from sciprog.scraping.pipeline import Pipeline, Stage, scrape_pipeline
+from sciprog.scraping.sites import Crawler, SiteSpec
+from sciprog.scraping.stub import StubSteelServer
+
+
+def test_stages_run_in_order_and_drop_none():
+    async def double(x):
+        return 2 * x
+
+    pipeline = Pipeline(
+        [
+            Stage("odd", lambda x: x if x % 2 else None, workers=2),
+            Stage("double", double, workers=3),
+            Stage("split", lambda x: [x, -x], many=True),
+        ]
+    )
+    results = pipeline.run_sync(range(10))
+    odd = [2 * x for x in range(1, 10, 2)]
+    assert sorted(results) == sorted(odd + [-x for x in odd])
+    processed = [m.processed for m in pipeline.metrics]
+    assert processed == [10, 5, 5]
+    assert "split" in pipeline.report()
+
+
+def test_errors_are_recorded_and_do_not_stop_the_run():
+    def parse(x):
+        if x == 3:
+            raise ValueError("bad page")
+        return x
+
+    pipeline = Pipeline([Stage("parse", parse, workers=2)])
+    assert sorted(pipeline.run_sync(range(5))) == [0, 1, 2, 4]
+    (error,) = pipeline.errors
+    assert error.stage == "parse" and error.item == 3
+    assert pipeline.stats()[0]["errors"] == 1
+
+
+def test_source_errors_reach_the_caller():
+    def source():
+        yield 1
+        raise RuntimeError("listing broke")
+
+    async def agen():
+        yield 1
+        await asyncio.sleep(0)
+        raise RuntimeError("listing broke")
+
+    for items in (source, agen):
+        pipeline = Pipeline([Stage("double", lambda x: 2 * x, workers=2)])
+        with pytest.raises(RuntimeError, match="listing broke"):
+            asyncio.run(asyncio.wait_for(pipeline.run(items()), timeout=5))
+
+
+def test_bounded_queues_hold_back_fast_stages():
+    def slow(x):
+        time.sleep(0.01)
+        return x
+
+    pipeline = Pipeline(
+        [
+            Stage("fast", lambda x: x, workers=4, queue_size=4),
+            Stage("slow", slow, queue_size=2),
+        ],
+        sample_interval=0.005,
+    )
+    assert len(pipeline.run_sync(range(30))) == 30
+    assert all(m.max_depth <= 4 for m in pipeline.metrics)
+    assert pipeline.metrics[1].max_depth <= 2
+
+
+def test_async_iterable_input():
+    async def items():
+        for i in range(3):
+            await asyncio.sleep(0)
+            yield i
+
+    pipeline = Pipeline([Stage("id", lambda x: x)], collect=False)
+    assert pipeline.run_sync(items()) == []
+    assert pipeline.metrics[0].processed == 3
+
+
+SPEC = SiteSpec(
+    "test_matches",
+    r"^https://matches\.test/",
+    [Rule("score", None, {"teams": Field("strong", many=True)})],
+    prompt="Analiziraj utakmicu.",
+)
+
+
+def test_scrape_pipeline_end_to_end():
+    pages = {
+        f"https://matches.test/{i}": f"<strong>Hajduk</strong><strong>Rijeka {i}</strong>"
+        for i in range(5)
+    }
+    rows = []
+
+    class ListSink:
+        write = rows.append
+
+    with StubSteelServer(pages, reply=lambda model, prompt: "analiza") as stub:
+        steel = SteelClient(api_key="test", base_url=stub.url)
+        llm = GeminiGateway(api_key="test", base_url=stub.url, cache=None)
+        crawler = Crawler(steel, llm)
+        pipeline = scrape_pipeline(crawler, site=SPEC, sink=ListSink())
+        assert pipeline.run_sync(list(pages) + ["https://matches.test/404"]) == []
+    assert sorted(row["url"] for row in rows) == sorted(pages)
+    assert all(row["site"] == "test_matches" for row in rows)
+    assert all(row["analysis"] == "analiza" for row in rows)
+    assert rows[0]["records"]["score"][0]["teams"][0] == "Hajduk"
+    assert [e.stage for e in pipeline.errors] == ["fetch"]
@@ -0,0 +1,34 @@
+import pytest
+
+from sciprog import datasets, plotting
+
+
+@pytest.fixture(autouse=True)
+def agg():
+    plotting.figure_pool()
+    yield
+    plotting.figure_pool().close()
+
+
+def test_figure_pool_reuses_figures():
+    pool = plotting.figure_pool()
+    fig, axes = pool.get(1, 2)
+    axes[0, 0].plot([1, 2])
+    again, axes = pool.get(1, 2)
+    assert again is fig
+    assert not axes[0, 0].lines
+
+
+def test_render_problem_fits_writes_one_png_per_problem(tmp_path):
+    written = plotting.render_problem_fits(tmp_path, n_jobs=1)
+    assert len(written) == 30
+    assert sorted(p.name for p in tmp_path.glob("*.png")) == sorted(
+        p.rsplit("/", 1)[-1] for p in written
+    )
+
+
+def test_render_pdf_with_panels(tmp_path, monkeypatch):
+    monkeypatch.setattr(datasets, "CACHE_DIR", tmp_path / "cache")
+    path = plotting.render_pdf(tmp_path / "report.pdf", datasets.load("marketing"))
+    with open(path, "rb") as f:
+        assert f.read(4) == b"%PDF"
@@ -0,0 +1,136 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from sciprog import datasets
+from sciprog.profiling import (
+    HyperLogLog,
+    Profiler,
+    TDigest,
+    profile_csv,
+    profile_frame,
+)
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    n = 2000
+    data = pd.DataFrame(
+        {
+            "x": rng.normal(10, 3, n),
+            "y": rng.exponential(2.0, n),
+            "k": rng.integers(0, 50, n),
+            "label": rng.choice(["a", "b", "c"], n),
+        }
+    )
+    data["z"] = 2 * data["x"] + rng.normal(0, 1, n)
+    data.loc[rng.choice(n, 100, replace=False), "y"] = np.nan
+    data.loc[rng.choice(n, 40, replace=False), "z"] = np.nan
+    # Duplicate rows, one of them crossing a chunk boundary.
+    return pd.concat([data, data.iloc[[3, 3, 1500]]], ignore_index=True)
+
+
+def test_tdigest_is_exact_while_small():
+    values = np.random.default_rng(1).normal(size=50)
+    digest = TDigest()
+    digest.update(values[:20])
+    digest.update(np.r_[values[20:], np.nan])
+    qs = [0, 0.1, 0.25, 0.5, 0.9, 1]
+    np.testing.assert_allclose(digest.quantile(qs), np.quantile(values, qs))
+    assert digest.count == 50 and digest.cdf(values.max()) == pytest.approx(1.0)
+    assert np.isnan(TDigest().quantile(0.5))
+
+
+def test_tdigest_merge_tracks_quantiles():
+    values = np.random.default_rng(2).lognormal(size=100_000)
+    parts = [TDigest(), TDigest()]
+    parts[0].update(values[:60_000])
+    parts[1].update(values[60_000:])
+    parts[0].merge(parts[1])
+    assert len(parts[0].means) < 200
+    for q in (0.01, 0.25, 0.5, 0.75, 0.99):
+        assert parts[0].cdf(np.quantile(values, q)) == pytest.approx(q, abs=0.005)
+
+
+def test_hyperloglog_estimates_and_merges():
+    hashes = pd.util.hash_array(np.arange(100_000)).astype(np.uint64)
+    a, b = HyperLogLog(), HyperLogLog()
+    a.add_hashes(hashes[:60_000])
+    b.add_hashes(hashes[40_000:])
+    a.merge(b)
+    assert a.count() == pytest.approx(100_000, rel=0.03)
+    small = HyperLogLog()
+    small.add_hashes(hashes[:100])
+    assert round(small.count()) == 100
+    with pytest.raises(ValueError):
+        HyperLogLog(precision=4)
+
+
+def test_profile_matches_pandas(frame):
+    profile = profile_frame(frame, chunksize=700)
+    assert profile.rows == len(frame)
+    assert profile.duplicates == frame.duplicated().sum() and profile.duplicates_exact
+    pd.testing.assert_series_equal(
+        profile.missing(), frame.isna().sum().rename("missing")
+    )
+    numeric = frame.select_dtypes("number")
+    pd.testing.assert_frame_equal(profile.corr(), numeric.corr(), rtol=1e-9)
+
+    table = profile.describe()
+    expected = numeric.describe()
+    rows = ["count", "mean", "std", "min", "max"]
+    pd.testing.assert_frame_equal(table.loc[rows], expected.loc[rows], rtol=1e-9)
+    np.testing.assert_allclose(table.loc["skew"], numeric.skew(), rtol=1e-6)
+    np.testing.assert_allclose(table.loc["kurtosis"], numeric.kurt(), rtol=1e-6)
+    quartiles = ["25%", "50%", "75%"]
+    continuous = ["x", "y", "z"]
+    np.testing.assert_allclose(
+        table.loc[quartiles, continuous], expected.loc[quartiles, continuous], rtol=0.02
+    )
+    # Ties make interpolated quantiles of an integer column off by a fraction.
+    np.testing.assert_allclose(
+        table.loc[quartiles, "k"], expected.loc[quartiles, "k"], atol=1
+    )
+    assert profile["k"].distinct == frame["k"].nunique()
+    assert profile["label"].distinct == 3 and not profile["label"].numeric
+
+
+def test_boxplot_stats_match_exact_whiskers(frame):
+    stats = profile_frame(frame)["y"].boxplot_stats()
+    y = frame["y"].dropna()
+    q1, q3 = y.quantile([0.25, 0.75])
+    inside = y[(y >= q1 - 1.5 * (q3 - q1)) & (y <= q3 + 1.5 * (q3 - q1))]
+    assert stats["whislo"] == y.min()
+    assert stats["whishi"] == pytest.approx(inside.max(), rel=0.02)
+    assert stats["outliers"] == pytest.approx(len(y) - len(inside), abs=5)
+
+
+def test_duplicates_are_estimated_past_max_tracked(frame):
+    profiler = Profiler(max_tracked=500)
+    for start in range(0, len(frame), 400):
+        profiler.update(frame.iloc[start : start + 400])
+    profile = profiler.profile()
+    assert not profile.duplicates_exact
+    assert profile.duplicates == pytest.approx(3, abs=40)
+
+
+def test_profile_csv_reads_in_chunks(tmp_path, frame):
+    path = tmp_path / "data.csv"
+    frame.to_csv(path, index=False)
+    profile = profile_csv(path, chunksize=500, usecols=["x", "k"])
+    assert [c.name for c in profile.columns] == ["x", "k"]
+    assert profile["x"].mean == pytest.approx(frame["x"].mean(), rel=1e-12)
+    assert "<table" in profile._repr_html_()
+
+
+def test_profile_csv_by_dataset_name():
+    profile = profile_csv("marketing")
+    data = pd.read_csv(datasets.path("marketing"))
+    assert profile.rows == len(data)
+    assert profile.duplicates == data.duplicated().sum()
+
+
+def test_empty_input():
+    assert profile_frame(pd.DataFrame()).rows == 0
+    assert Profiler().profile().columns == []
@@ -0,0 +1,117 @@
+import time
+
+import pytest
+
+from sciprog.scraping import GeminiGateway
+from sciprog.scraping.llm import LLMError, ResponseCache
+from sciprog.scraping.router import ModelRouter
+from sciprog.scraping.stub import StubSteelServer
+
+MODELS = ("gemini-2.0-flash", "gemini-2.5-flash", "gemini-2.5-flash-tts", "gemini-x")
+
+
+def _router(stub, cache=None, **kwargs):
+    gateway = GeminiGateway(api_key="test", base_url=stub.url, cache=cache)
+    return ModelRouter(gateway, **kwargs)
+
+
+def _reply(model, prompt):
+    return model
+
+
+def test_discovery_filters_and_prefers():
+    with StubSteelServer(models=MODELS, reply=_reply) as stub:
+        with _router(stub) as router:
+            assert router.ranked() == [
+                "gemini-2.5-flash",
+                "gemini-2.0-flash",
+                "gemini-x",
+            ]
+            assert router.ranked(min_input_tokens=10**7) == []
+            with pytest.raises(LLMError):
+                router.generate("upit", min_input_tokens=10**7)
+            assert router.generate("upit") == "gemini-2.5-flash"
+            router.discover()
+            assert stub.count("/v1beta/models") == 1
+
+
+def test_failure_falls_back_and_cools_down():
+    fail = {"gemini-2.5-flash": 1.0}
+    with StubSteelServer(models=MODELS, reply=_reply, llm_fail_rate=fail) as stub:
+        with _router(stub) as router:
+            assert router.generate("upit") == "gemini-2.0-flash"
+            assert router.fallbacks == 1
+            assert "gemini-2.5-flash" not in router.ranked()
+            stats = {row["model"]: row for row in router.stats()}
+            assert stats["gemini-2.5-flash"]["failures"] == 1
+            assert stats["gemini-2.0-flash"]["calls"] == 1
+
+
+class _StatusGateway:
+    """Fails every call with ``status``; no discovery, no cache."""
+
+    cache = None
+
+    def __init__(self, status):
+        self.status = status
+        self.calls = 0
+
+    def generate(self, prompt, model=None, config=None, system=None, refresh=False):
+        self.calls += 1
+        raise LLMError(f"{model}: {self.status}", model, self.status)
+
+
+@pytest.mark.parametrize("status", [400, 401, 403])
+def test_client_errors_leave_model_health_alone(status):
+    gateway = _StatusGateway(status)
+    with ModelRouter(
+        gateway, models=["gemini-2.5-flash", "gemini-2.0-flash"]
+    ) as router:
+        for _ in range(2):
+            with pytest.raises(LLMError) as info:
+                router.generate("predugačak upit")
+            assert info.value.status_code == status
+        assert gateway.calls == 2 and router.fallbacks == 0
+        assert router.ranked() == ["gemini-2.5-flash", "gemini-2.0-flash"]
+        assert all(row["failures"] == 0 for row in router.stats())
+
+
+def test_slow_model_is_hedged():
+    slow = {"gemini-2.5-flash": 1.5}
+    with StubSteelServer(models=MODELS, reply=_reply, llm_latency=slow) as stub:
+        with _router(stub, hedge_default=0.1) as router:
+            start = time.monotonic()
+            assert router.generate("upit") == "gemini-2.0-flash"
+            assert time.monotonic() - start < 1.0
+            assert router.hedges == 1
+            # The fast model now has latency data and goes first.
+            assert router.ranked()[0] == "gemini-2.0-flash"
+
+
+def test_unknown_model_is_disabled():
+    names = ["gemini-retired", "gemini-2.0-flash"]
+    with StubSteelServer(models=MODELS, reply=_reply) as stub:
+        with _router(stub, models=names, prefer=names) as router:
+            assert router.generate("upit") == "gemini-2.0-flash"
+            assert router.ranked() == ["gemini-2.0-flash"]
+            with pytest.raises(LLMError) as info:
+                router.generate("upit", model="gemini-retired")
+            assert info.value.status_code == 404
+
+
+def test_all_models_failing_raises():
+    with StubSteelServer(models=MODELS, llm_fail_rate=1.0) as stub:
+        with _router(stub, max_attempts=2) as router:
+            with pytest.raises(LLMError) as info:
+                router.generate("upit")
+            assert info.value.status_code == 503
+            assert stub.count("/v1beta/models/gemini-x:generateContent") == 0
+
+
+def test_cached_answers_skip_the_call(tmp_path):
+    with StubSteelServer(models=MODELS, reply=_reply) as stub:
+        cache = ResponseCache(tmp_path / "llm.sqlite")
+        with _router(stub, cache=cache) as router:
+            assert router.generate("upit") == "gemini-2.5-flash"
+            assert router.generate("upit") == "gemini-2.5-flash"
+            assert stub.count("/v1beta/models/gemini-2.5-flash:generateContent") == 1
@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from sciprog import REPO_ROOT
+from sciprog.regression import compare_models, enumerate_candidates, expand_features
+from sciprog.regression.selection import kfold_indices
+
+MARKETING = REPO_ROOT / "labs" / "03" / "marketing.csv"
+
+
+def test_expand_features_names_and_values():
+    X = np.array([[2.0, 3.0]])
+    Z, names, _ = expand_features(X, ["a", "b"], 2)
+    assert names == ["a", "b", "a^2", "a*b", "b^2"]
+    assert Z.tolist() == [[2.0, 3.0, 4.0, 6.0, 9.0]]
+
+
+def test_enumerate_candidates_counts_subsets():
+    assert len(enumerate_candidates(["a", "b", "c"])) == 7
+    assert len(enumerate_candidates(["a", "b", "c"], max_features=1)) == 3
+
+
+def test_cv_scores_match_refitting_each_fold():
+    data = pd.read_csv(MARKETING)
+    board = compare_models(data, "Sales", k=5, repeats=1, n_jobs=1)
+    assert len(board) == 7
+    assert board.best.rmse == min(s.rmse for s in board)
+
+    full = next(
+        s for s in board if s.candidate.features == ("TV", "Radio", "Newspaper")
+    )
+    X = data[["TV", "Radio", "Newspaper"]].to_numpy()
+    y = data["Sales"].to_numpy()
+    rmse = []
+    for test in kfold_indices(len(y), 5, 1, 42):
+        train = np.setdiff1d(np.arange(len(y)), test)
+        fit = LinearRegression().fit(X[train], y[train])
+        rmse.append(np.sqrt(np.mean((fit.predict(X[test]) - y[test]) ** 2)))
+    assert full.rmse == pytest.approx(np.mean(rmse))
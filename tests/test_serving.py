@@ -0,0 +1,157 @@
+import json
+import threading
+import time
+from concurrent.futures import TimeoutError as FutureTimeout
+
+import numpy as np
+import pandas as pd
+import pytest
+import requests
+
+from sciprog.regression.serving import (
+    LinearModel,
+    MicroBatcher,
+    PredictionServer,
+    handle,
+)
+
+MODEL = LinearModel(
+    ["TV", "Radio"], [0.5, 2.0], 1.0, "Sales", {"TV": (0, 300), "Radio": (0, 50)}
+)
+
+
+class PickyModel:
+    """Fails any batch that contains a negative value."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+
+    def predict(self, X):
+        self.calls.append(len(X))
+        time.sleep(self.delay)
+        if (X < 0).any():
+            raise ValueError("negative input")
+        return X.sum(axis=1)
+
+
+def test_fit_save_load_roundtrip(tmp_path):
+    rng = np.random.default_rng(0)
+    data = pd.DataFrame(rng.uniform(0, 100, (50, 2)), columns=["TV", "Radio"])
+    data["Sales"] = 3.0 + 0.1 * data["TV"] + 0.2 * data["Radio"]
+    model = LinearModel.fit(data, "Sales")
+    np.testing.assert_allclose(model.coef, [0.1, 0.2])
+    loaded = LinearModel.load(model.save(tmp_path / "sales.json"))
+    assert loaded.features == ["TV", "Radio"] and loaded.ranges == model.ranges
+    X = data[["TV", "Radio"]].to_numpy()
+    np.testing.assert_allclose(loaded.predict(X), data["Sales"])
+    assert loaded.predict_one(10.0, 20.0) == pytest.approx(8.0)
+    assert loaded.out_of_range([[50.0, 50.0], [500.0, 50.0]]).tolist() == [
+        False,
+        True,
+    ]
+
+
+def test_batcher_coalesces_requests():
+    with MicroBatcher(MODEL, max_wait=0.2) as batcher:
+        futures = [batcher.submit([[i, 1.0]]) for i in range(5)]
+        results = [f.result(5) for f in futures]
+    assert [r.tolist() for r in results] == [[0.5 * i + 3.0] for i in range(5)]
+    assert batcher.batches == 1 and batcher.rows == 5
+
+
+def test_malformed_request_is_rejected_before_batching():
+    with MicroBatcher(MODEL, max_wait=0.2) as batcher:
+        good = batcher.submit([[2.0, 1.0]])
+        with pytest.raises(ValueError):
+            batcher.submit([[1.0, 2.0, 3.0]])
+        with pytest.raises(ValueError):
+            batcher.submit([[[1.0, 2.0]]])
+        assert good.result(5).tolist() == [4.0]
+
+
+def test_failed_batch_falls_back_to_each_request():
+    model = PickyModel()
+    with MicroBatcher(model, max_wait=0.2) as batcher:
+        futures = [batcher.submit([[1.0, 2.0]]), batcher.submit([[-1.0, 0.0]])]
+        # No ``features``: a ragged request only fails the concatenation.
+        futures.append(batcher.submit([[1.0, 1.0, 1.0]]))
+        futures.append(batcher.submit([[4.0, 0.0]]))
+        assert futures[0].result(5).tolist() == [3.0]
+        with pytest.raises(ValueError, match="negative"):
+            futures[1].result(5)
+        assert futures[2].result(5).tolist() == [3.0]
+        assert futures[3].result(5).tolist() == [4.0]
+
+
+def test_timed_out_request_is_withdrawn():
+    model = PickyModel(delay=0.3)
+    with MicroBatcher(model, max_wait=0.0) as batcher:
+        busy = batcher.submit([[1.0, 1.0]])
+        time.sleep(0.05)
+        with pytest.raises(FutureTimeout):
+            batcher.predict([[2.0, 2.0]], timeout=0.05)
+        assert busy.result(5).tolist() == [2.0]
+    assert model.calls == [1]
+
+
+def _post(batcher, payload):
+    body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+    return handle(batcher, "POST", "/predict", body)
+
+
+def test_handle_requests():
+    with MicroBatcher(MODEL) as batcher:
+        assert _post(batcher, {"rows": [{"TV": 2, "Radio": 1}]}) == (
+            200,
+            {"predictions": [4.0]},
+        )
+        assert _post(batcher, {"TV": 0, "Radio": 0}) == (200, {"predictions": [1.0]})
+        assert _post(batcher, {"instances": [[2, 1], [0, 0]]})[1] == {
+            "predictions": [4.0, 1.0]
+        }
+        assert _post(batcher, {"rows": [{"TV": 2}]})[0] == 400
+        assert _post(batcher, {"instances": [[1, 2, 3]]})[0] == 400
+        assert _post(batcher, b"not json")[0] == 400
+        assert handle(batcher, "GET", "/predict", b"")[0] == 405
+        assert handle(batcher, "GET", "/nowhere", b"")[0] == 404
+        assert handle(batcher, "GET", "/schema", b"")[1]["target"] == "Sales"
+
+
+@pytest.mark.filterwarnings("ignore:overflow:RuntimeWarning")
+def test_handle_non_finite_values():
+    with MicroBatcher(MODEL) as batcher:
+        assert _post(batcher, b'{"instances": [[NaN, 1]]}')[0] == 400
+        status, payload = _post(batcher, {"instances": [[0, 1e308], [2, 1]]})
+    assert status == 200 and payload == {"predictions": [None, 4.0]}
+    json.dumps(payload, allow_nan=False)
+
+
+def test_handle_closed_batcher():
+    batcher = MicroBatcher(MODEL)
+    batcher.close()
+    assert _post(batcher, {"instances": [[1, 1]]})[0] == 503
+
+
+def test_http_server_with_concurrent_clients():
+    with PredictionServer(MODEL, max_wait=0.05, port=0) as server:
+        responses = [None] * 8
+
+        def worker(i):
+            rows = [{"TV": i, "Radio": 1}] if i != 3 else [{"TV": i}]
+            responses[i] = requests.post(
+                f"{server.url}/predict", json={"rows": rows}, timeout=10
+            )
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        health = requests.get(f"{server.url}/health", timeout=10).json()
+    for i, response in enumerate(responses):
+        if i == 3:
+            assert response.status_code == 400
+        else:
+            assert response.json() == {"predictions": [0.5 * i + 3.0]}
+    assert health["rows"] == 7 and health["batches"] < 7
@@ -0,0 +1,75 @@
+import time
+
+import pytest
+
+from sciprog.scraping import SteelClient
+from sciprog.scraping.sessions import SteelSessionPool, ready_script
+from sciprog.scraping.steel import SteelError, SteelTimeout
+from sciprog.scraping.stub import StubSteelServer
+
+MATCH = (
+    "<html><body><table class='stats_table'><tr><td>1</td></tr></table></body></html>"
+)
+
+
+@pytest.fixture
+def stub():
+    pages = {f"https://fbref.test/{i}": MATCH for i in range(6)}
+    with StubSteelServer(pages, render_delay=0.15) as server:
+        yield server
+
+
+def _pool(stub, **kwargs):
+    steel = SteelClient(api_key="test", base_url=stub.url, rate=0, backoff=0)
+    return SteelSessionPool(steel, poll=0.02, max_poll=0.05, **kwargs)
+
+
+def test_ready_script_quotes_the_selector():
+    assert ready_script('a[title="x"]') == (
+        'document.querySelector("a[title=\\"x\\"]") !== null'
+    )
+
+
+def test_fetch_waits_for_the_selector(stub):
+    with _pool(stub) as pool:
+        start = time.monotonic()
+        page = pool.fetch("https://fbref.test/0", ready="table.stats_table")
+        took = time.monotonic() - start
+    assert "stats_table" in page.html
+    # Polls instead of a fixed five-second sleep.
+    assert 0.15 <= took < 1.0
+
+
+def test_without_ready_the_loading_page_comes_back(stub):
+    with _pool(stub) as pool:
+        assert "loading" in pool.fetch("https://fbref.test/0").html
+
+
+def test_sessions_are_reused_and_released(stub):
+    urls = [f"https://fbref.test/{i}" for i in range(6)]
+    with _pool(stub, size=2) as pool:
+        pages = pool.fetch_many(urls, ready="table.stats_table")
+        assert all("stats_table" in p.html for p in pages)
+        assert pool.created <= 2
+    assert pool.released == pool.created
+    assert stub.sessions == {}
+
+
+def test_sessions_are_recycled_after_max_uses(stub):
+    with _pool(stub, size=1, max_uses=2) as pool:
+        for i in range(5):
+            pool.fetch(f"https://fbref.test/{i}")
+        assert pool.created == 3
+
+
+def test_timeout_marks_the_session_broken(stub):
+    with _pool(stub, size=1) as pool:
+        with pytest.raises(SteelTimeout):
+            pool.fetch("https://fbref.test/0", ready="div.never", timeout=0.2)
+        assert pool.released == 1
+        results = pool.fetch_many(["https://fbref.test/1", "https://fbref.test/x"])
+        assert results[0].url == "https://fbref.test/1"
+        assert isinstance(results[1], SteelError)
+    with pytest.raises(RuntimeError):
+        with pool.session():
+            pass
@@ -0,0 +1,98 @@
+import csv
+import json
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from sciprog.scraping.sink import CSVSink, JSONLinesSink, ParquetSink, open_sink
+
+
+def test_parquet_null_first_batch(tmp_path):
+    path = tmp_path / "ads.parquet"
+    with ParquetSink(path, batch_size=2) as sink:
+        sink.write_many(
+            [
+                {"title": "a", "price": None},
+                {"title": "b", "price": None},
+                {"title": "c", "price": 1299.0},
+                {"title": "d", "price": None},
+            ]
+        )
+    table = pq.read_table(path)
+    assert table.schema.field("price").type == pa.float64()
+    assert table.column("price").to_pylist() == [None, None, 1299.0, None]
+
+
+def test_parquet_widens_types_and_adds_fields(tmp_path):
+    path = tmp_path / "ads.parquet"
+    with ParquetSink(path, batch_size=2) as sink:
+        sink.write_many(
+            [
+                {"id": "1", "price": 10},
+                {"id": "2", "price": 20},
+                {"id": "3", "price": 30.5},
+                {"id": "4", "price": 40, "city": "Split"},
+                {"id": "5"},
+            ]
+        )
+    assert sink.rows == 5
+    table = pq.read_table(path)
+    assert table.column_names == ["id", "price", "city"]
+    assert table.column("price").to_pylist() == [10.0, 20.0, 30.5, 40.0, None]
+    assert table.column("city").to_pylist() == [None, None, None, "Split", None]
+
+
+def test_parquet_widening_starts_a_part_instead_of_rereading(tmp_path, monkeypatch):
+    def no_reread(*args, **kwargs):
+        raise AssertionError("rows already written were read back")
+
+    monkeypatch.setattr(pq, "read_table", no_reread)
+    path = tmp_path / "ads.parquet"
+    sink = ParquetSink(path, batch_size=2)
+    sink.write_many([{"id": i, "price": 1} for i in range(4)])
+    sink.write_many([{"id": 4, "price": 1.5}, {"id": 5, "city": "Zadar"}])
+    sink.write_many([{"id": 6, "city": "Split"}, {"id": 7}])
+    assert len(sink.parts) == 2
+    sink.close()
+    monkeypatch.undo()
+
+    assert sink.parts == [path] and sorted(tmp_path.iterdir()) == [path]
+    assert pq.ParquetFile(path).num_row_groups == 4
+    table = pq.read_table(path)
+    assert table.schema.field("price").type == pa.float64()
+    assert table.column("id").to_pylist() == list(range(8))
+    assert table.column("city").to_pylist() == [None] * 5 + ["Zadar", "Split", None]
+
+
+def test_parquet_given_schema_casts_and_drops(tmp_path):
+    path = tmp_path / "ads.parquet"
+    schema = pa.schema([("id", pa.string()), ("price", pa.float64())])
+    with ParquetSink(path, batch_size=1, schema=schema) as sink:
+        sink.write({"id": "1", "price": 5, "extra": True})
+        sink.write({"id": "2"})
+    table = pq.read_table(path)
+    assert table.schema.equals(schema)
+    assert table.to_pylist() == [{"id": "1", "price": 5.0}, {"id": "2", "price": None}]
+
+
+def test_csv_and_jsonl_sinks(tmp_path):
+    records = [{"id": 1, "title": "Bicikl"}, {"id": 2, "title": "Čamac", "x": 1}]
+    with open_sink(tmp_path / "ads.csv", batch_size=1) as sink:
+        assert isinstance(sink, CSVSink)
+        sink.write_many(records)
+    with open(tmp_path / "ads.csv", encoding="utf-8") as f:
+        assert list(csv.DictReader(f)) == [
+            {"id": "1", "title": "Bicikl"},
+            {"id": "2", "title": "Čamac"},
+        ]
+    with open_sink(tmp_path / "ads.jsonl") as sink:
+        assert isinstance(sink, JSONLinesSink)
+        sink.write_many(records)
+    lines = (tmp_path / "ads.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line) for line in lines] == records
+
+
+def test_open_sink_rejects_unknown_suffix(tmp_path):
+    with pytest.raises(ValueError):
+        open_sink(tmp_path / "ads.xlsx")
@@ -0,0 +1,90 @@
+import pytest
+
+from sciprog.scraping import FingerprintStore, GeminiGateway, SteelClient
+from sciprog.scraping.extract import Field, Rule
+from sciprog.scraping.sites import Crawler, Pagination, SiteSpec, for_url, get
+from sciprog.scraping.stub import StubSteelServer
+
+# Not registered: reachable only through ``site=``.
+SHOP = SiteSpec(
+    "test_shop",
+    r"^https://shop\.test/",
+    [
+        Rule(
+            "items",
+            "li.item",
+            {"id": Field(":scope", attr="id"), "title": Field("h3")},
+        )
+    ],
+    pagination=Pagination(param="page", max_pages=2),
+    prompt="Opiši artikle.",
+)
+
+
+def _items(*ids):
+    lis = "".join(f'<li class="item" id="{i}"><h3>Artikl {i}</h3></li>' for i in ids)
+    return f"<html><body><ul>{lis}</ul></body></html>"
+
+
+@pytest.fixture
+def stub():
+    pages = {
+        "https://shop.test/": _items("a", "b"),
+        "https://shop.test/?page=2": _items("c"),
+    }
+    with StubSteelServer(pages, reply=lambda model, prompt: "odgovor") as server:
+        yield server
+
+
+@pytest.fixture
+def crawler(stub):
+    steel = SteelClient(api_key="test", base_url=stub.url, backoff=0)
+    llm = GeminiGateway(api_key="test", base_url=stub.url, cache=None)
+    with Crawler(steel, llm) as crawler:
+        yield crawler
+
+
+def test_registry_lookup():
+    assert get("njuskalo").name == "njuskalo"
+    assert for_url("https://www.njuskalo.hr/search/?keywords=x").name == "njuskalo"
+    with pytest.raises(KeyError):
+        get("test_shop")
+    with pytest.raises(KeyError):
+        for_url("https://shop.test/")
+
+
+def test_page_url():
+    paging = Pagination(param="page")
+    assert paging.page_url("https://a.hr/s?q=x&page=9", 1) == "https://a.hr/s?q=x"
+    assert paging.page_url("https://a.hr/s?q=x", 3) == "https://a.hr/s?q=x&page=3"
+
+
+def test_crawl_paginates_an_unregistered_spec(crawler):
+    result = crawler.crawl("https://shop.test/", site=SHOP)
+    assert result.site == "test_shop" and result.spec is SHOP
+    assert [item["id"] for item in result.items] == ["a", "b", "c"]
+    assert len(result.pages) == 2 and not result.errors
+
+
+def test_analyze_uses_the_result_spec(crawler, stub):
+    result = crawler.crawl("https://shop.test/", site=SHOP)
+    assert crawler.analyze(result) == "odgovor"
+    (request,) = [r for r in stub.requests if r["path"].startswith("/v1beta/")]
+    prompt = request["payload"]["contents"][0]["parts"][0]["text"]
+    assert prompt.startswith("Opiši artikle.") and "Artikl c" in prompt
+
+
+def test_crawl_changes_with_an_unregistered_spec(crawler):
+    with FingerprintStore(":memory:") as store:
+        changes = crawler.crawl_changes("https://shop.test/", store, site=SHOP)
+        assert [item["id"] for item in changes.new] == ["a", "b", "c"]
+        assert crawler.analyze_changes(changes) == "odgovor"
+        again = crawler.crawl_changes("https://shop.test/", store, site=SHOP)
+        assert not again and again.unchanged == 3
+        assert crawler.analyze_changes(again) is None
+
+
+def test_ask_without_prompt_raises(crawler):
+    spec = SiteSpec("bare", r"^https://bare\.test/", [])
+    with pytest.raises(ValueError):
+        crawler.ask(spec, [])
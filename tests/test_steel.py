@@ -0,0 +1,125 @@
+import time
+
+import pytest
+import requests
+
+from sciprog.scraping import SteelClient
+from sciprog.scraping.steel import SteelError, TokenBucket, extract_html
+from sciprog.scraping.stub import StubSteelServer
+
+PAGES = {f"https://example.com/{i}": f"<html><p>{i}</p></html>" for i in range(6)}
+
+
+@pytest.fixture
+def stub():
+    with StubSteelServer(PAGES) as server:
+        yield server
+
+
+def client(stub, **kwargs):
+    kwargs = {"rate": 0, "backoff": 0.01, **kwargs}
+    return SteelClient(api_key="test", base_url=stub.url, **kwargs)
+
+
+def test_fetch_many_keeps_order_and_reports_failures(stub):
+    urls = list(PAGES) + ["https://example.com/missing"]
+    with client(stub) as steel:
+        results = steel.fetch_many(urls, max_workers=4)
+    assert [r.html for r in results[:-1]] == list(PAGES.values())
+    assert isinstance(results[-1], SteelError)
+    assert results[-1].status_code == 404
+
+
+def test_retries_transient_failures():
+    with StubSteelServer(PAGES, fail_rate=0.5) as stub:
+        with client(stub, max_retries=20) as steel:
+            pages = [steel.fetch(url) for url in PAGES]
+    assert all(page.ok for page in pages)
+    assert stub.count() == sum(page.attempts for page in pages)
+
+
+def test_deadline_is_enforced():
+    with StubSteelServer(PAGES, latency=0.5) as stub:
+        with client(stub, max_retries=0) as steel:
+            start = time.monotonic()
+            with pytest.raises(SteelError):
+                steel.fetch("https://example.com/0", deadline=0.1)
+            assert time.monotonic() - start < 0.4
+
+
+class _HtmlSession(requests.Session):
+    """Answers every request with a 200 HTML error page, like a broken proxy."""
+
+    def request(self, method, url, **kwargs):
+        resp = requests.Response()
+        resp.status_code = 200
+        resp._content = b"<html>Bad gateway</html>"
+        resp.url = url
+        return resp
+
+
+def test_non_json_success_body_is_a_steel_error():
+    steel = SteelClient(api_key="test", rate=0, session=_HtmlSession())
+    with pytest.raises(SteelError, match="non-JSON body: <html>Bad gateway") as info:
+        steel.fetch("https://example.com/0")
+    assert info.value.status_code == 200
+
+    results = steel.fetch_many(["https://example.com/0", "https://example.com/1"])
+    assert all(isinstance(r, SteelError) for r in results)
+
+
+class _ScriptedSession(requests.Session):
+    """Raises or answers from ``outcomes`` in turn, one per request."""
+
+    def __init__(self, *outcomes):
+        super().__init__()
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def request(self, method, url, **kwargs):
+        outcome = self.outcomes[min(self.calls, len(self.outcomes) - 1)]
+        self.calls += 1
+        if isinstance(outcome, Exception):
+            raise outcome
+        resp = requests.Response()
+        resp.status_code = 200
+        resp._content = outcome
+        resp.url = url
+        return resp
+
+
+def test_other_request_exceptions_are_steel_errors():
+    body = b'{"content": {"html": "<p>ok</p>"}}'
+    session = _ScriptedSession(requests.exceptions.ChunkedEncodingError("cut"), body)
+    steel = SteelClient(api_key="test", rate=0, backoff=0, session=session)
+    assert steel.fetch("https://example.com/0").html == "<p>ok</p>"
+    assert session.calls == 2
+
+    session = _ScriptedSession(requests.TooManyRedirects("loop"))
+    steel = SteelClient(api_key="test", rate=0, backoff=0, session=session)
+    with pytest.raises(SteelError, match="TooManyRedirects"):
+        steel.fetch("https://example.com/0")
+    assert session.calls == 1
+
+
+def test_non_object_json_body():
+    steel = SteelClient(
+        api_key="test", rate=0, session=_ScriptedSession(b'["<p>a</p>"]')
+    )
+    page = steel.fetch("https://example.com/0")
+    assert page.status_code == 200 and page.metadata == {}
+
+
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=50, burst=1)
+    start = time.monotonic()
+    for _ in range(6):
+        bucket.acquire()
+    assert time.monotonic() - start >= 0.09
+
+
+def test_extract_html_shapes():
+    assert extract_html({"content": {"html": "<p>a</p>"}}) == "<p>a</p>"
+    assert extract_html({"content": "<p>b</p>"}) == "<p>b</p>"
+    assert extract_html({"html": "<p>c</p>"}) == "<p>c</p>"
+    assert extract_html(None) == ""
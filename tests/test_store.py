@@ -0,0 +1,94 @@
+import datetime as dt
+
+import pyarrow.compute as pc
+import pytest
+
+from sciprog.scraping.sites import CrawlResult
+from sciprog.scraping.store import RecordStore
+
+DAY_1 = dt.datetime(2025, 11, 3, 9, tzinfo=dt.timezone.utc)
+DAY_2 = dt.datetime(2025, 11, 4, 9, tzinfo=dt.timezone.utc)
+
+
+@pytest.fixture
+def store(tmp_path):
+    with RecordStore(tmp_path, batch_size=100) as store:
+        yield store
+
+
+def test_rows_are_partitioned_by_site_and_day(store):
+    store.append("njuskalo", [{"id": "1", "price": 10}], url="u", at=DAY_1)
+    store.append("njuskalo", [{"id": "2", "price": 20}], url="u", at=DAY_2)
+    store.append("steam", [{"title": "Hades"}], at=DAY_2)
+    store.flush()
+    assert store.sites() == ["njuskalo", "steam"]
+    names = sorted(f.parent.name for f in store.files("njuskalo"))
+    assert names == ["date=2025-11-03", "date=2025-11-04"]
+    ads = store.query("njuskalo", start="2025-11-04")
+    assert ads["id"].tolist() == ["2"] and ads["site"].tolist() == ["njuskalo"]
+    assert len(store.query()) == 3
+
+
+def test_schema_changes_are_unified_on_read(store):
+    store.append("njuskalo", [{"id": "1", "price": None}], at=DAY_1)
+    store.flush()
+    store.append("njuskalo", [{"id": "2", "price": 10}], at=DAY_1)
+    store.flush()
+    store.append("njuskalo", [{"id": "3", "price": 12.5, "city": "Split"}], at=DAY_2)
+    store.flush()
+    ads = store.query("njuskalo").sort_values("id")
+    assert ads["price"].tolist()[1:] == [10.0, 12.5]
+    assert ads["city"].tolist()[-1] == "Split"
+    cheap = store.query("njuskalo", columns=["id"], filter=pc.field("price") < 11)
+    assert cheap["id"].tolist() == ["2"]
+
+    store.compact("njuskalo")
+    assert len(store.files("njuskalo", DAY_1.date(), DAY_1.date())) == 1
+    assert len(store.query("njuskalo")) == 3
+
+
+def test_cells_and_meta_columns(store):
+    record = {
+        "url": "https://a.hr/1",
+        "tags": ["a", "b"],
+        "specs": {"ram": 8},
+        "rows": [{"x": 1}],
+    }
+    store.append("shop", [record], url="https://a.hr/", rule="ads", analysis="ok")
+    store.flush()
+    (row,) = store.query("shop").to_dict("records")
+    assert row["url"] == "https://a.hr/" and row["field_url"] == "https://a.hr/1"
+    assert list(row["tags"]) == ["a", "b"]
+    assert row["specs"] == '{"ram": 8}' and row["rows"] == '[{"x": 1}]'
+    assert row["rule"] == "ads" and row["analysis"] == "ok"
+
+
+def test_append_result_and_batch_flush(tmp_path):
+    result = CrawlResult(
+        "bbc", "https://bbc.test/", records={"headlines": [{"title": "A"}]}
+    )
+    with RecordStore(tmp_path, batch_size=1) as store:
+        store.append_result(result, analysis="sažetak")
+        assert store.files("bbc")
+    assert RecordStore(tmp_path).query("bbc")["rule"].tolist() == ["headlines"]
+
+
+def test_empty_query(store):
+    assert store.query("nothing", columns=["id"]).empty
+
+
+def test_failed_partition_stays_buffered(tmp_path):
+    store = RecordStore(tmp_path)
+    store.append("steam", [{"title": "Hades"}], at=DAY_1)
+    store.append("njuskalo", [{"price": 10}, {"price": "po dogovoru"}], at=DAY_1)
+    with pytest.raises(Exception, match="po dogovoru"):
+        store.flush()
+    assert len(store.files("steam")) == 1 and store.files("njuskalo") == []
+    assert store._pending == 2
+
+    # The kept rows are written ahead of newer ones once they convert.
+    store._buffer["njuskalo", DAY_1.date().isoformat()][1]["price"] = 20
+    store.append("njuskalo", [{"price": 30}], at=DAY_1)
+    store.flush()
+    assert store.query("njuskalo")["price"].tolist() == [10, 20, 30]
+    assert len(store.files("steam")) == 1
@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from sciprog import REPO_ROOT
+from sciprog.regression import StreamingOLS
+
+MARKETING = REPO_ROOT / "labs" / "03" / "marketing.csv"
+FEATURES = ["TV", "Radio", "Newspaper"]
+
+
+def test_from_csv_matches_sklearn():
+    data = pd.read_csv(MARKETING)
+    reference = LinearRegression().fit(data[FEATURES], data["Sales"])
+
+    model = StreamingOLS.from_csv(MARKETING, FEATURES, "Sales", chunksize=17)
+
+    assert model.n_samples_seen_ == len(data)
+    np.testing.assert_allclose(model.coef_, reference.coef_, rtol=1e-10)
+    assert model.intercept_ == pytest.approx(reference.intercept_)
+    assert model.r2_ == pytest.approx(reference.score(data[FEATURES], data["Sales"]))
+
+
+def test_merge_equals_single_pass():
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(300, 2))
+    y = X @ [1.5, -2.0] + 3.0 + rng.normal(size=300)
+
+    whole = StreamingOLS().partial_fit(X, y)
+    merged = StreamingOLS().partial_fit(X[:100], y[:100]) + StreamingOLS().partial_fit(
+        X[100:], y[100:]
+    )
+
+    np.testing.assert_allclose(merged.coef_, whole.coef_)
+    np.testing.assert_allclose(merged.predict(X), whole.predict(X))
+
+
+def test_rejects_mismatched_chunks():
+    model = StreamingOLS().partial_fit(np.ones((3, 2)), np.ones(3))
+    with pytest.raises(ValueError):
+        model.partial_fit(np.ones((3, 3)), np.ones(3))
+    with pytest.raises(ValueError):
+        StreamingOLS().coef_
@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+
+from sciprog.regression import sweep_degrees, sweep_problems
+from sciprog.regression.selection import kfold_indices
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    x = rng.uniform(1990, 2020, 80)
+    y = 0.02 * (x - 2005) ** 3 - (x - 2005) ** 2 + rng.normal(0, 20, 80)
+    return x, y
+
+
+def test_fits_match_polyfit(data):
+    x, y = data
+    sweep = sweep_degrees(x, y, degrees=range(0, 6), k=5, repeats=2)
+    for degree in range(0, 6):
+        expected = np.polyval(np.polyfit(x - 2005, y, degree), x - 2005)
+        np.testing.assert_allclose(sweep.predict(x, degree), expected, atol=1e-6)
+        mse = np.mean((y - expected) ** 2)
+        assert sweep.train_mse[degree] == pytest.approx(mse, rel=1e-9)
+    assert sweep.best_degree == 3
+
+
+def test_cv_matches_refitting_each_fold(data):
+    x, y = data
+    sweep = sweep_degrees(x, y, degrees=[1, 2, 3], k=4, repeats=3, seed=7)
+    errors = []
+    for test in kfold_indices(len(y), 4, 3, 7):
+        train = np.setdiff1d(np.arange(len(y)), test)
+        coef = np.polyfit(x[train] - 2005, y[train], 2)
+        errors.append((np.polyval(coef, x[test] - 2005) - y[test]) ** 2)
+    assert sweep.cv_mse[1] == pytest.approx(np.concatenate(errors).mean(), rel=1e-8)
+    np.testing.assert_allclose(sweep.bias2 + sweep.variance, sweep.cv_mse)
+
+
+def test_several_features_use_every_interaction():
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(60, 2))
+    y = 1 + X[:, 0] * X[:, 1] + rng.normal(0, 0.1, 60)
+    sweep = sweep_degrees(X, y, degrees=[1, 2, 3], k=5, repeats=2)
+    assert [len(c) for c in sweep.coef] == [3, 6, 10]
+    assert sweep.best_degree == 2
+    assert sweep.to_frame().index.name == "degree"
+
+
+def test_singular_degrees_are_nan():
+    x = np.array([0.0, 1.0, 2.0, 3.0, 4.0, 5.0])
+    sweep = sweep_degrees(x, 2 * x, degrees=[1, 8], k=2, repeats=1)
+    assert np.isnan(sweep.coef[1]).all() and np.isnan(sweep.cv_mse[1])
+    assert sweep.best_degree == 1
+
+
+def test_sweep_problems_runs_every_dataset():
+    report = sweep_problems(degrees=[1, 2], k=3, repeats=1, n_jobs=1)
+    assert len(report) == 30
+    best = report.best()
+    assert set(best["best_degree"]) <= {1, 2}
+    assert report[report.sweeps[0].name] is report[0]
+    assert len(report.to_frame()) == 60
@@ -0,0 +1,100 @@
+import pytest
+
+from sciprog.scraping.text import (
+    boilerplate_token,
+    extract_blocks,
+    html_to_text,
+    iter_chunks,
+)
+
+ARTICLE = "<p>{} {}</p>"
+
+
+def _page(body_attrs="", paragraphs=20):
+    text = "".join(
+        ARTICLE.format(f"Odlomak {i}.", "Ovo je rečenica s nekoliko riječi. " * 3)
+        for i in range(paragraphs)
+    )
+    return (
+        f"<html><head><title>T</title><style>p {{}}</style></head>"
+        f"<body{body_attrs}>"
+        "<header><nav><a href='/'>Početna</a> <a href='/x'>Vijesti</a></nav>"
+        "<p>Portal s najnovijim vijestima iz regije</p></header>"
+        "<div class='cookie-banner'><p>Koristimo kolačiće na ovoj stranici.</p></div>"
+        f"<main><article><header><h1>Naslov</h1></header>{text}</article></main>"
+        "<footer><p>Sva prava pridržana, 2025. godina.</p></footer>"
+        "<script>var x = 'Ovo nije tekst stranice';</script>"
+        "</body></html>"
+    )
+
+
+@pytest.mark.parametrize(
+    "attrs",
+    [
+        "",
+        ' class="has-sidebar"',
+        ' class="page-wrapper modal-open"',
+        ' class="nav-open" id="top"',
+    ],
+)
+def test_body_classes_do_not_hide_the_page(attrs):
+    text = html_to_text(_page(attrs))
+    assert text.startswith("Naslov\nOdlomak 0.")
+    assert "Odlomak 19." in text
+
+
+def test_boilerplate_is_dropped():
+    text = html_to_text(_page())
+    for junk in ("Početna", "Portal", "kolačiće", "pridržana", "var x"):
+        assert junk not in text
+
+
+def test_wrapper_with_state_classes_is_kept():
+    html = (
+        "<body><div class='page-wrapper modal-open'><main class='has-sidebar'>"
+        "<p>Glavni sadržaj stranice je ovdje.</p></main>"
+        "<aside class='sidebar'><p>Povezani članci i slično.</p></aside></div></body>"
+    )
+    assert html_to_text(html) == "Glavni sadržaj stranice je ovdje."
+
+
+@pytest.mark.parametrize(
+    "token, expected",
+    [
+        ("cookie-banner", True),
+        ("site-footer", True),
+        ("ad-slot", True),
+        ("related_articles", True),
+        ("sr-only", True),
+        ("has-sidebar", False),
+        ("modal-open", False),
+        ("page-wrapper", False),
+        ("download", False),
+        ("thread", False),
+    ],
+)
+def test_boilerplate_token(token, expected):
+    assert boilerplate_token(token) is expected
+
+
+def test_budget_stops_early_and_cuts_at_a_word():
+    html = _page(paragraphs=500)
+    text = html_to_text(html, max_chars=300)
+    assert len(text) <= 300 and not text.endswith(" ")
+    assert html_to_text(html, max_tokens=75) == text
+    assert len(extract_blocks(iter_chunks(html, 512), stop_after=300)) < 20
+
+
+def test_rank_keeps_dense_blocks_in_order():
+    html = (
+        "<p><a href='/1'>Jedan link</a> <a href='/2'>drugi link</a> i malo</p>"
+        "<p>Kratak ali stvaran odlomak teksta.</p>"
+        "<p>" + "Dugačak odlomak s puno stvarnog sadržaja. " * 5 + "</p>"
+    )
+    text = html_to_text(html, max_chars=215, rank=True)
+    assert text.startswith("Dugačak") and "link" not in text
+
+
+def test_chunked_input_matches_string_input():
+    html = _page()
+    assert html_to_text(iter_chunks(html, 64)) == html_to_text(html)